@@ -0,0 +1,606 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Action types in the order the dashboard displays them
+ACTIONS = ["commit", "issue", "pull_request", "code_review", "comment"]
+
+ACTION_LABELS = {
+    "commit": "Commits",
+    "issue": "Issues",
+    "pull_request": "Pull Requests",
+    "code_review": "Code Reviews",
+    "comment": "Comments",
+}
+
+# Lines changed per commit, summed from the Additions/Deletions columns
+CHURN_COLUMNS = ["Lines Added", "Lines Deleted"]
+
+# Spare slots ActivityCube.with_events reserves on each axis it reallocates,
+# as a share of the axis length, so later appends fit without remapping the axes
+CUBE_SPARE_SHARE = 0.25
+
+
+def _with_spare(n):
+    return n + max(1, int(n * CUBE_SPARE_SHARE))
+
+
+class ActivityCube:
+    """
+    Dense event counts indexed by team, member, week and action.
+
+    `counts[t, m, w, a]` is the number of events of action `actions[a]` by
+    member `members[t][m]` of team `teams[t]` in week `weeks[w]`. Members are
+    numbered per team, so the member axis is only as long as the largest
+    roster; unused slots stay zero. The final week slot collects events
+    without a week number so team and member totals stay exact.
+
+    `additions[t, m, w]` and `deletions[t, m, w]` hold the lines added and
+    deleted on the same team/member/week axes; `has_churn` is False when the
+    data carries no line counts at all.
+    """
+
+    def __init__(self, counts, teams, members, weeks, actions, additions=None, deletions=None):
+        self.counts = counts
+        churn_shape = counts.shape[:3]
+        self.additions = np.zeros(churn_shape, dtype=np.int64) if additions is None else additions
+        self.deletions = np.zeros(churn_shape, dtype=np.int64) if deletions is None else deletions
+        self.has_churn = additions is not None
+        self.teams = teams
+        self.members = members
+        self.weeks = weeks
+        self.actions = actions
+        self._team_index = {team: i for i, team in enumerate(teams)}
+        self._week_index = {week: i for i, week in enumerate(weeks)}
+        # (counts, additions, deletions) with spare slots, once with_events has grown the cube
+        self._storage = None
+
+    @property
+    def no_week_index(self):
+        return len(self.weeks)
+
+    def team_index(self, team):
+        return self._team_index.get(team)
+
+    def week_index(self, week):
+        return self._week_index.get(int(week))
+
+    def team_counts(self, team):
+        """
+        Return the (member, week, action) block for a team, trimmed to its roster.
+        """
+        t = self.team_index(team)
+        if t is None:
+            return np.zeros((0, len(self.weeks) + 1, len(self.actions)), dtype=self.counts.dtype)
+        return self.counts[t, :len(self.members[t])]
+
+    def team_members(self, team):
+        t = self.team_index(team)
+        return [] if t is None else self.members[t]
+
+    def member_week_action(self, team, week=None):
+        """
+        Per-member action counts for one week, or across all weeks when
+        `week` is None, as a DataFrame indexed by member.
+        """
+        block = self.team_counts(team)
+        if week is None:
+            values = block.sum(axis=1)
+        else:
+            w = self.week_index(week)
+            values = block[:, w] if w is not None else np.zeros((block.shape[0], len(self.actions)), dtype=block.dtype)
+        return pd.DataFrame(values, index=pd.Index(self.team_members(team), name="Author"), columns=self.actions)
+
+    def action_totals(self, team, week=None, member=None):
+        """
+        Action counts for a team, optionally narrowed to one week and/or member.
+        """
+        block = self.team_counts(team)
+        if member is not None:
+            members = self.team_members(team)
+            if member not in members:
+                return pd.Series(0, index=self.actions)
+            block = block[[members.index(member)]]
+        if week is None:
+            values = block.sum(axis=(0, 1))
+        else:
+            w = self.week_index(week)
+            values = block[:, w].sum(axis=0) if w is not None else np.zeros(len(self.actions), dtype=block.dtype)
+        return pd.Series(values, index=self.actions)
+
+    def member_week_totals(self, team):
+        """
+        Total events per member per numbered week as a (member, week) DataFrame.
+        """
+        block = self.team_counts(team)[:, :len(self.weeks)].sum(axis=2)
+        return pd.DataFrame(block, index=pd.Index(self.team_members(team), name="Author"), columns=self.weeks)
+
+    def member_week_counts(self):
+        """
+        Events per member per numbered week for every team, as a dense
+        (team, member, week) array, plus the rosters numbering its members.
+        """
+        return self.counts[:, :, :len(self.weeks)].sum(axis=3), self.members
+
+    def team_churn(self, team):
+        """
+        Return the (member, week) lines added and deleted blocks of a team.
+        """
+        t = self.team_index(team)
+        if t is None:
+            empty = np.zeros((0, len(self.weeks) + 1), dtype=np.int64)
+            return empty, empty
+        roster = len(self.members[t])
+        return self.additions[t, :roster], self.deletions[t, :roster]
+
+    def churn_totals(self, team, week=None, member=None):
+        """
+        Lines added and deleted by a team, optionally narrowed to one week
+        and/or member, as a Series indexed by CHURN_COLUMNS.
+        """
+        blocks = self.team_churn(team)
+        if member is not None:
+            members = self.team_members(team)
+            if member not in members:
+                return pd.Series(0, index=CHURN_COLUMNS)
+            blocks = [block[[members.index(member)]] for block in blocks]
+        if week is not None:
+            w = self.week_index(week)
+            blocks = [block[:, [w]] if w is not None else block[:, :0] for block in blocks]
+        return pd.Series([int(block.sum()) for block in blocks], index=CHURN_COLUMNS)
+
+    def member_churn(self, team):
+        """
+        Lines added and deleted per member across all weeks.
+        """
+        additions, deletions = self.team_churn(team)
+        return pd.DataFrame({"Lines Added": additions.sum(axis=1), "Lines Deleted": deletions.sum(axis=1)},
+                            index=pd.Index(self.team_members(team), name="Author"))
+
+    def weekly_churn(self, team):
+        """
+        Lines added and deleted by the whole team in each numbered week.
+        """
+        additions, deletions = self.team_churn(team)
+        return pd.DataFrame({"Lines Added": additions[:, :len(self.weeks)].sum(axis=0),
+                             "Lines Deleted": deletions[:, :len(self.weeks)].sum(axis=0)},
+                            index=pd.Index(self.weeks, name="week"))
+
+    def member_week_churn(self, team):
+        """
+        Lines changed (added plus deleted) per member per numbered week.
+        """
+        additions, deletions = self.team_churn(team)
+        block = (additions + deletions)[:, :len(self.weeks)]
+        return pd.DataFrame(block, index=pd.Index(self.team_members(team), name="Author"), columns=self.weeks)
+
+    def with_events(self, new_events):
+        """
+        Return a cube that also counts `new_events`.
+
+        Only the new events are counted, into a copy of this cube's storage,
+        so this cube is left unchanged for anyone still reading it. New
+        members of a team, and new teams and weeks that sort after the
+        existing ones, fit into the copy while the storage has spare slots;
+        any other growth reallocates it with spare slots on the team, member
+        and week axes. The result equals build_activity_cube over the
+        combined events, apart from unused trailing member slots.
+        """
+        delta = build_activity_cube(new_events)
+        teams = sorted(set(self.teams).union(delta.teams))
+        members = []
+        for team in teams:
+            old, new = self.team_members(team), delta.team_members(team)
+            members.append(old if set(new).issubset(old) else sorted(set(old).union(new)))
+        weeks = sorted(set(self.weeks).union(delta.weeks))
+        actions = ACTIONS + sorted(set(self.actions).union(delta.actions) - set(ACTIONS))
+
+        storage = self._storage or (self.counts, self.additions, self.deletions)
+        capacity = storage[0].shape
+        if (teams[:len(self.teams)] == self.teams and weeks[:len(self.weeks)] == self.weeks
+                and actions == self.actions and len(teams) <= capacity[0] and len(weeks) < capacity[2]
+                and max((len(roster) for roster in members), default=0) <= capacity[1]):
+            # Copy-on-write: the counts below never touch storage this cube still uses
+            storage = tuple(array.copy() for array in storage)
+            self._grow_storage(storage, members, weeks)
+        else:
+            storage = self._reallocate(teams, members, weeks, actions)
+        counts, additions, deletions = (array[:len(teams), :, :len(weeks) + 1] for array in storage)
+        cube = ActivityCube(counts, teams, members, weeks, actions, additions, deletions)
+        cube.has_churn = self.has_churn or delta.has_churn
+        cube._storage = storage
+
+        week_map, action_map = cube._axis_maps(delta)
+        for d, team in enumerate(delta.teams):
+            t = cube.team_index(team)
+            size = len(delta.members[d])
+            added = np.searchsorted(np.asarray(members[t], dtype=object), np.asarray(delta.members[d], dtype=object))
+            cube.counts[t][np.ix_(added, week_map, action_map)] += delta.counts[d, :size]
+            if delta.has_churn:
+                for target, source in ((cube.additions, delta.additions), (cube.deletions, delta.deletions)):
+                    target[t][np.ix_(added, week_map)] += source[d, :size]
+        return cube
+
+    def _axis_maps(self, cube):
+        # Positions of another cube's weeks (plus its no-week slot) and actions on this cube's axes
+        week_map = np.append(np.searchsorted(self.weeks, cube.weeks), len(self.weeks)).astype(np.int64)
+        return week_map, np.array([self.actions.index(action) for action in cube.actions], dtype=np.int64)
+
+    def _grow_storage(self, storage, members, weeks):
+        """
+        Make room for appended weeks and grown rosters inside `storage`, a
+        copy of this cube's storage whose spare slots are all zero.
+        """
+        if len(weeks) > len(self.weeks):
+            # The no-week slot stays just after the last numbered week
+            for array in storage:
+                array[:, :, len(weeks)] = array[:, :, len(self.weeks)]
+                array[:, :, len(self.weeks)] = 0
+        for t, team in enumerate(self.teams):
+            if members[t] is self.members[t]:
+                continue
+            size = len(self.members[t])
+            moved = np.searchsorted(np.asarray(members[t], dtype=object), np.asarray(self.members[t], dtype=object))
+            for array in storage:
+                block = array[t, :size].copy()
+                array[t, :size] = 0
+                array[t, moved] = block
+
+    def _reallocate(self, teams, members, weeks, actions):
+        """
+        New storage for the grown axes, with spare slots, holding this cube's counts.
+        """
+        shape = (_with_spare(len(teams)),
+                 max(_with_spare(max((len(roster) for roster in members), default=0)), self.counts.shape[1]),
+                 _with_spare(len(weeks)) + 1)
+        storage = (np.zeros(shape + (len(actions),), dtype=self.counts.dtype),
+                   np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64))
+        team_pos = {team: i for i, team in enumerate(teams)}
+        # Positions of this cube's axes on the new ones
+        week_map = np.append(np.searchsorted(weeks, self.weeks), len(weeks)).astype(np.int64)
+        action_map = np.array([actions.index(action) for action in self.actions], dtype=np.int64)
+        team_map = np.array([team_pos[team] for team in self.teams], dtype=np.int64)
+
+        # Existing counts keep their member slots unless a team's roster grew
+        slots = np.arange(self.counts.shape[1])
+        storage[0][np.ix_(team_map, slots, week_map, action_map)] = self.counts
+        for target, source in zip(storage[1:], (self.additions, self.deletions)):
+            target[np.ix_(team_map, slots, week_map)] = source
+        for old, team in enumerate(self.teams):
+            t = team_pos[team]
+            if members[t] is self.members[old]:
+                continue
+            size = len(self.members[old])
+            moved = np.searchsorted(np.asarray(members[t], dtype=object), np.asarray(self.members[old], dtype=object))
+            storage[0][t] = 0
+            storage[0][t][np.ix_(moved, week_map, action_map)] = self.counts[old, :size]
+            for target, source in zip(storage[1:], (self.additions, self.deletions)):
+                target[t] = 0
+                target[t][np.ix_(moved, week_map)] = source[old, :size]
+        return storage
+
+
+def build_activity_cube(repo_data):
+    """
+    Count every event once into an ActivityCube.
+    """
+    teams_cat = repo_data["Your Team"].astype("category").cat.remove_unused_categories()
+    authors_cat = repo_data["Author"].astype("category").cat.remove_unused_categories()
+    actions_cat = repo_data["Action"].astype("category")
+
+    # Known actions first in display order, then anything else the data contains
+    extra_actions = sorted(a for a in actions_cat.cat.categories if a not in ACTIONS)
+    actions = ACTIONS + extra_actions
+    action_codes = pd.Categorical(actions_cat, categories=actions).codes
+
+    team_codes = teams_cat.cat.codes.to_numpy().astype(np.int64)
+    author_codes = authors_cat.cat.codes.to_numpy().astype(np.int64)
+    teams = list(teams_cat.cat.categories)
+    authors = np.asarray(authors_cat.cat.categories, dtype=object)
+
+    # Rank (team, author) pairs; pairs sort by team first so each team's
+    # members occupy a contiguous run that we renumber from zero
+    valid = (team_codes >= 0) & (author_codes >= 0) & (action_codes >= 0)
+    pair_keys = team_codes * max(len(authors), 1) + author_codes
+    unique_pairs, pair_rank = np.unique(pair_keys[valid], return_inverse=True)
+    pair_team = unique_pairs // max(len(authors), 1)
+    pair_author = unique_pairs % max(len(authors), 1)
+    team_start = np.searchsorted(pair_team, np.arange(len(teams)))
+    pair_member = np.arange(len(unique_pairs)) - team_start[pair_team]
+    roster_sizes = np.bincount(pair_team, minlength=len(teams))
+    members = [
+        list(authors[pair_author[team_start[t]:team_start[t] + roster_sizes[t]]])
+        for t in range(len(teams))
+    ]
+
+    week_values = pd.to_numeric(repo_data["week"], errors="coerce")
+    weeks = sorted(int(w) for w in week_values.dropna().unique())
+    week_lookup = np.full(len(week_values), len(weeks), dtype=np.int64)
+    has_week = week_values.notna().to_numpy()
+    week_lookup[has_week] = np.searchsorted(weeks, week_values[has_week].astype(np.int64).to_numpy())
+
+    shape = (len(teams), int(roster_sizes.max(initial=0)), len(weeks) + 1, len(actions))
+    flat = np.ravel_multi_index(
+        (team_codes[valid], pair_member[pair_rank], week_lookup[valid], action_codes[valid].astype(np.int64)),
+        shape
+    )
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).astype(np.int32).reshape(shape)
+
+    # Line counts go through the same index without the action axis, so every
+    # team's churn is summed in this one pass as well
+    churn = [None, None]
+    line_values = [pd.to_numeric(repo_data[column], errors="coerce") if column in repo_data.columns else None
+                   for column in ("Additions", "Deletions")]
+    if any(values is not None and values.notna().any() for values in line_values):
+        churn_flat = flat // len(actions)
+        for i, values in enumerate(line_values):
+            weights = np.zeros(len(repo_data)) if values is None else values.fillna(0).to_numpy(dtype=float)
+            churn[i] = np.bincount(churn_flat, weights=weights[valid],
+                                   minlength=int(np.prod(shape[:3]))).astype(np.int64).reshape(shape[:3])
+
+    return ActivityCube(counts, teams, members, weeks, actions, *churn)
+
+
+def member_summary_table(cube, team):
+    """
+    Per-member action totals, active weeks and consistency (share of the
+    team's active weeks in which the member acted) for a whole team.
+    """
+    member_counts = cube.member_week_action(team)
+    member_week_totals = cube.member_week_totals(team)
+
+    summary = member_counts[ACTIONS].rename(columns=ACTION_LABELS)
+    summary["Total Actions"] = member_counts.sum(axis=1)
+    summary["Active Weeks"] = (member_week_totals > 0).sum(axis=1)
+    summary = summary.rename_axis("Team Member").reset_index()
+
+    total_weeks = int((member_week_totals.sum(axis=0) > 0).sum())
+    if total_weeks > 0:
+        summary["Consistency %"] = (summary["Active Weeks"] / total_weeks * 100).round(1)
+    else:
+        summary["Consistency %"] = 0
+    return summary
+
+
+def member_churn_table(cube, team):
+    """
+    Per-member commits, lines added/deleted/changed and lines per commit for
+    a whole team.
+    """
+    churn = cube.member_churn(team)
+    commits = cube.member_week_action(team)["commit"]
+    table = churn.assign(**{"Lines Changed": churn.sum(axis=1)})
+    table.insert(0, "Commits", commits)
+    table["Lines per Commit"] = (table["Lines Changed"] / commits.where(commits > 0)).round(1)
+    return table.rename_axis("Team Member").reset_index().sort_values("Lines Changed", ascending=False)
+
+
+def weekly_action_counts(team_data):
+    """
+    Long (week, Action, Count) table of a team's events.
+    """
+    return team_data.groupby(["week", "Action"], observed=True).size().reset_index(name="Count")
+
+
+def member_contribution_table(week_data, roster, now=None):
+    """
+    Build the per-member status and contribution table for a set of events
+    (typically one team-week) in a single counting pass.
+
+    Every member of `roster` gets a row; members without events in
+    `week_data` are marked inactive with zero counts.
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    roster = pd.Index(sorted(roster), name="Team Member")
+
+    # Roster position x action code, counted in one bincount like build_activity_cube
+    member_codes = roster.get_indexer(week_data["Author"].astype(str))
+    action_codes = pd.Categorical(week_data["Action"].astype(str), categories=ACTIONS).codes.astype(np.int64)
+    on_roster = member_codes >= 0
+    valid = on_roster & (action_codes >= 0)
+    counts = np.bincount(member_codes[valid] * len(ACTIONS) + action_codes[valid],
+                         minlength=len(roster) * len(ACTIONS)).reshape(len(roster), len(ACTIONS))
+    total = counts.sum(axis=1)
+    active = np.bincount(member_codes[on_roster], minlength=len(roster)) > 0
+
+    # NaT is the smallest int64, so a member's latest timestamp is a plain maximum
+    stamps = pd.to_datetime(week_data["Timestamp"], errors="coerce").to_numpy(dtype="datetime64[ns]").view(np.int64)
+    nat = np.iinfo(np.int64).min
+    latest = np.full(len(roster), nat, dtype=np.int64)
+    np.maximum.at(latest, member_codes[on_roster], stamps[on_roster])
+    days_ago = (now.value - latest) // pd.Timedelta(days=1).value
+    last_action_days_ago = np.full(len(roster), "N/A", dtype=object)
+    has_last_action = active & (latest != nat)
+    last_action_days_ago[has_last_action] = [int(d) for d in days_ago[has_last_action]]
+
+    table = pd.DataFrame({
+        "Team Member": roster,
+        "Status": np.where(active, "Active", "Inactive"),
+        **{ACTION_LABELS[action]: counts[:, a] for a, action in enumerate(ACTIONS)},
+        "Total Actions": total,
+        "Last Action Days Ago": last_action_days_ago,
+        "Active": active,
+    })
+
+    # Active members first, busiest first (stable, so ties stay in roster order)
+    return table.take(np.lexsort((-total, ~active)))
+
+
+def gini_by_group(values, groups):
+    """
+    Gini index of `values` within each group, computed for all groups in one
+    sorted pass.
+
+    NaN values are ignored. A group whose values sum to zero is perfectly
+    equal (Gini 0); a group with no values gets NaN. Returns a Series
+    indexed by group.
+    """
+    frame = pd.DataFrame({"group": groups, "value": values})
+    frame["value"] = pd.to_numeric(frame["value"], errors="coerce")
+    frame = frame.dropna(subset=["value"]).sort_values(["group", "value"], kind="mergesort")
+
+    grouped = frame.groupby("group", sort=True, observed=True)["value"]
+    rank = grouped.cumcount() + 1
+    n = grouped.transform("size")
+    total = grouped.transform("sum")
+
+    # G = 2 * sum(i * x_i) / (n * sum(x)) - (n + 1) / n, with x sorted ascending
+    weighted = (rank * frame["value"]).groupby(frame["group"], sort=True, observed=True).sum()
+    n = n.groupby(frame["group"], sort=True, observed=True).first()
+    total = total.groupby(frame["group"], sort=True, observed=True).first()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gini = 2 * weighted / (n * total) - (n + 1) / n
+    gini = gini.where(total != 0, 0.0)
+    return gini.reindex(pd.unique(pd.Series(groups).dropna()))
+
+
+def team_workload_gini(cube):
+    """
+    Gini index of members' total action counts for every team at once.
+
+    0 means every member did the same amount of work; values near 1 mean one
+    member did nearly everything.
+    """
+    roster_sizes = np.array([len(members) for members in cube.members], dtype=np.int64)
+    member_totals = cube.counts.sum(axis=(2, 3))
+    in_roster = np.arange(member_totals.shape[1])[None, :] < roster_sizes[:, None]
+    team_ids = np.broadcast_to(np.arange(len(cube.teams))[:, None], member_totals.shape)[in_roster]
+    gini = gini_by_group(member_totals[in_roster], team_ids)
+    return pd.Series(gini.to_numpy(), index=pd.Index([cube.teams[t] for t in gini.index], name="Your Team"),
+                     name="workload_gini")
+
+
+def concat_events(frames):
+    """
+    Concatenate event tables, keeping the first table's categorical columns
+    categorical (pandas falls back to object when the categories differ).
+    """
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    events = pd.concat(frames, ignore_index=True)
+    for column, dtype in frames[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(events[column].dtype, pd.CategoricalDtype):
+            events[column] = events[column].astype("category")
+    return events
+
+
+# Teams whose appended layers stay merged per TeamPartition
+MERGED_TEAMS_CACHED = 256
+
+
+class TeamPartition:
+    """
+    Event table sorted by team and week with the row range of every team.
+
+    Looking up a team (or a team's week) is a slice of the sorted table, so
+    it costs O(rows in the slice) instead of a boolean mask over all events.
+    """
+
+    def __init__(self, repo_data):
+        repo_data = repo_data[repo_data["Your Team"].notna()]
+        team_col = repo_data["Your Team"].astype("category")
+
+        # Semester/year shown for a team come from its first event in file order
+        first_rows = repo_data.drop_duplicates("Your Team")
+        self.team_terms = {
+            team: (semester, year)
+            for team, semester, year in zip(first_rows["Your Team"], first_rows["Semester"], first_rows["Year"])
+        }
+
+        # Stable sort keeps file order within each (team, week) group
+        order = np.lexsort((
+            pd.to_numeric(repo_data["week"], errors="coerce").astype(float).fillna(np.inf).to_numpy(),
+            team_col.cat.codes.to_numpy(),
+        ))
+        self.data = repo_data.iloc[order].reset_index(drop=True)
+        self.teams = list(team_col.cat.categories)
+
+        team_codes = team_col.cat.codes.to_numpy()[order]
+        bounds = np.searchsorted(team_codes, np.arange(len(self.teams) + 1))
+        self._team_slices = {team: (bounds[i], bounds[i + 1]) for i, team in enumerate(self.teams)}
+        self._weeks = pd.to_numeric(self.data["week"], errors="coerce").astype(float).fillna(np.inf).to_numpy()
+        # Partitions of appended events (see with_events) and the teams merged from them so far
+        self._layers = []
+        self._merged = {}
+
+    def _slice(self, team):
+        start, stop = self._team_slices.get(team, (0, 0))
+        return self.data.iloc[start:stop], self._weeks[start:stop]
+
+    def _team_block(self, team):
+        """
+        A team's events and their week numbers, merged with appended layers.
+        """
+        blocks = [partition._slice(team) for partition in [self] + self._layers]
+        blocks = [block for block in blocks if len(block[1])]
+        if len(blocks) < 2:
+            return blocks[0] if blocks else self._slice(team)
+        merged = self._merged.get(team)
+        if merged is None:
+            events = concat_events([block[0] for block in blocks])
+            weeks = np.concatenate([block[1] for block in blocks])
+            # Stable sort keeps earlier layers ahead of later ones within a week
+            order = np.argsort(weeks, kind="stable")
+            merged = (events.iloc[order].reset_index(drop=True), weeks[order])
+            while len(self._merged) >= MERGED_TEAMS_CACHED:
+                self._merged.pop(next(iter(self._merged)), None)
+            self._merged[team] = merged
+        return merged
+
+    def team_rows(self, team):
+        """
+        Return all events of a team as a slice of the sorted table.
+        """
+        return self._team_block(team)[0]
+
+    def team_week_rows(self, team, week):
+        """
+        Return a team's events for one week; weeks are sorted within the team.
+        """
+        data, weeks = self._team_block(team)
+        lo = np.searchsorted(weeks, week, side="left")
+        hi = np.searchsorted(weeks, week, side="right")
+        return data.iloc[lo:hi]
+
+    def teams_rows(self, teams):
+        """
+        Return the events of several teams as one table, in one take per
+        layer instead of merging each team (the shared table's rows first,
+        then each appended layer's).
+        """
+        frames = []
+        for partition in [self] + self._layers:
+            ranges = [partition._team_slices.get(team, (0, 0)) for team in teams]
+            positions = np.concatenate([np.arange(start, stop) for start, stop in ranges] + [np.arange(0)])
+            if len(positions):
+                frames.append(partition.data.iloc[positions])
+        return concat_events(frames) if frames else self.data.iloc[:0]
+
+    def with_events(self, new_events):
+        """
+        Return a partition that also holds `new_events`.
+
+        The new events are partitioned on their own and kept as a layer over
+        the shared sorted table, so the cost follows the new events only.
+        A team's layers are merged (new events after existing ones of the
+        same week) the first time the team is looked up.
+        """
+        layer = TeamPartition(new_events)
+        partition = copy.copy(self)
+        partition._layers = self._layers + [layer]
+        partition._merged = {}
+        partition.team_terms = {**layer.team_terms, **self.team_terms}
+        partition.teams = sorted(set(self.teams).union(layer.teams))
+        return partition
+
+    def team_term(self, team):
+        return self.team_terms.get(team, ("Unknown", "Unknown"))
+
+
+def build_classification_lookup(classification_data):
+    """
+    Map each team to its classification label.
+    """
+    return dict(zip(classification_data["Your Team"], classification_data["classification"]))
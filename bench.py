@@ -0,0 +1,370 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from aggregates import (TeamPartition, build_activity_cube, member_churn_table, member_contribution_table,
+                        member_summary_table, team_workload_gini, weekly_action_counts)
+from clustering import classify_teams, prepare_survey_data
+from collaboration import build_collaboration_graph
+from early_warning import scan_cohort
+from features import activity_features
+from figures import (activity_distribution_figure, activity_heatmap_figure, consistency_figure,
+                     member_breakdown_figure, member_comparison_figure, weekly_breakdown_figure,
+                     weekly_trends_figure)
+from ingest import load_all, read_event_csv
+from lifecycle import build_lifecycle_table, lifecycle_percentiles
+from semester_calendar import SemesterCalendar, assign_weeks
+from sql_backend import EventStore, build_event_db
+from synth import write_dataset
+
+SYNTHETIC_ROOT = os.path.join("data", "synthetic")
+
+# Benchmarks slower than this factor of the baseline are flagged by --compare
+REGRESSION_THRESHOLD = 1.25
+
+
+def measure(name, func, rows=None, repeat=3):
+    """
+    Time `func` `repeat` times, then run it once more under tracemalloc for
+    the peak of Python-tracked allocations (numpy and pandas buffers included).
+
+    Timing runs are kept separate because tracing slows allocation-heavy code.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    result = {
+        "name": name,
+        "repeat": repeat,
+        "seconds_median": median,
+        "seconds_min": min(times),
+        "peak_memory_mb": peak / 2 ** 20,
+        "rows": rows,
+        "rows_per_second": rows / median if rows and median > 0 else None,
+    }
+    print(f"{name:<40} {median * 1000:10.2f} ms  {result['peak_memory_mb']:9.1f} MB peak", file=sys.stderr)
+    return result
+
+
+def dataset_paths(args):
+    """
+    Return (events, survey, classifications) CSV paths for the benchmark,
+    generating the synthetic data set on first use.
+    """
+    if args.dataset == "shipped":
+        return "data/coded_collated_data.csv", "data/coded_survey_anonymous.csv", "team_classifications.csv"
+    output_dir = os.path.join(SYNTHETIC_ROOT, f"{args.teams}x{args.events}-s{args.seed}")
+    paths = [os.path.join(output_dir, name)
+             for name in ("coded_collated_data.csv", "coded_survey_anonymous.csv", "team_classifications.csv")]
+    if not all(os.path.exists(p) for p in paths):
+        print(f"Generating {args.events} events for {args.teams} teams in {output_dir}", file=sys.stderr)
+        write_dataset(output_dir, args.teams, args.events, seed=args.seed)
+    return tuple(paths)
+
+
+def sample_teams(teams, n):
+    """
+    Evenly spaced sample of `n` teams so small and large teams are both timed.
+    """
+    if len(teams) <= n:
+        return list(teams)
+    return [teams[i] for i in np.linspace(0, len(teams) - 1, n).astype(int)]
+
+
+def run_benchmarks(repo_path, survey_path, classification_path, n_sample_teams=20, repeat=3):
+    """
+    Time the dashboard's data path end to end: ingest, team filtering, the
+    per-tab aggregations, survey clustering and figure construction.
+    """
+    results = []
+    n_events = sum(1 for _ in open(repo_path, "rb")) - 1
+
+    results.append(measure("ingest.read_event_csv", lambda: read_event_csv(repo_path), n_events, repeat=1))
+    cache_dir = tempfile.mkdtemp(prefix="bench-cache-")
+    try:
+        results.append(measure(
+            "ingest.load_all (cold cache)",
+            lambda: (shutil.rmtree(cache_dir, ignore_errors=True),
+                     load_all(repo_path, survey_path, classification_path, cache_dir)),
+            n_events, repeat=1,
+        ))
+        results.append(measure(
+            "ingest.load_all (warm cache)",
+            lambda: load_all(repo_path, survey_path, classification_path, cache_dir),
+            n_events, repeat,
+        ))
+        repo_data, survey_data, _, _ = load_all(repo_path, survey_path, classification_path, cache_dir)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    partition = TeamPartition(repo_data)
+    teams = sample_teams(partition.teams, n_sample_teams)
+    team_weeks = [(team, week) for team in teams
+                  for week in partition.team_rows(team)["week"].dropna().unique()[:4]]
+
+    # Team filtering: the original boolean mask against the sorted partition
+    results.append(measure(
+        "filter: boolean mask per team",
+        lambda: [repo_data[repo_data["Your Team"] == team] for team in teams],
+        n_events * len(teams), repeat,
+    ))
+    results.append(measure("filter: TeamPartition build", lambda: TeamPartition(repo_data), n_events, repeat))
+    results.append(measure(
+        "filter: TeamPartition team + week slices",
+        lambda: [partition.team_week_rows(team, week) for team, week in team_weeks],
+        None, repeat,
+    ))
+
+    results.append(measure("aggregate: build_activity_cube", lambda: build_activity_cube(repo_data),
+                           n_events, repeat))
+    cube = build_activity_cube(repo_data)
+
+    # A mid-semester refresh: the last week arrives as an appended segment
+    last_week = pd.to_numeric(repo_data["week"], errors="coerce") == max(cube.weeks, default=0)
+    history, new_week = repo_data[~last_week], repo_data[last_week]
+    history_cube, history_partition = build_activity_cube(history), TeamPartition(history)
+    results.append(measure("append: ActivityCube.with_events (last week)",
+                           lambda: history_cube.with_events(new_week), len(new_week), repeat))
+    # The same segment when the cube already spans its teams, members and
+    # weeks, so it is counted into a copy of the storage without remapping
+    spanning_cube = build_activity_cube(repo_data)
+    results.append(measure("append: ActivityCube.with_events (spanning axes)",
+                           lambda: spanning_cube.with_events(new_week), len(new_week), repeat))
+    results.append(measure("append: TeamPartition.with_events (last week)",
+                           lambda: history_partition.with_events(new_week), len(new_week), repeat))
+
+    rosters = {team: list(partition.team_rows(team)["Author"].astype(str).unique()) for team in teams}
+
+    results.append(measure(
+        "tab1: member_contribution_table",
+        lambda: [member_contribution_table(partition.team_week_rows(team, week), rosters[team])
+                 for team, week in team_weeks],
+        None, repeat,
+    ))
+    results.append(measure(
+        "tab2: weekly_action_counts",
+        lambda: [weekly_action_counts(partition.team_rows(team)) for team in teams],
+        None, repeat,
+    ))
+    results.append(measure(
+        "tab2: heatmap member_week_totals",
+        lambda: [cube.member_week_totals(team) for team in teams],
+        None, repeat,
+    ))
+    results.append(measure(
+        "tab3: member_summary_table",
+        lambda: [member_summary_table(cube, team) for team in teams],
+        None, repeat,
+    ))
+    results.append(measure(
+        "tab3: member_churn_table",
+        lambda: [member_churn_table(cube, team) for team in teams],
+        None, repeat,
+    ))
+    results.append(measure("tab3: team_workload_gini", lambda: team_workload_gini(cube), None, repeat))
+    results.append(measure(
+        "tab2: lifecycle table + percentiles",
+        lambda: lifecycle_percentiles(build_lifecycle_table(repo_data)),
+        n_events, repeat,
+    ))
+
+    results.append(measure(
+        "overview: scan_cohort",
+        lambda: scan_cohort(cube.member_week_counts()[0], cube.teams, cube.members, cube.weeks),
+        None, repeat,
+    ))
+    results.append(measure(
+        "tab4: build_collaboration_graph",
+        lambda: build_collaboration_graph(repo_data, dict(zip(cube.teams, cube.members))),
+        n_events, repeat,
+    ))
+
+    results.extend(run_sql_benchmarks(repo_path, teams, team_weeks, n_events, repeat))
+
+    results.append(measure("clustering.prepare_survey_data", lambda: prepare_survey_data(survey_data),
+                           len(survey_data), repeat))
+    results.append(measure("clustering.classify_teams", lambda: classify_teams(survey_path),
+                           len(survey_data), repeat))
+    results.append(measure("features.activity_features", lambda: activity_features(repo_data), n_events, repeat))
+
+    # A 16-week calendar from the Monday of each term's first event, with the last week as finals
+    first_days = repo_data.groupby(["Semester", "Year"], observed=True)["Timestamp"].min().dt.normalize()
+    calendars = {}
+    for (semester, year), first_day in first_days.items():
+        start = (first_day - pd.Timedelta(days=first_day.weekday())).date()
+        end = start + pd.Timedelta(days=16 * 7 - 1)
+        calendars[(semester, int(year))] = SemesterCalendar(semester, year, start, end,
+                                                            finals=(end - pd.Timedelta(days=6), end))
+    results.append(measure("semester_calendar.assign_weeks", lambda: assign_weeks(repo_data, calendars),
+                           n_events, repeat))
+
+    # Figure construction for one mid-sized team, with the inputs the dashboard builds
+    team = teams[len(teams) // 2]
+    team_data = partition.team_rows(team)
+    week = team_weeks[[t for t, _ in team_weeks].index(team)][1]
+    week_totals = cube.action_totals(team, week=int(week))
+    week_metrics = dict(zip(["Commits", "Issues", "PRs", "Reviews", "Comments"], week_totals.tolist()))
+    member_df = member_contribution_table(partition.team_week_rows(team, week), rosters[team])
+    active_members_df = member_df[member_df["Active"]].sort_values("Total Actions", ascending=False)
+    weekly_activity = weekly_action_counts(team_data)
+    member_week = cube.member_week_totals(team)
+    member_week = member_week.loc[:, member_week.sum(axis=0) > 0]
+    action_counts = team_data["Action"].value_counts()
+    member_summary = member_summary_table(cube, team).sort_values("Total Actions", ascending=False)
+
+    figure_builders = {
+        "weekly_breakdown": lambda: weekly_breakdown_figure(week_metrics),
+        "member_breakdown": lambda: member_breakdown_figure(active_members_df),
+        "weekly_trends": lambda: weekly_trends_figure(weekly_activity),
+        "activity_heatmap": lambda: activity_heatmap_figure(member_week),
+        "activity_distribution": lambda: activity_distribution_figure(action_counts[action_counts > 0]),
+        "member_comparison": lambda: member_comparison_figure(member_summary.drop(columns="Consistency %")),
+        "consistency": lambda: consistency_figure(member_summary.sort_values("Consistency %", ascending=False)),
+    }
+    for name, build in figure_builders.items():
+        results.append(measure(f"figure: {name}", build, None, repeat))
+    return results
+
+
+def run_sql_benchmarks(repo_path, teams, team_weeks, n_events, repeat=3):
+    """
+    Time building the embedded event database and the dashboard's pushed-down
+    lookups against it, for SQLite and (when installed) DuckDB.
+    """
+    backends = ["sqlite"]
+    try:
+        import duckdb  # noqa: F401
+        backends.append("duckdb")
+    except ImportError:
+        pass
+
+    results = []
+    db_dir = tempfile.mkdtemp(prefix="bench-db-")
+    try:
+        for backend in backends:
+            db_path = os.path.join(db_dir, f"events.{backend}")
+            results.append(measure(f"sql[{backend}]: build_event_db",
+                                   lambda: build_event_db(repo_path, db_path, backend), n_events, repeat=1))
+            store = EventStore(db_path, backend)
+            results.append(measure(
+                f"sql[{backend}]: team + week slices",
+                lambda: [store.team_week_rows(team, week) for team, week in team_weeks],
+                None, repeat,
+            ))
+            results.append(measure(
+                f"sql[{backend}]: action_totals per team",
+                lambda: [store.action_totals(team) for team in teams],
+                None, repeat,
+            ))
+            results.append(measure(
+                f"sql[{backend}]: member_summary_table",
+                lambda: [member_summary_table(store, team) for team in teams],
+                None, repeat,
+            ))
+            results.append(measure(f"sql[{backend}]: team_workload_gini", store.team_workload_gini, None, repeat))
+            del store
+    finally:
+        shutil.rmtree(db_dir, ignore_errors=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """
+    Print the median-time ratio of each benchmark against a previous run and
+    return the names slower than REGRESSION_THRESHOLD.
+    """
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        before = baseline.get(result["name"])
+        if before is None or not before["seconds_median"]:
+            continue
+        ratio = result["seconds_median"] / before["seconds_median"]
+        marker = "  REGRESSION" if ratio > REGRESSION_THRESHOLD else ""
+        print(f"{result['name']:<40} {ratio:6.2f}x{marker}", file=sys.stderr)
+        if marker:
+            regressions.append(result["name"])
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's data path and write results as JSON.")
+    parser.add_argument("--dataset", choices=["synthetic", "shipped"], default="synthetic",
+                        help="generate a synthetic data set or use the shipped one (default: %(default)s)")
+    parser.add_argument("--teams", type=int, default=94, help="synthetic teams (default: %(default)s)")
+    parser.add_argument("--events", type=int, default=19_095, help="synthetic events (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-teams", type=int, default=20,
+                        help="teams timed by the per-team benchmarks (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (default: %(default)s)")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="compare against a previous results file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    repo_path, survey_path, classification_path = dataset_paths(args)
+    results = run_benchmarks(repo_path, survey_path, classification_path, args.sample_teams, args.repeat)
+
+    import plotly
+    import sklearn
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": {"pandas": pd.__version__, "numpy": np.__version__, "sklearn": sklearn.__version__,
+                     "plotly": plotly.__version__},
+        "dataset": {"kind": args.dataset, "events_path": repo_path, "survey_path": survey_path,
+                    "teams": args.teams if args.dataset == "synthetic" else None,
+                    "events": results[0]["rows"], "seed": args.seed},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        return 1 if compare(results, args.compare) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
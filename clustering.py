@@ -1,113 +1,158 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 import pandas as pd
 import numpy as np
+import joblib
+import sklearn
 from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.decomposition import PCA
+from sklearn.metrics import adjusted_rand_score, silhouette_score
 import matplotlib.pyplot as plt
+from aggregates import concat_events, gini_by_group
+from features import ACTIVITY_FEATURES, FEATURE_EVENT_COLUMNS, load_team_features
+from ingest import compose_data_version, file_fingerprint, load_cached_table, read_event_csv
+from segments import SEGMENT_DIR, SegmentLog
+
+FEATURES = ['conflict_score', 'collaboration_score', 'commitment_score']
+
+# Survey scores plus the behavioral features of features.py
+COMBINED_FEATURES = FEATURES + ACTIVITY_FEATURES
+REPO_DATA_PATH = 'data/coded_collated_data.csv'
+
+# Version of the saved classifier artifact; bump when its layout changes
+MODEL_FORMAT_VERSION = 1
+DEFAULT_MODEL_PATH = os.path.join('models', 'team_classifier.joblib')
+
+# Stability sweep results, one JSON file per (k, seed, resample) per dataset
+SWEEP_CACHE_DIR = os.path.join('models', 'sweep_cache')
+LABEL_CONFIDENCE_PATH = 'team_label_confidence.csv'
+K_SELECTION_PATH = 'k_selection.csv'
+
+# Survey questions grouped by the dimension they measure
+CONFLICT_QUESTIONS = [
+    'How frequently do you have disagreements within your work group about the task of the project you are working on?',
+    'How often do people in your work group have conflicting opinions about the project you are working on?',
+    'How much emotional conflict is there in your work group?',
+    'How often do people get angry while working in your group?',
+    'How much conflict of ideas is there in your work group?',
+    'How often do you disagree about resource allocation in your work group?',
+    'How much relationship tension is there in your work group?',
+    'How often are there disagreements about who should do what in your work group?',
+    'How much conflict is there in your group about task responsibilities?'
+]
+
+COLLABORATION_QUESTIONS = [
+    'Team members get to participate in enjoyable activities',
+    'Team members enjoy spending time together',
+    'Team members get along well',
+    'Team members like each other',
+    'Team members like the work that the group does',
+    'Being part of the team allows team members to do enjoyable work'
+]
+
+COMMITMENT_QUESTIONS = [
+    "I'm unhappy with my team's level of commitment to the task",
+    'Our team is united in trying to reach its goals for performance',
+    'Our team members have conflicting aspirations for the team\'s performance'
+]
+
+# Question columns in the order the survey export lists them
+SURVEY_QUESTIONS = (CONFLICT_QUESTIONS + COLLABORATION_QUESTIONS[:3] + COMMITMENT_QUESTIONS
+                    + COLLABORATION_QUESTIONS[3:])
 
 def prepare_survey_data(df):
     """
     Prepare survey data by aggregating responses by team and computing mean scores
     for different dimensions of team dynamics.
     """
-    # Group questions by categories
-    conflict_questions = [
-        'How frequently do you have disagreements within your work group about the task of the project you are working on?',
-        'How often do people in your work group have conflicting opinions about the project you are working on?',
-        'How much emotional conflict is there in your work group?',
-        'How often do people get angry while working in your group?',
-        'How much conflict of ideas is there in your work group?',
-        'How often do you disagree about resource allocation in your work group?',
-        'How much relationship tension is there in your work group?',
-        'How often are there disagreements about who should do what in your work group?',
-        'How much conflict is there in your group about task responsibilities?'
-    ]
-    
-    collaboration_questions = [
-        'Team members get to participate in enjoyable activities',
-        'Team members enjoy spending time together',
-        'Team members get along well',
-        'Team members like each other',
-        'Team members like the work that the group does',
-        'Being part of the team allows team members to do enjoyable work',
-        
-    ]
-    
-    commitment_questions = [
-        "I'm unhappy with my team's level of commitment to the task",
-        'Our team is united in trying to reach its goals for performance',
-        'Our team members have conflicting aspirations for the team\'s performance'
-    ]
-    
     # Calculate mean scores for each dimension by team
-    team_metrics = df.groupby('Your Team').agg({
-        **{q: 'mean' for q in conflict_questions},
-        **{q: 'mean' for q in collaboration_questions},
-        **{q: 'mean' for q in commitment_questions}
+    team_metrics = df.groupby('Your Team', observed=True).agg({
+        **{q: 'mean' for q in CONFLICT_QUESTIONS},
+        **{q: 'mean' for q in COLLABORATION_QUESTIONS},
+        **{q: 'mean' for q in COMMITMENT_QUESTIONS}
     })
     
     # Calculate aggregate scores
-    team_metrics['conflict_score'] = team_metrics[conflict_questions].mean(axis=1)
-    team_metrics['collaboration_score'] = team_metrics[collaboration_questions].mean(axis=1)
-    team_metrics['commitment_score'] = team_metrics[commitment_questions].mean(axis=1)
+    team_metrics['conflict_score'] = team_metrics[CONFLICT_QUESTIONS].mean(axis=1)
+    team_metrics['collaboration_score'] = team_metrics[COLLABORATION_QUESTIONS].mean(axis=1)
+    team_metrics['commitment_score'] = team_metrics[COMMITMENT_QUESTIONS].mean(axis=1)
     
     # Invert negative questions so higher always means better
     team_metrics['commitment_score'] = 6 - team_metrics['commitment_score']  # Assuming 5-point scale
     
     return team_metrics[['conflict_score', 'collaboration_score', 'commitment_score']]
 
-def compute_cluster_summary_stats(team_metrics):
+
+def prepare_team_features(df, features=FEATURES, repo_data_path=REPO_DATA_PATH, segment_dir=SEGMENT_DIR):
+    """
+    Per-team survey scores, joined with the activity features from the
+    feature store when `features` asks for any of them.
+
+    The events are the collated CSV plus the segments appended to it since
+    (see segments.py). The store entry is keyed on their hashes and the
+    survey scores, so the events are only read the first time.
+    """
+    team_metrics = prepare_survey_data(df)
+    if all(feature in team_metrics.columns for feature in features):
+        return team_metrics
+    survey_key = hashlib.sha256(pd.util.hash_pandas_object(team_metrics).to_numpy().tobytes()).hexdigest()
+    repo_hash = file_fingerprint(repo_data_path)['sha256']
+    log = SegmentLog(segment_dir)
+    segments = log.segments(repo_hash)
+    data_version = compose_data_version(repo_hash, *[segment['sha256'] for segment in segments], survey_key)
+
+    def events():
+        repo_data = load_cached_table(repo_data_path, read_event_csv)[0]
+        if segments:
+            repo_data = concat_events([repo_data, log.read(segments)])
+        return repo_data[FEATURE_EVENT_COLUMNS]
+    return load_team_features(team_metrics, events, data_version)[list(features)]
+
+def compute_cluster_summary_stats(team_metrics, dimensions=FEATURES, group_col='classification'):
     """
     Compute mean, standard deviation, and Gini index for each classification 
     across conflict, collaboration, and commitment scores.
-    """
-    def gini(array):
-        array = np.sort(array)
-        n = array.size
-        cumulative = np.cumsum(array)
-        gini_index = (2 * np.sum((np.arange(1, n + 1) * array))) / (n * cumulative[-1]) - (n + 1) / n
-        return gini_index
 
-    dimensions = ['conflict_score', 'collaboration_score', 'commitment_score']
-    classifications = team_metrics['classification'].unique()
-    stats = {}
+    All groups and dimensions are computed in one grouped pass; Gini is
+    NaN-safe and 0 for groups whose scores sum to zero.
+    """
+    group_codes, group_names = pd.factorize(team_metrics[group_col])
+    # Teams without a classification (code -1) belong to no group
+    in_group = group_codes >= 0
+    grouped = team_metrics[dimensions][in_group].groupby(group_codes[in_group])
+    means = grouped.mean().add_suffix('_mean')
+    stds = grouped.std(ddof=0).add_suffix('_std')
 
-    for classification in classifications:
-        cluster_data = team_metrics[team_metrics['classification'] == classification]
-        stats[classification] = {}
-        for dim in dimensions:
-            scores = cluster_data[dim].values
-            stats[classification][f'{dim}_mean'] = np.mean(scores)
-            stats[classification][f'{dim}_std'] = np.std(scores)
-            stats[classification][f'{dim}_gini'] = gini(scores)
+    # Gini for every (group, dimension) cell at once, keyed by group * n_dims + dim
+    scores = team_metrics[dimensions].to_numpy(dtype=float)
+    cell_keys = group_codes[:, None] * len(dimensions) + np.arange(len(dimensions))
+    gini = gini_by_group(scores[in_group].ravel(), cell_keys[in_group].ravel())
+    gini = gini.reindex(np.arange(len(group_names) * len(dimensions))).to_numpy()
+    ginis = pd.DataFrame(gini.reshape(len(group_names), len(dimensions)),
+                         columns=[f'{dim}_gini' for dim in dimensions])
 
-    cluster_stats_df = pd.DataFrame.from_dict(stats, orient='index')
-    return cluster_stats_df
+    stats = pd.concat([means, stds, ginis], axis=1)
+    stats.index = group_names
+    columns = [f'{dim}_{stat}' for dim in dimensions for stat in ('mean', 'std', 'gini')]
+    return stats[columns].rename_axis(None)
 
 
-def classify_teams(survey_data_path):
+def label_clusters(team_metrics, clusters):
     """
-    Classify teams into categories based on survey responses using clustering.
+    Name each cluster by comparing its mean scores against the global means.
     """
-    df = pd.read_csv(survey_data_path)
-    team_metrics = prepare_survey_data(df)
-
-    # Standardize features
-    scaler = StandardScaler()
-    scaled_features = scaler.fit_transform(team_metrics)
-    
-    # Apply KMeans clustering
-    kmeans = KMeans(n_clusters=3, random_state=42)
-    clusters = kmeans.fit_predict(scaled_features)
-    team_metrics['cluster'] = clusters  # Add cluster assignments
-
     # Calculate GLOBAL means for comparison
     global_conflict_mean = team_metrics['conflict_score'].mean()
     global_collab_mean = team_metrics['collaboration_score'].mean()
     global_commit_mean = team_metrics['commitment_score'].mean()
 
     # Characterize clusters
-    cluster_means = team_metrics.groupby('cluster').mean()
+    cluster_means = team_metrics[FEATURES].groupby(np.asarray(clusters)).mean()
     cluster_labels = {}
 
     for cluster in cluster_means.index:
@@ -123,13 +168,271 @@ def classify_teams(survey_data_path):
         else:
             label = 'Balanced'
         
-        cluster_labels[cluster] = label
+        cluster_labels[int(cluster)] = label
+
+    return cluster_labels
 
 
-    team_metrics['classification'] = team_metrics['cluster'].map(cluster_labels)
+def fit_classifier(team_metrics, n_clusters=3, random_state=42, incremental=False, features=FEATURES):
+    """
+    Fit the scaler and clustering model on per-team scores and return a
+    classifier dict that can be saved and reused for prediction.
+
+    With `incremental=True` a MiniBatchKMeans model is fitted instead, so
+    later semesters can be folded in with `partial_fit_classifier`.
+    `features` are the columns clustered on (see COMBINED_FEATURES).
+    """
+    # Standardize features
+    scaler = StandardScaler()
+    scaled_features = scaler.fit_transform(team_metrics[features])
+    
+    # Apply KMeans clustering
+    if incremental:
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, random_state=random_state)
+    clusters = kmeans.fit_predict(scaled_features)
+
+    return {
+        'format_version': MODEL_FORMAT_VERSION,
+        'sklearn_version': sklearn.__version__,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'features': list(features),
+        'n_teams': int(len(team_metrics)),
+        'scaler': scaler,
+        'kmeans': kmeans,
+        'cluster_labels': label_clusters(team_metrics, clusters),
+    }
+
+
+def save_model(model, path=DEFAULT_MODEL_PATH):
+    """
+    Save a fitted classifier (scaler, centroids and cluster -> label map).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    joblib.dump(model, path)
+
+
+def load_model(path=DEFAULT_MODEL_PATH):
+    """
+    Load a classifier saved by `save_model`, checking its format version.
+    """
+    model = joblib.load(path)
+    if model.get('format_version') != MODEL_FORMAT_VERSION:
+        raise ValueError(
+            f"Classifier at {path} has format version {model.get('format_version')}, "
+            f"expected {MODEL_FORMAT_VERSION}; refit it with `python clustering.py`"
+        )
+    return model
+
+
+def predict(model, team_metrics):
+    """
+    Assign teams to the saved clusters without refitting.
+
+    Returns a copy of `team_metrics` with `cluster` and `classification`
+    columns. Existing teams keep their labels because centroids and the
+    cluster -> label map are fixed.
+    """
+    scaled_features = model['scaler'].transform(team_metrics[model['features']])
+    result = team_metrics.copy()
+    result['cluster'] = model['kmeans'].predict(scaled_features)
+    result['classification'] = result['cluster'].map(model['cluster_labels'])
+    return result
+
+
+def classify_new(survey_data, model_path=DEFAULT_MODEL_PATH, repo_data_path=REPO_DATA_PATH):
+    """
+    Classify teams from new survey responses (a DataFrame or CSV path)
+    against a saved classifier; a classifier fitted on COMBINED_FEATURES
+    reads the teams' activity from `repo_data_path`.
+    """
+    df = pd.read_csv(survey_data) if isinstance(survey_data, str) else survey_data
+    model = load_model(model_path)
+    return predict(model, prepare_team_features(df, model['features'], repo_data_path))
+
+
+def partial_fit_classifier(model, team_metrics, relabel=False):
+    """
+    Fold a new batch of teams (e.g. the next semester) into an incremental
+    classifier with MiniBatchKMeans.partial_fit.
+
+    The scaler stays as fitted so earlier teams keep their coordinates, and
+    cluster labels are kept unless `relabel` is set.
+    """
+    if not isinstance(model['kmeans'], MiniBatchKMeans):
+        raise ValueError("partial_fit needs a classifier fitted with incremental=True")
+
+    scaled_features = model['scaler'].transform(team_metrics[model['features']])
+    model['kmeans'].partial_fit(scaled_features)
+    model['n_teams'] += int(len(team_metrics))
+    if relabel:
+        model['cluster_labels'] = label_clusters(team_metrics, model['kmeans'].predict(scaled_features))
+    return model
+
+
+def classify_teams(survey_data_path, model_path=None, incremental=False, with_activity=False,
+                   repo_data_path=REPO_DATA_PATH):
+    """
+    Classify teams into categories based on survey responses using clustering.
+
+    If `model_path` is given, the fitted classifier is saved there so new
+    teams can later be classified with `classify_new` without refitting.
+    With `with_activity` the teams are clustered on the survey scores and
+    their activity features together (COMBINED_FEATURES); labels are still
+    named from the survey scores.
+    """
+    df = pd.read_csv(survey_data_path)
+    features = COMBINED_FEATURES if with_activity else FEATURES
+    team_metrics = prepare_team_features(df, features, repo_data_path)
+
+    model = fit_classifier(team_metrics, incremental=incremental, features=features)
+    if model_path is not None:
+        save_model(model, model_path)
+
+    team_metrics['cluster'] = model['kmeans'].labels_  # Add cluster assignments
+    team_metrics['classification'] = team_metrics['cluster'].map(model['cluster_labels'])
     
     return team_metrics
 
+def _sweep_task(scaled_features, k, seed, resample):
+    """
+    Fit one clustering for the stability sweep: KMeans with `k` clusters and
+    `seed` on a bootstrap resample of the teams (resample 0 is the full set),
+    then predict a cluster for every team.
+    """
+    n_teams = len(scaled_features)
+    if resample == 0:
+        sample = np.arange(n_teams)
+    else:
+        sample = np.random.RandomState([seed, resample]).randint(0, n_teams, n_teams)
+
+    # Same estimator settings as classify_teams, so resample 0 reproduces it
+    kmeans = KMeans(n_clusters=k, random_state=seed)
+    kmeans.fit(scaled_features[sample])
+    clusters = kmeans.predict(scaled_features)
+    silhouette = silhouette_score(scaled_features, clusters) if 1 < len(np.unique(clusters)) < n_teams else None
+    return {
+        'k': k,
+        'seed': seed,
+        'resample': resample,
+        'clusters': clusters.tolist(),
+        'inertia': float(kmeans.inertia_),
+        'silhouette': None if silhouette is None else float(silhouette),
+    }
+
+
+def _sweep_cache_path(cache_dir, k, seed, resample):
+    return os.path.join(cache_dir, f'k{k}_seed{seed}_resample{resample}.json')
+
+
+def run_stability_sweep(team_metrics, k_values=range(2, 7), seeds=(42,), n_resamples=50,
+                        cache_dir=SWEEP_CACHE_DIR, workers=None):
+    """
+    Run every (k, seed, resample) clustering in parallel, reusing results
+    cached on disk from earlier runs on the same survey scores.
+
+    Returns a list of result dicts (see `_sweep_task`).
+    """
+    scaled_features = StandardScaler().fit_transform(team_metrics[FEATURES])
+
+    # Results are only valid for these exact teams and scores
+    data_key = hashlib.sha256(
+        '\n'.join(map(str, team_metrics.index)).encode() + scaled_features.tobytes()
+    ).hexdigest()[:16]
+    cache_dir = os.path.join(cache_dir, data_key)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    tasks = [(k, seed, r) for k in k_values for seed in seeds for r in range(n_resamples + 1)]
+    results, missing = [], []
+    for task in tasks:
+        path = _sweep_cache_path(cache_dir, *task)
+        if os.path.exists(path):
+            with open(path) as f:
+                results.append(json.load(f))
+        else:
+            missing.append(task)
+
+    print(f"Stability sweep: {len(tasks) - len(missing)} cached, {len(missing)} to compute")
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sweep_task, scaled_features, *task) for task in missing]
+            for future in futures:
+                result = future.result()
+                with open(_sweep_cache_path(cache_dir, result['k'], result['seed'], result['resample']), 'w') as f:
+                    json.dump(result, f)
+                results.append(result)
+    return results
+
+
+def summarize_k_selection(results):
+    """
+    Per k: mean inertia and silhouette, plus stability as the mean adjusted
+    Rand index between each resample and the full-data fit of the same seed.
+    """
+    reference = {(r['k'], r['seed']): r['clusters'] for r in results if r['resample'] == 0}
+    rows = []
+    for k in sorted({r['k'] for r in results}):
+        runs = [r for r in results if r['k'] == k]
+        resampled = [r for r in runs if r['resample'] > 0]
+        silhouettes = [r['silhouette'] for r in runs if r['silhouette'] is not None]
+        rows.append({
+            'k': k,
+            'inertia': np.mean([r['inertia'] for r in runs]),
+            'silhouette': np.mean(silhouettes) if silhouettes else np.nan,
+            'ari_stability': np.mean([
+                adjusted_rand_score(reference[(k, r['seed'])], r['clusters']) for r in resampled
+            ]) if resampled else np.nan,
+            'runs': len(runs),
+        })
+    return pd.DataFrame(rows).set_index('k')
+
+
+def compute_label_confidence(team_metrics, results, k=3, reference_labels=None):
+    """
+    Per-team label confidence for the `k`-cluster classification.
+
+    Each resampled clustering is labelled with the same rules as
+    `classify_teams`; a team's confidence is the share of runs that agree
+    with its reference label (by default the label from the full-data fit).
+    """
+    runs = [r for r in results if r['k'] == k]
+    if not runs:
+        raise ValueError(f"No sweep results for k={k}")
+
+    labels = np.array([
+        pd.Series(r['clusters']).map(label_clusters(team_metrics, r['clusters'])).to_numpy()
+        for r in runs
+    ])
+    if reference_labels is None:
+        full_fit = next(r for r in runs if r['resample'] == 0)
+        reference_labels = pd.Series(full_fit['clusters']).map(label_clusters(team_metrics, full_fit['clusters']))
+    reference_labels = np.asarray(reference_labels)
+
+    confidence = pd.DataFrame(index=team_metrics.index)
+    confidence['classification'] = reference_labels
+    confidence['confidence'] = (labels == reference_labels[None, :]).mean(axis=0).round(3)
+    for label in ['High-performing', 'Balanced', 'Struggling']:
+        confidence[label] = (labels == label).mean(axis=0).round(3)
+    confidence['runs'] = len(runs)
+    return confidence
+
+
+def update_classification_file(new_classifications, path='team_classifications.csv'):
+    """
+    Write classifications for new teams into the classification CSV, keeping
+    the existing rows of all other teams.
+    """
+    updated = new_classifications[['classification']]
+    if os.path.exists(path):
+        existing = pd.read_csv(path, index_col='Your Team')
+        updated = pd.concat([existing.drop(index=updated.index, errors='ignore'), updated]).sort_index()
+    updated.index.name = 'Your Team'
+    updated.to_csv(path)
+    return updated
+
 def visualize_classifications(team_metrics):
 
 
@@ -189,8 +492,66 @@ def plot_team_classifications(viz_data):
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Classify teams from survey responses.")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH, help="classifier artifact path (default: %(default)s)")
+    parser.add_argument('--classify-new', metavar='SURVEY_CSV',
+                        help="classify the teams in SURVEY_CSV with the saved classifier instead of refitting")
+    parser.add_argument('--partial-fit', metavar='SURVEY_CSV',
+                        help="fold the teams in SURVEY_CSV into an incremental classifier, then classify them")
+    parser.add_argument('--incremental', action='store_true',
+                        help="fit a MiniBatchKMeans classifier that supports --partial-fit")
+    parser.add_argument('--with-activity', action='store_true',
+                        help="cluster on the survey scores plus each team's activity features")
+    parser.add_argument('--sweep', action='store_true',
+                        help="run the bootstrap / k-selection stability sweep and write per-team label confidence")
+    parser.add_argument('--k-range', nargs=2, type=int, default=[2, 6], metavar=('MIN', 'MAX'),
+                        help="cluster counts to sweep, inclusive (default: 2 6)")
+    parser.add_argument('--seeds', nargs='+', type=int, default=[42], help="KMeans seeds to sweep (default: 42)")
+    parser.add_argument('--resamples', type=int, default=50, help="bootstrap resamples per (k, seed) (default: 50)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    if args.sweep:
+        team_metrics = prepare_survey_data(pd.read_csv("data/coded_survey_anonymous.csv"))
+        k_values = range(args.k_range[0], args.k_range[1] + 1)
+        results = run_stability_sweep(team_metrics, k_values, args.seeds, args.resamples, workers=args.workers)
+
+        k_selection = summarize_k_selection(results)
+        print("\nK Selection:")
+        print(k_selection)
+        k_selection.to_csv(K_SELECTION_PATH)
+
+        # Confidence is measured against the labels the dashboard shows
+        if 3 in k_values:
+            reference = None
+            if os.path.exists('team_classifications.csv'):
+                current = pd.read_csv('team_classifications.csv', index_col='Your Team')['classification']
+                if current.index.equals(team_metrics.index):
+                    reference = current
+            confidence = compute_label_confidence(team_metrics, results, k=3, reference_labels=reference)
+            print("\nLabel Confidence:")
+            print(confidence)
+            confidence.to_csv(LABEL_CONFIDENCE_PATH)
+            print(f"\nLabel confidence saved to '{LABEL_CONFIDENCE_PATH}'")
+        raise SystemExit(0)
+
+    if args.classify_new or args.partial_fit:
+        new_survey_path = args.classify_new or args.partial_fit
+        if args.partial_fit:
+            model = load_model(args.model)
+            new_metrics = prepare_team_features(pd.read_csv(new_survey_path), model['features'])
+            model = partial_fit_classifier(model, new_metrics)
+            save_model(model, args.model)
+        new_classifications = classify_new(new_survey_path, args.model)
+        print("\nNew Team Classifications:")
+        print(new_classifications[['classification']])
+        update_classification_file(new_classifications)
+        raise SystemExit(0)
+
     survey_data_path = "data/coded_survey_anonymous.csv"
-    team_classifications = classify_teams(survey_data_path)
+    team_classifications = classify_teams(survey_data_path, model_path=args.model, incremental=args.incremental,
+                                          with_activity=args.with_activity)
+    print(f"\nClassifier saved to '{args.model}'")
 
     print("\nTeam Classifications:")
     print(team_classifications[['classification']])
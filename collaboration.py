@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Semicolon-separated people columns and what naming someone there means.
+# Edges point from the person acting to the person acted on: a reviewer
+# reviews the pull request's author, while an event's author assigns or
+# tags the people it names.
+RELATION_COLUMNS = {"review": "Reviewers", "assign": "Assignees", "tag": "Tagged"}
+RELATION_LABELS = {"review": "Reviews", "assign": "Assignments", "tag": "Tags"}
+NAMED_PERSON_IS_SOURCE = {"review"}
+
+# Event columns build_collaboration_graph reads
+COLLABORATION_EVENT_COLUMNS = ["Your Team", "Author"] + list(RELATION_COLUMNS.values())
+
+
+def relation_edges(repo_data, relation):
+    """
+    Explode one people column into (Your Team, Source, Target) rows, one per
+    person named on an event. Self-edges (e.g. self-assignment) are dropped.
+    """
+    column = RELATION_COLUMNS[relation]
+    if column not in repo_data.columns:
+        return pd.DataFrame(columns=["Your Team", "Source", "Target"])
+    events = repo_data[repo_data[column].notna() & repo_data["Author"].notna() & repo_data["Your Team"].notna()]
+    named = events[column].astype(str).str.split(";")
+    counts = named.str.len().to_numpy()
+    people = pd.Series(np.concatenate(named.to_numpy()) if len(named) else [], dtype=object).str.strip()
+    authors = np.repeat(events["Author"].astype(str).to_numpy(), counts)
+    teams = np.repeat(events["Your Team"].astype(str).to_numpy(), counts)
+
+    if relation in NAMED_PERSON_IS_SOURCE:
+        source, target = people.to_numpy(), authors
+    else:
+        source, target = authors, people.to_numpy()
+    edges = pd.DataFrame({"Your Team": teams, "Source": source, "Target": target})
+    keep = (people != "").to_numpy() & (edges["Source"] != edges["Target"]).to_numpy()
+    return edges[keep].reset_index(drop=True)
+
+
+class CollaborationGraph:
+    """
+    Directed collaboration graph of every team, held as one block-diagonal
+    sparse matrix per relation.
+
+    Nodes are (team, person) pairs sorted by team, so each team's adjacency
+    is a contiguous square block; `matrices[relation][i, j]` counts how often
+    node i acted on node j. People named on a team's events who never
+    authored one of its events are kept as nodes with On Roster False.
+    """
+
+    def __init__(self, nodes, matrices):
+        self.nodes = nodes
+        self.matrices = matrices
+        teams = nodes["Your Team"].to_numpy()
+        self.teams = list(pd.unique(teams))
+        bounds = np.append(np.searchsorted(teams, self.teams, side="left"), len(teams))
+        self._team_slices = {team: (bounds[i], bounds[i + 1]) for i, team in enumerate(self.teams)}
+        self.member_metrics, self.team_metrics = graph_metrics(self)
+
+    def team_slice(self, team):
+        return self._team_slices.get(team, (0, 0))
+
+    def team_nodes(self, team):
+        start, stop = self.team_slice(team)
+        return self.nodes.iloc[start:stop]
+
+    def team_matrix(self, team, relations=None):
+        """
+        Weighted adjacency of one team over the chosen relations (all by default).
+        """
+        start, stop = self.team_slice(team)
+        relations = list(self.matrices) if relations is None else relations
+        block = sparse.csr_matrix((stop - start, stop - start), dtype=np.int64)
+        for relation in relations:
+            block = block + self.matrices[relation][start:stop, start:stop]
+        return block
+
+    def team_edges(self, team, relations=None):
+        """
+        One row per (Source, Target, Relation) of a team with its Weight.
+        """
+        start, stop = self.team_slice(team)
+        people = self.nodes["Person"].to_numpy()[start:stop]
+        frames = []
+        for relation in (list(self.matrices) if relations is None else relations):
+            block = self.matrices[relation][start:stop, start:stop].tocoo()
+            frames.append(pd.DataFrame({"Source": people[block.row], "Target": people[block.col],
+                                        "Relation": RELATION_LABELS[relation], "Weight": block.data}))
+        if not frames:
+            return pd.DataFrame(columns=["Source", "Target", "Relation", "Weight"])
+        return pd.concat(frames, ignore_index=True)
+
+
+def build_collaboration_graph(repo_data, rosters):
+    """
+    Explode the people columns of `repo_data` into a CollaborationGraph of
+    every team at once. `rosters` maps each team to its members (event
+    authors); members without any interaction still become nodes.
+    """
+    edges = {relation: relation_edges(repo_data, relation) for relation in RELATION_COLUMNS}
+
+    roster_pairs = pd.DataFrame(
+        [(str(team), str(person)) for team, members in rosters.items() for person in members],
+        columns=["Your Team", "Person"]
+    )
+    named_pairs = pd.concat(
+        [frame[["Your Team", column]].rename(columns={column: "Person"})
+         for frame in edges.values() for column in ("Source", "Target")],
+        ignore_index=True,
+    )
+    nodes = pd.concat([roster_pairs.assign(**{"On Roster": True}), named_pairs.assign(**{"On Roster": False})],
+                      ignore_index=True)
+    # A person on the roster keeps On Roster True even when also named
+    nodes = nodes.sort_values(["Your Team", "Person", "On Roster"], ascending=[True, True, False], kind="stable")
+    nodes = nodes.drop_duplicates(["Your Team", "Person"]).reset_index(drop=True)
+
+    node_index = pd.MultiIndex.from_frame(nodes[["Your Team", "Person"]])
+    n = len(nodes)
+    matrices = {}
+    for relation, frame in edges.items():
+        source = node_index.get_indexer(pd.MultiIndex.from_arrays([frame["Your Team"], frame["Source"]]))
+        target = node_index.get_indexer(pd.MultiIndex.from_arrays([frame["Your Team"], frame["Target"]]))
+        # Repeated interactions between the same pair are summed into one weight
+        matrices[relation] = sparse.coo_matrix(
+            (np.ones(len(frame), dtype=np.int64), (source, target)), shape=(n, n)
+        ).tocsr()
+    return CollaborationGraph(nodes, matrices)
+
+
+def graph_metrics(graph):
+    """
+    Per-person and per-team graph metrics for every team in one batch over
+    the block-diagonal matrices.
+
+    Person metrics: Degree (distinct people interacted with in either
+    direction), Out/In Degree, Reciprocated (out-edges returned) and given/
+    received counts per relation. Team metrics: roster size, Interactions
+    (directed person pairs), Reciprocity (share of those pairs that are
+    mutual), Density and Isolated Members (roster members with degree 0).
+    """
+    nodes = graph.nodes
+    n = len(nodes)
+    combined = sparse.csr_matrix((n, n), dtype=np.int64)
+    for matrix in graph.matrices.values():
+        combined = combined + matrix
+    linked = (combined > 0).astype(np.int8).tocsr()
+    undirected = ((linked + linked.T) > 0).tocsr()
+    mutual = linked.multiply(linked.T).tocsr()
+
+    members = nodes.copy()
+    members["Degree"] = np.diff(undirected.indptr)
+    members["Out Degree"] = np.diff(linked.indptr)
+    members["In Degree"] = np.diff(linked.tocsc().indptr)
+    members["Reciprocated"] = np.diff(mutual.indptr)
+    for relation, matrix in graph.matrices.items():
+        label = RELATION_LABELS[relation]
+        members[f"{label} Given"] = np.asarray(matrix.sum(axis=1)).ravel()
+        members[f"{label} Received"] = np.asarray(matrix.sum(axis=0)).ravel()
+    members["Isolated"] = members["On Roster"] & (members["Degree"] == 0)
+
+    grouped = members.groupby("Your Team", sort=False)
+    teams = pd.DataFrame({
+        "Members": grouped["On Roster"].sum(),
+        "People": grouped.size(),
+        "Interactions": grouped["Out Degree"].sum(),
+        "Mutual": grouped["Reciprocated"].sum(),
+        "Isolated Members": grouped["Isolated"].sum(),
+    })
+    teams["Reciprocity"] = teams["Mutual"] / teams["Interactions"].where(teams["Interactions"] > 0)
+    possible = teams["People"] * (teams["People"] - 1)
+    teams["Density"] = (teams["Interactions"] / possible.where(possible > 0)).fillna(0.0)
+    return members, teams
+
+
+def circle_layout(n):
+    """
+    x/y positions of `n` nodes evenly spaced on the unit circle, first at the top.
+    """
+    angles = np.pi / 2 - 2 * np.pi * np.arange(n) / max(n, 1)
+    return np.cos(angles), np.sin(angles)
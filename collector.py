@@ -0,0 +1,559 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import re
+import sys
+import time
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from ingest import CACHE_DIR, EVENT_COLUMNS
+from semester_calendar import read_calendar
+
+# The GitHub REST API, or a mock of it for local runs (e.g. http://127.0.0.1:8000)
+API_URL_ENV_VAR = "GITHUB_API_URL"
+TOKEN_ENV_VAR = "GITHUB_TOKEN"
+DEFAULT_API_URL = "https://api.github.com"
+
+# One row per team repository: Semester, Year, Your Team, Repo (owner/name)
+# and optionally Term Start (YYYY-MM-DD), from which week numbers are counted
+DEFAULT_REPO_LIST = os.path.join("data", "team_repos.csv")
+DEFAULT_OUTPUT = os.path.join("data", "collected_events.csv")
+
+# ETags and the last crawl time of every repository, for conditional requests
+STATE_PATH = os.path.join(CACHE_DIR, "collector_state.json")
+
+MAX_CONCURRENCY = 16
+PER_PAGE = 100
+MAX_RETRIES = 5
+RETRY_BACKOFF_SECONDS = 1.0
+
+# Timestamp and Close_date in the collated data are both UTC
+TIMESTAMP_TIMEZONE = "UTC"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+CLOSE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+MISSING = "N/A"
+
+MENTION_PATTERN = re.compile(r"(?<![\w@/])@([A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))")
+
+
+def parse_time(value):
+    """
+    Parse a GitHub ISO-8601 timestamp ("2024-05-13T16:04:02Z") as aware UTC.
+    """
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc)
+
+
+def format_timestamp(moment, tz):
+    return moment.astimezone(tz).strftime(TIMESTAMP_FORMAT) if moment is not None else MISSING
+
+
+def close_date(value):
+    moment = parse_time(value)
+    return moment.strftime(CLOSE_DATE_FORMAT) if moment is not None else MISSING
+
+
+def event_week(moment, term_start, tz):
+    """
+    1-based week of the term an event falls in, counted from the term's
+    first day in `tz`; N/A without a term start or before it.
+    """
+    if moment is None or term_start is None:
+        return MISSING
+    days = (moment.astimezone(tz).date() - term_start).days
+    return days // 7 + 1 if days >= 0 else MISSING
+
+
+def people(users):
+    """
+    Semicolon-separated logins of a list of GitHub users, or N/A.
+    """
+    logins = [user["login"] for user in users or [] if user and user.get("login")]
+    return ";".join(logins) if logins else MISSING
+
+
+def mentions(*texts):
+    """
+    Semicolon-separated @mentioned logins in the given texts, or N/A.
+    """
+    found = []
+    for text in texts:
+        for login in MENTION_PATTERN.findall(text or ""):
+            if login not in found:
+                found.append(login)
+    return ";".join(found) if found else MISSING
+
+
+def _login(user):
+    return user["login"] if user and user.get("login") else None
+
+
+def commit_row(item):
+    """
+    Collated fields of one entry of GET /repos/{repo}/commits (or a single
+    commit, which also carries line counts).
+    """
+    commit = item.get("commit") or {}
+    author = _login(item.get("author")) or (commit.get("author") or {}).get("name")
+    stats = item.get("stats") or {}
+    return {
+        "Action": "commit",
+        "Author": author or MISSING,
+        "Repo_ID": item["sha"],
+        "Additions": stats.get("additions", MISSING),
+        "Deletions": stats.get("deletions", MISSING),
+        "Message": commit.get("message") or MISSING,
+        "Tagged": mentions(commit.get("message")),
+        "_time": parse_time((commit.get("author") or {}).get("date")),
+    }
+
+
+def issue_row(item):
+    """
+    Collated fields of one issue from GET /repos/{repo}/issues.
+    """
+    return {
+        "Action": "issue",
+        "Author": _login(item.get("user")) or MISSING,
+        "Repo_ID": item["number"],
+        "Message": item.get("title") or MISSING,
+        "Assignees": people(item.get("assignees")),
+        "Close_date": close_date(item.get("closed_at")),
+        "Closed_by": _login(item.get("closed_by")) or MISSING,
+        "Request_Status": item.get("state") or MISSING,
+        "Tagged": mentions(item.get("body")),
+        "_time": parse_time(item.get("created_at")),
+    }
+
+
+def pull_request_row(item):
+    """
+    Collated fields of one pull request from GET /repos/{repo}/pulls.
+    """
+    return {
+        "Action": "pull_request",
+        "Author": _login(item.get("user")) or MISSING,
+        "Repo_ID": item["number"],
+        "Message": item.get("title") or MISSING,
+        "Assignees": people(item.get("assignees")),
+        "Close_date": close_date(item.get("closed_at")),
+        "Request_Status": item.get("state") or MISSING,
+        "Reviewers": people(item.get("requested_reviewers")),
+        "Tagged": mentions(item.get("body")),
+        "_time": parse_time(item.get("created_at")),
+    }
+
+
+def review_row(item, number):
+    """
+    Collated fields of one submitted review of pull request `number`; like
+    the collated data, the review state goes in Request_Status.
+    """
+    return {
+        "Action": "code_review",
+        "Author": _login(item.get("user")) or MISSING,
+        "Repo_ID": number,
+        "Message": item.get("body") or MISSING,
+        "Request_Status": item.get("state") or MISSING,
+        "Tagged": mentions(item.get("body")),
+        "_time": parse_time(item.get("submitted_at")),
+    }
+
+
+def comment_row(item):
+    """
+    Collated fields of one issue or pull request comment.
+    """
+    return {
+        "Action": "comment",
+        "Author": _login(item.get("user")) or MISSING,
+        "Repo_ID": item["id"],
+        "Message": item.get("body") or MISSING,
+        "Tagged": mentions(item.get("body")),
+        "_time": parse_time(item.get("created_at")),
+    }
+
+
+class RateLimiter:
+    """
+    Holds every request back while GitHub reports the rate limit as spent.
+
+    The primary limit comes from the X-RateLimit-Remaining/Reset headers of
+    each response; secondary limits from Retry-After on 403/429 responses.
+    """
+
+    def __init__(self, clock=time.time, sleep=asyncio.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.resume_at = 0.0
+        self.remaining = None
+        self.waits = 0
+
+    async def wait(self):
+        delay = self.resume_at - self.clock()
+        if delay > 0:
+            self.waits += 1
+            await self.sleep(delay)
+
+    def update(self, response):
+        """
+        Record the limits a response reports; returns True when it was
+        rejected for exceeding one and should be retried.
+        """
+        headers = response.headers
+        if "x-ratelimit-remaining" in headers:
+            self.remaining = int(headers["x-ratelimit-remaining"])
+        limited = response.status_code in (403, 429) and (
+            "retry-after" in headers or self.remaining == 0
+        )
+        if "retry-after" in headers and limited:
+            self.resume_at = max(self.resume_at, self.clock() + float(headers["retry-after"]))
+        elif self.remaining == 0 and "x-ratelimit-reset" in headers:
+            # Reset is an epoch second; the limit is spent until then even for the next success
+            self.resume_at = max(self.resume_at, float(headers["x-ratelimit-reset"]) + 1)
+        return limited
+
+
+class GitHubClient:
+    """
+    Pooled async client for the GitHub REST API.
+
+    One httpx connection pool is shared by every request, at most
+    `max_concurrency` requests are in flight, and list endpoints are fetched
+    with If-None-Match against the ETags kept in `state`, so an unchanged
+    page costs a 304 that does not count against the rate limit.
+
+    ETags and page sizes seen during a crawl go to a `pending` buffer when
+    one is given (see `new_pending`); `commit` merges it into `state` only
+    once the repository's crawl succeeded, since a 304 later means "already
+    written".
+    """
+
+    def __init__(self, base_url=None, token=None, max_concurrency=MAX_CONCURRENCY, state=None, transport=None):
+        self.base_url = (base_url or os.environ.get(API_URL_ENV_VAR) or DEFAULT_API_URL).rstrip("/")
+        self.token = token if token is not None else os.environ.get(TOKEN_ENV_VAR)
+        self.max_concurrency = max_concurrency
+        self.state = state if state is not None else {}
+        for key in ("etags", "page_sizes", "since"):
+            self.state.setdefault(key, {})
+        self.transport = transport
+        self.rate_limiter = RateLimiter()
+        self.requests = 0
+        self.not_modified = 0
+        self._client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        import httpx
+
+        headers = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency),
+            transport=self.transport,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._client.aclose()
+
+    @staticmethod
+    def new_pending():
+        return {"etags": {}, "page_sizes": {}}
+
+    def commit(self, repo, pending):
+        """
+        Replace the ETags and page sizes of `repo` with those of its last
+        successful crawl; keys of earlier `since` values are dropped.
+        """
+        prefix = f"{repo}:"
+        for name in ("etags", "page_sizes"):
+            kept = {key: value for key, value in self.state[name].items() if not key.startswith(prefix)}
+            self.state[name] = dict(kept, **pending[name])
+
+    async def get(self, url, params=None, etag_key=None, pending=None):
+        """
+        GET a path or absolute URL; returns the response, which is a 304
+        when `etag_key`'s stored ETag still matches. New ETags are recorded
+        in `pending` if given, otherwise straight in the state.
+        """
+        import httpx
+
+        headers = {}
+        if etag_key is not None and etag_key in self.state["etags"]:
+            headers["If-None-Match"] = self.state["etags"][etag_key]
+        for attempt in range(MAX_RETRIES + 1):
+            await self.rate_limiter.wait()
+            async with self._semaphore:
+                try:
+                    response = await self._client.get(url, params=params, headers=headers)
+                except httpx.TransportError:
+                    if attempt == MAX_RETRIES:
+                        raise
+                    await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+                    continue
+            self.requests += 1
+            if self.rate_limiter.update(response):
+                continue
+            if response.status_code >= 500 and attempt < MAX_RETRIES:
+                await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+                continue
+            etags = (pending if pending is not None else self.state)["etags"]
+            if response.status_code == 304:
+                self.not_modified += 1
+                etags[etag_key] = headers["If-None-Match"]
+                return response
+            response.raise_for_status()
+            if etag_key is not None and "etag" in response.headers:
+                etags[etag_key] = response.headers["etag"]
+            return response
+        response.raise_for_status()
+        return response
+
+    async def pages(self, path, params, etag_key, pending=None):
+        """
+        Yield the items of each page of a list endpoint. Pages answered with
+        304 were seen on the last successful crawl and are skipped,
+        continuing to the next page if that one was full.
+
+        The ETag key includes the query parameters, `since` among them, so a
+        page is only ever compared with the same request.
+        """
+        query = "&".join(f"{name}={value}" for name, value in sorted(params.items()))
+        page_sizes = (pending if pending is not None else self.state)["page_sizes"]
+        page = 1
+        while True:
+            key = f"{etag_key}?{query}#{page}"
+            response = await self.get(path, params=dict(params, per_page=PER_PAGE, page=page), etag_key=key,
+                                      pending=pending)
+            if response.status_code == 304:
+                size = page_sizes[key] = self.state["page_sizes"].get(key, 0)
+            else:
+                items = response.json()
+                size = page_sizes[key] = len(items)
+                yield items
+            if size < PER_PAGE:
+                return
+            page += 1
+
+
+async def _gather(*coroutines):
+    """
+    Like asyncio.gather, but cancels the other coroutines as soon as one
+    fails, so nothing is left using the client after an error.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _since_param(since):
+    return since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+async def collect_repo(client, repo, since=None, commit_stats=False, pending=None):
+    """
+    Yield collated rows (without the team columns) for every commit, issue,
+    pull request, code review and comment of `repo` created after `since`,
+    once all of its endpoints have been fetched concurrently. ETags go to
+    `pending` (see GitHubClient).
+
+    Issues and pull requests updated after `since` but opened before it are
+    not repeated, so successive crawls produce disjoint event batches.
+    """
+    since_params = {"since": _since_param(since)} if since is not None else {}
+
+    def is_new(row):
+        return row["_time"] is not None and (since is None or row["_time"] >= since)
+
+    async def commits():
+        rows = []
+        async for page in client.pages(f"/repos/{repo}/commits", since_params, f"{repo}:commits", pending):
+            rows.extend(commit_row(item) for item in page)
+        if commit_stats and rows:
+            # Line counts are only on the single-commit endpoint
+            details = await _gather(*(client.get(f"/repos/{repo}/commits/{row['Repo_ID']}") for row in rows))
+            rows = [commit_row(detail.json()) for detail in details]
+        return rows
+
+    async def issues():
+        rows = []
+        params = dict(since_params, state="all")
+        async for page in client.pages(f"/repos/{repo}/issues", params, f"{repo}:issues", pending):
+            # The issues endpoint also lists pull requests
+            rows.extend(issue_row(item) for item in page if "pull_request" not in item)
+        return rows
+
+    async def pull_requests():
+        rows = []
+        params = {"state": "all", "sort": "updated", "direction": "desc"}
+        async for page in client.pages(f"/repos/{repo}/pulls", params, f"{repo}:pulls", pending):
+            fresh = [item for item in page if since is None or parse_time(item.get("updated_at")) >= since]
+            rows.extend((pull_request_row(item), item["number"]) for item in fresh)
+            # Sorted by last update, so the first stale pull request ends the listing
+            if len(fresh) < len(page):
+                break
+        reviews = await _gather(*(review_rows(number) for _, number in rows))
+        return [row for row, _ in rows] + [row for batch in reviews for row in batch]
+
+    async def review_rows(number):
+        rows = []
+        async for page in client.pages(f"/repos/{repo}/pulls/{number}/reviews", {}, f"{repo}:reviews:{number}",
+                                       pending):
+            rows.extend(review_row(item, number) for item in page if item.get("submitted_at"))
+        return rows
+
+    async def comments():
+        rows = []
+        async for page in client.pages(f"/repos/{repo}/issues/comments", since_params, f"{repo}:comments", pending):
+            rows.extend(comment_row(item) for item in page)
+        return rows
+
+    for batch in await _gather(commits(), issues(), pull_requests(), comments()):
+        for row in batch:
+            if is_new(row):
+                yield row
+
+
+def read_repo_list(path):
+    """
+    Read the team repository list; Term Start is optional.
+    """
+    repos = pd.read_csv(path, dtype=str)
+    missing = [column for column in ("Semester", "Year", "Your Team", "Repo") if column not in repos.columns]
+    if missing:
+        raise ValueError(f"{path} is missing columns {missing}")
+    if "Term Start" not in repos.columns:
+        repos["Term Start"] = None
+    return repos
+
+
+def load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+async def collect(repos, output, base_url=None, token=None, max_concurrency=MAX_CONCURRENCY,
+                  state_path=STATE_PATH, full=False, commit_stats=False, timestamp_timezone=TIMESTAMP_TIMEZONE,
+                  transport=None, calendars=None):
+    """
+    Crawl every repository of `repos` (see read_repo_list) concurrently and
+    stream its events into `output` in the collated CSV schema.
+
+    Unless `full` is set, each repository is only asked for what happened
+    since its previous successful crawl, so the output is a batch of new
+    events ready for `python segments.py append`. A repository's rows are
+    written once all of its requests succeeded, so a failed repository
+    leaves no partial rows and is retried in full next time. Weeks come
+    from the repository's term in `calendars` (see semester_calendar.py),
+    in that calendar's timezone, when it has one, otherwise from its Term
+    Start in `timestamp_timezone`. Timestamp is written in
+    `timestamp_timezone`, UTC by default like the collated data. Returns a
+    summary dict.
+    """
+    tz = ZoneInfo(timestamp_timezone)
+    state = load_state(state_path) if state_path and not full else {}
+    started = datetime.now(timezone.utc).replace(microsecond=0)
+    counts = {"rows": 0, "repos": 0, "failed": []}
+
+    with open(output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=EVENT_COLUMNS, restval=MISSING, extrasaction="ignore")
+        writer.writeheader()
+
+        async with GitHubClient(base_url, token, max_concurrency, state, transport) as client:
+            async def crawl(repo_info):
+                repo = repo_info["Repo"]
+                since = parse_time(client.state["since"].get(repo))
+                term_start = (date.fromisoformat(repo_info["Term Start"])
+                              if isinstance(repo_info["Term Start"], str) and repo_info["Term Start"] else None)
+                calendar = (calendars or {}).get((repo_info["Semester"], int(repo_info["Year"])))
+                pending = client.new_pending()
+                try:
+                    async for row in collect_repo(client, repo, since, commit_stats, pending):
+                        moment = row.pop("_time")
+                        row.update({
+                            "Semester": repo_info["Semester"],
+                            "Year": repo_info["Year"],
+                            "Your Team": repo_info["Your Team"],
+                            "Timestamp": format_timestamp(moment, tz),
+                            "week": event_week(moment, term_start, tz) if calendar is None or moment is None
+                            else calendar.week_of(moment) or MISSING,
+                        })
+                        # Rows are written as they arrive; the loop is single-threaded
+                        writer.writerow(row)
+                        counts["rows"] += 1
+                except Exception as e:
+                    counts["failed"].append(repo)
+                    print(f"Could not crawl {repo}: {e}", file=sys.stderr)
+                    return
+                # Only now may later crawls treat this crawl's pages as written
+                client.commit(repo, pending)
+                client.state["since"][repo] = started.strftime("%Y-%m-%dT%H:%M:%SZ")
+                counts["repos"] += 1
+
+            await asyncio.gather(*(crawl(repo_info) for repo_info in repos.to_dict("records")))
+
+    if state_path:
+        save_state(state, state_path)
+    counts.update(requests=client.requests, not_modified=client.not_modified,
+                  rate_limit_waits=client.rate_limiter.waits)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect GitHub events of the team repositories into the "
+                                                 "collated CSV schema")
+    parser.add_argument("--repos", default=DEFAULT_REPO_LIST,
+                        help="CSV of Semester, Year, Your Team, Repo and optional Term Start (default: %(default)s)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="events CSV to write (default: %(default)s)")
+    parser.add_argument("--api-url", help=f"API base URL (default: ${API_URL_ENV_VAR} or {DEFAULT_API_URL})")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY,
+                        help="requests in flight (default: %(default)s)")
+    parser.add_argument("--state", default=STATE_PATH, help="ETag/since state file (default: %(default)s)")
+    parser.add_argument("--full", action="store_true", help="ignore the state and crawl everything")
+    parser.add_argument("--commit-stats", action="store_true",
+                        help="fetch every commit for its Additions/Deletions (one request per commit)")
+    parser.add_argument("--timezone", default=TIMESTAMP_TIMEZONE,
+                        help="timezone of Timestamp and of Term Start weeks (default: %(default)s)")
+    parser.add_argument("--calendar", help="semester calendar CSV to number weeks by instead of Term Start")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    summary = asyncio.run(collect(read_repo_list(args.repos), args.output, args.api_url,
+                                  max_concurrency=args.concurrency, state_path=args.state, full=args.full,
+                                  commit_stats=args.commit_stats, timestamp_timezone=args.timezone,
+                                  calendars=read_calendar(args.calendar) if args.calendar else None))
+    print(f"Wrote {summary['rows']} events from {summary['repos']} repositories to {args.output} in "
+          f"{time.perf_counter() - start:.1f}s ({summary['requests']} requests, {summary['not_modified']} not "
+          f"modified, {summary['rate_limit_waits']} rate-limit waits)")
+    if summary["failed"]:
+        print(f"Failed: {', '.join(summary['failed'])}", file=sys.stderr)
+        sys.exit(1)
@@ -1,16 +1,38 @@
+import os
+import time
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from matplotlib.colors import LinearSegmentedColormap
-from datetime import datetime
+from figure_cache import FigureCache
+from figures import (activity_distribution_figure, activity_heatmap_figure, collaboration_network_figure,
+                     consistency_figure,
+                     lifecycle_figure, member_actions_figure, member_breakdown_figure, member_churn_figure,
+                     member_comparison_figure, member_status_figure, member_timeline_figure,
+                     weekly_breakdown_figure, weekly_churn_figure, weekly_trends_figure)
+from aggregates import (ACTION_LABELS, ACTIONS, build_classification_lookup, member_churn_table,
+                        member_contribution_table, member_summary_table, team_workload_gini, weekly_action_counts)
+from collaboration import (COLLABORATION_EVENT_COLUMNS, RELATION_COLUMNS, RELATION_LABELS,
+                           build_collaboration_graph, circle_layout)
+from lifecycle import (LIFECYCLE_ACTIONS, LIFECYCLE_EVENT_COLUMNS, LIFECYCLE_LABELS, REVIEW_ACTION,
+                       build_lifecycle_table, format_hours, lifecycle_percentiles)
+from semantic_search import (RESULT_COLUMNS, SEARCH_EVENT_COLUMNS, SEARCH_INDEX_DIR, embed_texts, load_encoder,
+                             load_message_search, search_keys)
+from sql_backend import event_backend, load_event_store
+from segments import load_incremental
+from early_warning import IMBALANCE_GINI, INACTIVE_STREAK_WEEKS, INACTIVE_WEEKS, scan_cohort
+from profiling import (RerunProfiler, cache_summary, latency_summary, profile_log_path, profiling_enabled_by_env,
+                       read_log)
 
 
 # Set page config for a cleaner look
 st.set_page_config(layout="wide", page_title="Team Contribution Dashboard", page_icon="📊")
 
+# Opt-in timing of each section of the page, switched on with the sidebar
+# toggle (or GITDASH_PROFILE=1) and appended to a JSONL log per rerun
+PROFILE_LOG_PATH = profile_log_path()
+PROFILE_SUMMARY_RECORDS = 2000
+SEARCH_RESULT_LIMIT = 50
+profiler = RerunProfiler(enabled=st.session_state.get("profile_dashboard", profiling_enabled_by_env()))
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -28,40 +50,320 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Load data
+# Load data (typed columns, served from the Parquet ingest cache when fresh).
+# Batches appended with `python segments.py append` are folded in on the
+# next rerun, updating only the aggregates of the teams and weeks they touch.
+# With GITDASH_BACKEND=sqlite or duckdb the events stay in an embedded
+# database instead, and each panel queries only the slice it displays
+EVENT_BACKEND = event_backend()
+
+@st.cache_resource
+def load_incremental_data():
+    profiler.mark_miss("load_incremental_data")
+    return load_incremental()
+
+@st.cache_resource
+def load_sql_data(backend):
+    profiler.mark_miss("load_sql_data")
+    return load_event_store(backend=backend)
+
+if EVENT_BACKEND == "pandas":
+    event_log, survey_data, classification_data = profiler.cached("load_incremental_data", load_incremental_data)
+    with profiler.section("apply new segments"):
+        events_snapshot = event_log.refresh()
+    data_version = events_snapshot.data_version
+    event_store = None
+else:
+    event_store, survey_data, classification_data, data_version = profiler.cached("load_sql_data", load_sql_data,
+                                                                                  EVENT_BACKEND)
+    events_snapshot = None
+
+# Team x member x week x action counts (see aggregates.ActivityCube); the
+# panels below read slices of it instead of re-filtering the event table.
+# The store answers the same lookups with GROUP BY queries
+activity_cube = events_snapshot.cube if event_store is None else event_store
+
+@st.cache_resource
+def load_classification_lookup(_classification_data, data_version):
+    profiler.mark_miss("load_classification_lookup")
+    return build_classification_lookup(_classification_data)
+
+# Workload Gini over members' action counts, computed for every team at once
+@st.cache_resource
+def load_workload_gini(data_version):
+    profiler.mark_miss("load_workload_gini")
+    if event_store is not None:
+        return event_store.team_workload_gini()
+    return team_workload_gini(activity_cube)
+
+# Per-team label confidence from `python clustering.py --sweep`, if it has been run
+LABEL_CONFIDENCE_PATH = "team_label_confidence.csv"
+
 @st.cache_data
-def load_data():
-    repo_data = pd.read_csv("data/coded_collated_data.csv")
-    survey_data = pd.read_csv("data/coded_survey_anonymous.csv")
-    classification_data = pd.read_csv("team_classifications.csv")
-    return repo_data, survey_data, classification_data
+def load_label_confidence(path, mtime):
+    profiler.mark_miss("load_label_confidence")
+    return pd.read_csv(path, index_col="Your Team")
+
+if os.path.exists(LABEL_CONFIDENCE_PATH):
+    label_confidence = profiler.cached("load_label_confidence", load_label_confidence,
+                                       LABEL_CONFIDENCE_PATH, os.path.getmtime(LABEL_CONFIDENCE_PATH))
+else:
+    label_confidence = None
+
+# Events sorted by team/week with each team's row range, so selecting a team
+# or week slices the table instead of scanning every event
+team_partition = events_snapshot.partition if event_store is None else event_store
+classification_lookup = profiler.cached("load_classification_lookup", load_classification_lookup,
+                                        classification_data, data_version)
+
+# Figures are shared across sessions and keyed on (figure, team, week, member,
+# the team's data version), so flipping back to a team reuses what was
+# already built and appended segments only invalidate the teams they touch
+@st.cache_resource
+def load_figure_cache():
+    return FigureCache()
+
+figure_cache = load_figure_cache()
+
+def cached_figure(name, build, team, week=None, member=None):
+    built = []
+
+    def build_figure():
+        built.append(name)
+        return build()
+
+    version = data_version if events_snapshot is None else events_snapshot.team_version(team)
+    fig = figure_cache.get_or_build((name, team, week, member, version), build_figure)
+    profiler.record_cache("figure_cache", hit=not built)
+    return fig
+
+def show_figure(name, build, team, week=None, member=None):
+    # Lookup/build and Plotly serialization are timed separately
+    with profiler.section(f"chart: {name}"):
+        with profiler.section("build"):
+            fig = cached_figure(name, build, team, week=week, member=member)
+        with profiler.section("render"):
+            st.plotly_chart(fig, use_container_width=True)
+
+# Message embeddings are built offline by `python semantic_search.py`; the
+# index is reloaded whenever that rebuild touches its metadata file
+SEARCH_META_PATH = os.path.join(SEARCH_INDEX_DIR, "meta.json")
+
+# Cohort-wide tables are read from the store this many teams at a time and
+# only their compact per-team results are kept
+SQL_TEAM_BATCH = 50
+
+# Selected-team loads of the SQL backend kept in the shared cache
+TEAM_CACHE_ENTRIES = 32
+
+def batched_team_table(build):
+    teams = event_store.teams
+    tables = [build(teams[i:i + SQL_TEAM_BATCH]) for i in range(0, len(teams), SQL_TEAM_BATCH)] or [build([])]
+    return pd.concat([table for table in tables if len(table)] or tables[:1])
+
+@st.cache_resource
+def load_search_index(data_version, index_mtime):
+    profiler.mark_miss("load_search_index")
+    if event_store is None:
+        return load_message_search(events_snapshot.events(), SEARCH_INDEX_DIR)
+    # The index holds event ids, message keys and filter columns only; the
+    # displayed results are fetched back from the store by id
+    keys = batched_team_table(lambda teams: search_keys(
+        event_store.events(["event_id"] + SEARCH_EVENT_COLUMNS, teams=teams, any_not_null=["Message"])
+    )).reset_index(drop=True)
+    return load_message_search(keys, SEARCH_INDEX_DIR,
+                               fetch=lambda ids: event_store.events_by_id(ids, RESULT_COLUMNS))
+
+@st.cache_resource
+def load_search_encoder(model_name):
+    return load_encoder(model_name)
+
+# Issue/PR lifecycle of every team, with per-team and per-member percentiles
+@st.cache_resource
+def load_lifecycle(data_version):
+    profiler.mark_miss("load_lifecycle")
+    # After an append only the touched teams' items are rebuilt
+    lifecycle = events_snapshot.team_table("lifecycle", build_lifecycle_table)
+    return (lifecycle, lifecycle_percentiles(lifecycle),
+            lifecycle_percentiles(lifecycle, by=("Your Team", "Author")))
+
+def store_lifecycle(teams):
+    # Only issue, pull request and review rows leave the database
+    return build_lifecycle_table(
+        event_store.events(LIFECYCLE_EVENT_COLUMNS, teams=teams, actions=LIFECYCLE_ACTIONS + [REVIEW_ACTION]),
+        as_of=event_store.team_last_event(),
+    )
+
+# SQL backend: the cohort medians need every team's percentiles but none of
+# its items, and the items are loaded for the selected team only
+@st.cache_resource
+def load_lifecycle_percentiles(data_version):
+    profiler.mark_miss("load_lifecycle_percentiles")
+    return batched_team_table(lambda teams: lifecycle_percentiles(store_lifecycle(teams)))
+
+@st.cache_resource(max_entries=TEAM_CACHE_ENTRIES)
+def load_team_lifecycle(data_version, team):
+    profiler.mark_miss("load_team_lifecycle")
+    lifecycle = store_lifecycle([team])
+    return lifecycle, lifecycle_percentiles(lifecycle, by=("Your Team", "Author"))
+
+# Reviewer/assignee/tagged adjacency of every team as sparse matrices, with
+# degree, reciprocity and isolation metrics computed for all teams at once
+@st.cache_resource
+def load_collaboration(data_version):
+    profiler.mark_miss("load_collaboration")
+    return build_collaboration_graph(events_snapshot.events(), dict(zip(activity_cube.teams, activity_cube.members)))
+
+def store_collaboration(teams, rosters):
+    interactions = event_store.events(COLLABORATION_EVENT_COLUMNS, teams=teams,
+                                      any_not_null=list(RELATION_COLUMNS.values()))
+    return build_collaboration_graph(interactions, {team: rosters[team] for team in teams if team in rosters})
+
+# SQL backend: per-team metrics of every team for the cohort medians, and the
+# graph of the selected team only
+@st.cache_resource
+def load_collaboration_metrics(data_version):
+    profiler.mark_miss("load_collaboration_metrics")
+    rosters = event_store.rosters()
+    return batched_team_table(lambda teams: store_collaboration(teams, rosters).team_metrics)
+
+@st.cache_resource(max_entries=TEAM_CACHE_ENTRIES)
+def load_team_collaboration(data_version, team):
+    profiler.mark_miss("load_team_collaboration")
+    return store_collaboration([team], {team: event_store.team_members(team)})
+
+def team_network_figure(graph, team, relations):
+    nodes = graph.member_metrics.iloc[slice(*graph.team_slice(team))].copy()
+    # Roster members first around the circle, busiest first
+    nodes = nodes.sort_values(["On Roster", "Degree", "Person"], ascending=[False, False, True])
+    nodes["x"], nodes["y"] = circle_layout(len(nodes))
+    return collaboration_network_figure(nodes, graph.team_edges(team, relations))
+
+def team_activity_heatmap(team):
+    member_week = activity_cube.member_week_totals(team)
+    member_week = member_week.loc[:, member_week.sum(axis=0) > 0]
+    return activity_heatmap_figure(member_week)
+
+def team_churn_heatmap(team):
+    member_week = activity_cube.member_week_churn(team)
+    member_week = member_week.loc[:, member_week.sum(axis=0) > 0]
+    return activity_heatmap_figure(member_week, title="Lines Changed by Member and Week", value_label="Lines")
+
+def team_weekly_churn(team):
+    weekly_churn = activity_cube.weekly_churn(team)
+    return weekly_churn_figure(weekly_churn[weekly_churn.sum(axis=1) > 0])
+
+# Footer and the sidebar's cache and profiling panels, shared by both views
+def page_footer():
+    # Footer with information
+    st.markdown("---")
+    st.markdown("""
+    <div style="text-align: center; color: #666;">
+        Team Contribution Dashboard v2.0 | Updated: March 2025
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Figure cache counters, for sizing the cache during busy grading sessions
+    with st.sidebar:
+        with st.expander("Figure Cache"):
+            cache_stats = figure_cache.stats()
+            st.caption(f"{cache_stats['entries']}/{cache_stats['max_entries']} figures cached, "
+                       f"{cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                       f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['evictions']} evicted")
+
+    # Timings of this rerun plus p50/p95 latency across the logged session
+    with st.sidebar:
+        st.toggle("Profile Dashboard", key="profile_dashboard", value=profiling_enabled_by_env(),
+                  help=f"Time each section of the page and append the results to {PROFILE_LOG_PATH}")
+        if profiler.enabled:
+            rerun_record = profiler.finish(PROFILE_LOG_PATH)
+            with st.expander("Performance"):
+                st.caption(f"This rerun took {rerun_record['total_ms']:.0f} ms")
+                st.dataframe(profiler.sections_frame().drop(columns="depth").round(1), hide_index=True)
+                logged = read_log(PROFILE_LOG_PATH, limit=PROFILE_SUMMARY_RECORDS)
+                st.caption(f"Latency over the last {len(logged)} logged reruns")
+                st.dataframe(latency_summary(logged).round(1))
+                st.dataframe(cache_summary(logged).round(2))
+
+# Members' weeks since last action, inactive streaks and workload shares for
+# every team at once, plus Struggling classifications, per data version
+@st.cache_resource
+def load_early_warning(data_version):
+    profiler.mark_miss("load_early_warning")
+    member_week, members = activity_cube.member_week_counts()
+    return scan_cohort(member_week, activity_cube.teams, members, activity_cube.weeks,
+                       classification_lookup, team_partition.team_terms)
 
-repo_data, survey_data, classification_data = load_data()
+def cohort_overview():
+    st.title("Cohort Overview")
+    st.caption(f"Members are flagged inactive after {INACTIVE_WEEKS} weeks without an action (up to their team's "
+               f"last active week) and at risk after {INACTIVE_STREAK_WEEKS} silent weeks in a row; teams are "
+               f"imbalanced at a workload Gini of {IMBALANCE_GINI} or more.")
+    team_table, member_table = profiler.cached("load_early_warning", load_early_warning, data_version)
+
+    with profiler.section("cohort overview"):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Teams", len(team_table))
+        col2.metric("Teams with Inactive Members", int((team_table["Inactive Members"] > 0).sum()))
+        col3.metric("Struggling Teams", int(team_table["Struggling"].sum()))
+        col4.metric("Members at Risk", int(member_table["At Risk"].sum()))
+
+        col1, col2 = st.columns([1, 2])
+        only_warnings = col1.checkbox("Only teams with warnings", value=True)
+        labels = col2.multiselect("Classification", sorted(team_table["Classification"].unique()))
+        shown = team_table
+        if only_warnings:
+            shown = shown[shown["Warnings"] > 0]
+        if labels:
+            shown = shown[shown["Classification"].isin(labels)]
+        profiler.scanned(len(team_table))
+
+        # Click a column header to sort
+        st.dataframe(
+            shown, hide_index=True,
+            column_config={
+                "Max Workload Share": st.column_config.ProgressColumn(format="percent", min_value=0, max_value=1),
+                "Workload Gini": st.column_config.NumberColumn(format="%.2f"),
+            },
+        )
+
+        with st.expander("View Members at Risk"):
+            at_risk = member_table[member_table["At Risk"] & member_table["Your Team"].isin(shown["Your Team"])]
+            st.dataframe(
+                at_risk.drop(columns="At Risk").sort_values(["Weeks Since Last Action", "Longest Inactive Streak"],
+                                                            ascending=False),
+                hide_index=True,
+                column_config={"Workload Share": st.column_config.ProgressColumn(format="percent", min_value=0,
+                                                                                 max_value=1)},
+            )
 
 # Extract unique teams, semesters, years, and weeks
-teams = repo_data["Your Team"].unique()
-teams.sort()
-weeks = sorted(repo_data["week"].dropna().unique().astype(int))
+teams = team_partition.teams
+weeks = activity_cube.weeks
 
-# Sidebar with cleaner organization
+# The cohort-wide early-warning overview replaces the single-team pages
 with st.sidebar:
+    view_mode = st.radio("View", ["Team Dashboard", "Cohort Overview"], horizontal=True)
+
+if view_mode == "Cohort Overview":
+    cohort_overview()
+    page_footer()
+    st.stop()
+
+# Sidebar with cleaner organization
+with st.sidebar, profiler.section("sidebar filtering"):
     st.title("Filters")
     
     # Filter by team
     selected_team = st.selectbox("Select a Team", teams)
-    team_data = repo_data[repo_data["Your Team"] == selected_team]
+    team_data = team_partition.team_rows(selected_team)
+    profiler.scanned(len(team_data))
     
     # Get team classification
-    team_classification = classification_data[classification_data["Your Team"] == selected_team]["classification"].values[0] if len(classification_data[classification_data["Your Team"] == selected_team]) > 0 else "Unknown"
+    team_classification = classification_lookup.get(selected_team, "Unknown")
     
     # Get semester and year for display purposes only
-    if not team_data.empty:
-        # Just take the most recent semester and year for display
-        selected_semester = team_data["Semester"].iloc[0]
-        selected_year = team_data["Year"].iloc[0]
-    else:
-        selected_semester = "Unknown"
-        selected_year = "Unknown"
+    selected_semester, selected_year = team_partition.team_term(selected_team)
     
     # Filter by week with improved UI
     team_weeks = sorted(team_data["week"].dropna().unique().astype(int))
@@ -72,15 +374,10 @@ with st.sidebar:
         if selected_week == "All Weeks":
             team_data_week = team_data
         else:
-            team_data_week = team_data[team_data["week"] == int(selected_week)]
+            team_data_week = team_partition.team_week_rows(selected_team, int(selected_week))
     else:
         selected_week = None
         team_data_week = pd.DataFrame()
-        
-    # Add a Member filter in sidebar
-    all_team_members = set(team_data["Author"].unique())
-    member_options = ["All Members"] + sorted(all_team_members)
-    selected_member = st.selectbox("Select a Team Member", member_options)
     
     # Add view toggle for consolidated UI
     st.divider()
@@ -96,202 +393,159 @@ st.title(f"Team {selected_team} Dashboard")
 st.subheader(f"{selected_semester} {selected_year}")
 
 # Display the classification prominently at the top
-if team_classification != "Unknown":
-    classification_colors = {
-        "High-performing": "classification-high",
-        "Balanced": "classification-balanced",
-        "Struggling": "classification-struggling"
-    }
-    
-    classification_icons = {
-        "High-performing": "🏆",
-        "Balanced": "⚖️",
-        "Struggling": "🔧"
-    }
-    
-    classification_descriptions = {
-        "High-performing": "Team demonstrates consistent contributions, balanced workload, and high quality interactions.",
-        "Balanced": "Team shows steady progress with room for improvement in consistency or collaboration.",
-        "Struggling": "Team needs attention in activity levels, member engagement, or coordination."
-    }
-    
-    st.markdown(f"""
-    <div class="{classification_colors.get(team_classification, 'metric-card')}">
-        <div class="classification-icon">{classification_icons.get(team_classification, '📊')}</div>
-        <div class="classification-label">Classification: {team_classification}</div>
-        <div class="classification-desc">{classification_descriptions.get(team_classification, '')}</div>
-    </div>
-    """, unsafe_allow_html=True)
+with profiler.section("classification banner"):
+    if show_classification and team_classification != "Unknown":
+        classification_colors = {
+            "High-performing": "classification-high",
+            "Balanced": "classification-balanced",
+            "Struggling": "classification-struggling"
+        }
 
+        classification_icons = {
+            "High-performing": "🏆",
+            "Balanced": "⚖️",
+            "Struggling": "🔧"
+        }
 
-# Compute overall team metrics
-num_commits = team_data[team_data["Action"] == "commit"].shape[0]
-num_issues = team_data[team_data["Action"] == "issue"].shape[0]
-num_prs = team_data[team_data["Action"] == "pull_request"].shape[0]
-num_reviews = team_data[team_data["Action"] == "code_review"].shape[0]
-num_comments = team_data[team_data["Action"] == "comment"].shape[0]
+        classification_descriptions = {
+            "High-performing": "Team demonstrates consistent contributions, balanced workload, and high quality interactions.",
+            "Balanced": "Team shows steady progress with room for improvement in consistency or collaboration.",
+            "Struggling": "Team needs attention in activity levels, member engagement, or coordination."
+        }
 
-# Better metrics display with improved alignment
-col1, col2, col3, col4, col5 = st.columns(5)
+        # How often resampled clusterings agree with this label
+        confidence_note = ""
+        if label_confidence is not None and selected_team in label_confidence.index:
+            team_confidence = label_confidence.loc[selected_team]
+            if team_confidence["classification"] == team_classification:
+                confidence_note = (f'<div class="classification-desc">Label confidence: {team_confidence["confidence"]:.0%} '
+                                   f'of {int(team_confidence["runs"])} resampled clusterings agree</div>')
 
-# Add custom CSS for better metric alignment
-st.markdown("""
-<style>
-    .metric-card {
-        background-color: #f9f9f9;
-        border-radius: 0.5rem;
-        padding: 1.2rem 0.8rem;
-        box-shadow: 0 0 10px rgba(0,0,0,0.1);
-        text-align: center;
-        height: 100%;
-    }
-    .metric-icon {
-        font-size: 1.5rem;
-        margin-bottom: 0.5rem;
-    }
-    .metric-value {
-        font-size: 2rem;
-        font-weight: bold;
-        margin: 0.5rem 0;
-    }
-    .metric-label {
-        font-size: 1rem;
-        color: #666;
-    }
-</style>
-""", unsafe_allow_html=True)
+        st.markdown(f"""
+        <div class="{classification_colors.get(team_classification, 'metric-card')}">
+            <div class="classification-icon">{classification_icons.get(team_classification, '📊')}</div>
+            <div class="classification-label">Classification: {team_classification}</div>
+            <div class="classification-desc">{classification_descriptions.get(team_classification, '')}</div>
+            {confidence_note}
+        </div>
+        """, unsafe_allow_html=True)
 
-with col1:
-    st.markdown("""
-    <div class="metric-card">
-        <div class="metric-icon">📝</div>
-        <div class="metric-value">{}</div>
-        <div class="metric-label">Commits</div>
-    </div>
-    """.format(num_commits), unsafe_allow_html=True)
 
-with col2:
-    st.markdown("""
-    <div class="metric-card">
-        <div class="metric-icon">🔍</div>
-        <div class="metric-value">{}</div>
-        <div class="metric-label">Issues</div>
-    </div>
-    """.format(num_issues), unsafe_allow_html=True)
+with profiler.section("metric cards"):
+    # Compute overall team metrics
+    team_totals = activity_cube.action_totals(selected_team)
+    num_commits = team_totals["commit"]
+    num_issues = team_totals["issue"]
+    num_prs = team_totals["pull_request"]
+    num_reviews = team_totals["code_review"]
+    num_comments = team_totals["comment"]
 
-with col3:
-    st.markdown("""
-    <div class="metric-card">
-        <div class="metric-icon">🔄</div>
-        <div class="metric-value">{}</div>
-        <div class="metric-label">Pull Requests</div>
-    </div>
-    """.format(num_prs), unsafe_allow_html=True)
+    # Better metrics display with improved alignment
+    col1, col2, col3, col4, col5 = st.columns(5)
 
-with col4:
+    # Add custom CSS for better metric alignment
     st.markdown("""
-    <div class="metric-card">
-        <div class="metric-icon">✅</div>
-        <div class="metric-value">{}</div>
-        <div class="metric-label">Code Reviews</div>
-    </div>
-    """.format(num_reviews), unsafe_allow_html=True)
+    <style>
+        .metric-card {
+            background-color: #f9f9f9;
+            border-radius: 0.5rem;
+            padding: 1.2rem 0.8rem;
+            box-shadow: 0 0 10px rgba(0,0,0,0.1);
+            text-align: center;
+            height: 100%;
+        }
+        .metric-icon {
+            font-size: 1.5rem;
+            margin-bottom: 0.5rem;
+        }
+        .metric-value {
+            font-size: 2rem;
+            font-weight: bold;
+            margin: 0.5rem 0;
+        }
+        .metric-label {
+            font-size: 1rem;
+            color: #666;
+        }
+    </style>
+    """, unsafe_allow_html=True)
 
-with col5:
-    st.markdown("""
-    <div class="metric-card">
-        <div class="metric-icon">💬</div>
-        <div class="metric-value">{}</div>
-        <div class="metric-label">Comments</div>
-    </div>
-    """.format(num_comments), unsafe_allow_html=True)
+    with col1:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-icon">📝</div>
+            <div class="metric-value">{}</div>
+            <div class="metric-label">Commits</div>
+        </div>
+        """.format(num_commits), unsafe_allow_html=True)
 
-# Get all team members from entire dataset for selected team/semester/year
-all_team_members = set(team_data["Author"].unique())
+    with col2:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-icon">🔍</div>
+            <div class="metric-value">{}</div>
+            <div class="metric-label">Issues</div>
+        </div>
+        """.format(num_issues), unsafe_allow_html=True)
 
-# Create tabs for better organization of content
-tab1, tab2, tab3 = st.tabs(["Weekly Activity", "Team Analysis", "Member Insights"])
+    with col3:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-icon">🔄</div>
+            <div class="metric-value">{}</div>
+            <div class="metric-label">Pull Requests</div>
+        </div>
+        """.format(num_prs), unsafe_allow_html=True)
 
-with tab1:
+    with col4:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-icon">✅</div>
+            <div class="metric-value">{}</div>
+            <div class="metric-label">Code Reviews</div>
+        </div>
+        """.format(num_reviews), unsafe_allow_html=True)
+
+    with col5:
+        st.markdown("""
+        <div class="metric-card">
+            <div class="metric-icon">💬</div>
+            <div class="metric-value">{}</div>
+            <div class="metric-label">Comments</div>
+        </div>
+        """.format(num_comments), unsafe_allow_html=True)
+
+# Each tab body is a fragment, so widgets inside it (such as the member
+# selector) rerun only that tab instead of the whole page
+@st.fragment
+@profiler.fragment("tab: Weekly Activity", PROFILE_LOG_PATH)
+def weekly_activity_tab(selected_team, selected_week, team_data_week, all_team_members, show_member_details):
+    profiler.scanned(len(team_data_week))
     # Show week specific data in a cleaner layout
     if selected_week is not None and not team_data_week.empty and selected_week != "All Weeks":
         st.header(f"Week {selected_week} Contributions")
         
-        # Get active team members from the selected week
-        active_members = set(team_data_week["Author"].unique())
-        
         # Display week metrics in a more compact way
+        week_totals = activity_cube.action_totals(selected_team, week=int(selected_week))
         week_metrics = {
-            "Commits": team_data_week[team_data_week["Action"] == "commit"].shape[0],
-            "Issues": team_data_week[team_data_week["Action"] == "issue"].shape[0],
-            "PRs": team_data_week[team_data_week["Action"] == "pull_request"].shape[0],
-            "Reviews": team_data_week[team_data_week["Action"] == "code_review"].shape[0],
-            "Comments": team_data_week[team_data_week["Action"] == "comment"].shape[0]
+            "Commits": week_totals["commit"],
+            "Issues": week_totals["issue"],
+            "PRs": week_totals["pull_request"],
+            "Reviews": week_totals["code_review"],
+            "Comments": week_totals["comment"]
         }
         
         # Use plotly for better interactive charts
-        fig = go.Figure(data=[
-            go.Bar(
-                x=list(week_metrics.keys()),
-                y=list(week_metrics.values()),
-                marker_color=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-            )
-        ])
-        fig.update_layout(
-            title="Weekly Activity Breakdown",
-            xaxis_title="Activity Type",
-            yaxis_title="Count",
-            height=400
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure("weekly_breakdown", lambda: weekly_breakdown_figure(week_metrics),
+                    selected_team, week=selected_week)
         
         # Show a single visualization for team member status instead of redundant ones
         if show_member_details:
             st.subheader("Team Member Status & Contributions")
             
-            # Create a DataFrame for all team members (active and inactive)
-            member_contributions = []
-            
-            for member in all_team_members:
-                # Check if the member was active in the selected week
-                is_active = member in active_members
-                
-                # Get contributions for active members
-                if is_active:
-                    member_data = team_data_week[team_data_week["Author"] == member]
-                    commits = member_data[member_data["Action"] == "commit"].shape[0]
-                    issues = member_data[member_data["Action"] == "issue"].shape[0]
-                    prs = member_data[member_data["Action"] == "pull_request"].shape[0]
-                    reviews = member_data[member_data["Action"] == "code_review"].shape[0]
-                    comments = member_data[member_data["Action"] == "comment"].shape[0]
-                    last_action_row = member_data.sort_values("Timestamp", ascending=False).iloc[0]
-                    last_action_date = last_action_row["Timestamp"]
-                    if pd.notnull(last_action_date):
-                        last_action_date = pd.to_datetime(last_action_date)
-                        last_action_days_ago = (datetime.now() - last_action_date).days
-                    else:
-                        last_action_days_ago = "N/A"
-                    
-                else:
-                    commits = issues = prs = reviews = comments = 0
-                
-                member_contributions.append({
-                    "Team Member": member,
-                    "Status": "Active" if is_active else "Inactive",
-                    "Commits": commits,
-                    "Issues": issues,
-                    "Pull Requests": prs,
-                    "Code Reviews": reviews,
-                    "Comments": comments,
-                    "Total Actions": commits + issues + prs + reviews + comments,
-                    "Last Action Days Ago" : last_action_days_ago if is_active else "N/A",
-                    "Active": is_active
-                })
-            
-            member_df = pd.DataFrame(member_contributions)
-            
-            # Sort by activity status and then by total actions
-            member_df = member_df.sort_values(by=["Active", "Total Actions"], ascending=[False, False])
+            # Build the table for all team members (active and inactive) in one
+            # grouped pass, sorted by activity status and then by total actions
+            member_df = member_contribution_table(team_data_week, all_team_members)
             
             if not member_df.empty:
                 # Create two columns for status cards and breakdown chart
@@ -303,18 +557,8 @@ with tab1:
                     inactive_count = member_df[~member_df["Active"]].shape[0]
                     
                     # Create a donut chart with plotly for better aesthetics
-                    fig = go.Figure(data=[go.Pie(
-                        labels=["Active", "Inactive"],
-                        values=[active_count, inactive_count],
-                        hole=.5,
-                        marker_colors=['#2ecc71', '#e74c3c']
-                    )])
-                    fig.update_layout(
-                        title_text="Member Activity Status",
-                        showlegend=True,
-                        height=300
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    show_figure("member_status", lambda: member_status_figure(active_count, inactive_count),
+                                selected_team, week=selected_week)
                     
                     # Display member status in cards
                     st.markdown("### Team Members")
@@ -338,171 +582,130 @@ with tab1:
                         # Create a stacked bar chart with plotly for action breakdown
                         active_members_df = active_members_df.sort_values("Total Actions", ascending=False)
                         
-                        fig = go.Figure()
-                        
-                        # Add traces, one for each action type
-                        fig.add_trace(go.Bar(
-                            y=active_members_df["Team Member"],
-                            x=active_members_df["Commits"],
-                            name="Commits",
-                            orientation='h',
-                            marker=dict(color='rgba(31, 119, 180, 0.8)')
-                        ))
-                        fig.add_trace(go.Bar(
-                            y=active_members_df["Team Member"],
-                            x=active_members_df["Issues"],
-                            name="Issues",
-                            orientation='h',
-                            marker=dict(color='rgba(255, 127, 14, 0.8)')
-                        ))
-                        fig.add_trace(go.Bar(
-                            y=active_members_df["Team Member"],
-                            x=active_members_df["Pull Requests"],
-                            name="Pull Requests",
-                            orientation='h',
-                            marker=dict(color='rgba(44, 160, 44, 0.8)')
-                        ))
-                        fig.add_trace(go.Bar(
-                            y=active_members_df["Team Member"],
-                            x=active_members_df["Code Reviews"],
-                            name="Code Reviews",
-                            orientation='h',
-                            marker=dict(color='rgba(214, 39, 40, 0.8)')
-                        ))
-                        fig.add_trace(go.Bar(
-                            y=active_members_df["Team Member"],
-                            x=active_members_df["Comments"],
-                            name="Comments",
-                            orientation='h',
-                            marker=dict(color='rgba(148, 103, 189, 0.8)')
-                        ))
-                        
-                        fig.update_layout(
-                            barmode='stack',
-                            title="Activity Breakdown by Member",
-                            height=400,
-                            legend=dict(
-                                orientation="h",
-                                yanchor="bottom",
-                                y=1.02,
-                                xanchor="right",
-                                x=1
-                            )
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
+                        show_figure("member_breakdown", lambda: member_breakdown_figure(active_members_df),
+                                    selected_team, week=selected_week)
                 
                 # Show detailed table with expandable rows for better space usage
                 with st.expander("View Detailed Contribution Table"):
                     display_df = member_df[["Team Member", "Status", "Commits", "Issues", "Pull Requests", "Code Reviews", "Comments", "Total Actions","Last Action Days Ago"]]
                     st.dataframe(display_df.set_index("Team Member"))
 
-with tab2:
-    if show_trends:
-        st.header("Team Activity Analysis")
+
+@st.fragment
+@profiler.fragment("tab: Team Analysis", PROFILE_LOG_PATH)
+def team_analysis_tab(selected_team, team_data, all_team_members):
+    profiler.scanned(len(team_data))
+    st.header("Team Activity Analysis")
+    
+    # Activity trends over time - more interactive and visually appealing
+    if not team_data.empty and "week" in team_data.columns:
+        # Group data by week and action type
+        weekly_activity = weekly_action_counts(team_data)
         
-        # Activity trends over time - more interactive and visually appealing
-        if not team_data.empty and "week" in team_data.columns:
-            # Group data by week and action type
-            weekly_activity = team_data.groupby(["week", "Action"]).size().reset_index(name="Count")
-            
-            if not weekly_activity.empty:
-                # Use Plotly for interactive line chart
-                fig = px.line(
-                    weekly_activity, 
-                    x="week", 
-                    y="Count", 
-                    color="Action",
-                    markers=True,
-                    title="Weekly Activity Trends",
-                    labels={"week": "Week", "Count": "Number of Actions", "Action": "Activity Type"}
-                )
-                fig.update_layout(height=500)
-                st.plotly_chart(fig, use_container_width=True)
+        if not weekly_activity.empty:
+            # Use Plotly for interactive line chart
+            show_figure("weekly_trends", lambda: weekly_trends_figure(weekly_activity), selected_team)
+    
+    # Team member activity heatmap - simplified and more effective
+    if not team_data.empty and "week" in team_data.columns and len(all_team_members) > 0:
+        st.subheader("Team Activity Patterns")
         
-        # Team member activity heatmap - simplified and more effective
-        if not team_data.empty and "week" in team_data.columns and len(all_team_members) > 0:
-            st.subheader("Team Activity Patterns")
-            
-            # Combine the two heatmaps into one meaningful visualization
-            col1, col2 = st.columns([3, 2])
+        # Combine the two heatmaps into one meaningful visualization
+        col1, col2 = st.columns([3, 2])
+        
+        with col1:
+            # Member x week activity intensity, rendered client-side by Plotly
+            all_weeks = sorted(team_data["week"].dropna().unique().astype(int))
             
-            with col1:
-                # Create a heatmap of activity by member and week
-                all_weeks = sorted(team_data["week"].dropna().unique().astype(int))
-                activity_data = []
-                
-                for member in all_team_members:
-                    member_weeks = {}
-                    
-                    # Default all weeks to inactive
-                    for week in all_weeks:
-                        member_weeks[week] = 0
-                    
-                    # Count actual activities per week
-                    member_activity = team_data[team_data["Author"] == member]
-                    week_counts = member_activity.groupby("week").size()
-                    
-                    for week, count in week_counts.items():
-                        member_weeks[week] = count
-                    
-                    # Add row to activity data
-                    row_data = {"Member": member}
-                    row_data.update({f"Week {week}": member_weeks[week] for week in all_weeks})
-                    activity_data.append(row_data)
-                
-                activity_df = pd.DataFrame(activity_data)
+            if len(all_weeks) > 0:
+                show_figure("activity_heatmap", lambda: team_activity_heatmap(selected_team), selected_team)
+        
+        with col2:
+            # Create a summary of activity types by week
+            if len(all_weeks) > 0:
+                # Prepare data for activity type summary - use a donut chart for better visualization
+                action_counts = team_data["Action"].value_counts()
+                action_counts = action_counts[action_counts > 0]
                 
-                if len(all_weeks) > 0 and not activity_df.empty:
-                    # Create activity heatmap with intensity instead of binary
-                    week_cols = [col for col in activity_df.columns if col.startswith("Week")]
-                    heatmap_data = activity_df[week_cols].set_index(activity_df["Member"])
-                    
-                    # Create a custom colormap from red to green
-                    colors = [(0.8, 0.2, 0.2), (1.0, 1.0, 0.6), (0.2, 0.8, 0.2)]
-                    cmap = LinearSegmentedColormap.from_list("activity_cmap", colors, N=100)
-                    
-                    fig, ax = plt.subplots(figsize=(12, len(all_team_members) * 0.8 + 2))
-                    sns.heatmap(heatmap_data, cmap=cmap, annot=True, fmt="d",
-                              linewidths=.5, yticklabels=True, ax=ax)
-                    plt.title("Team Activity Intensity by Week")
-                    plt.tight_layout()
-                    st.pyplot(fig)
-            
-            with col2:
-                # Create a summary of activity types by week
-                if len(all_weeks) > 0:
-                    # Prepare data for activity type summary - use a donut chart for better visualization
-                    action_counts = team_data["Action"].value_counts()
-                    
-                    # Create a donut chart
-                    fig = go.Figure(data=[go.Pie(
-                        labels=action_counts.index,
-                        values=action_counts.values,
-                        hole=.4,
-                        marker_colors=['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
-                    )])
-                    fig.update_layout(
-                        title_text="Overall Activity Distribution",
-                        height=400
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                # Create a donut chart
+                show_figure("activity_distribution", lambda: activity_distribution_figure(action_counts),
+                            selected_team)
 
-with tab3:
+    # Lines added and deleted per week, when the export carries line counts
+    if activity_cube.has_churn and len(all_team_members) > 0:
+        st.subheader("Lines Changed")
+        col1, col2 = st.columns([2, 3])
+        with col1:
+            show_figure("weekly_churn", lambda: team_weekly_churn(selected_team), selected_team)
+        with col2:
+            show_figure("churn_heatmap", lambda: team_churn_heatmap(selected_team), selected_team)
+
+    # How long issues and pull requests stay open and wait for a review
+    if event_store is None:
+        lifecycle, team_lifecycle, member_lifecycle = profiler.cached("load_lifecycle", load_lifecycle,
+                                                                      data_version)
+    else:
+        team_lifecycle = profiler.cached("load_lifecycle_percentiles", load_lifecycle_percentiles, data_version)
+        lifecycle, member_lifecycle = profiler.cached("load_team_lifecycle", load_team_lifecycle,
+                                                      data_version, selected_team)
+    team_items = lifecycle[lifecycle["Your Team"] == selected_team]
+    if not team_items.empty:
+        st.subheader("Issue & Pull Request Lifecycle")
+        team_stats = team_lifecycle.loc[selected_team]
+        cohort_stats = team_lifecycle.groupby(level="Action").median()
+
+        def team_stat(action, column):
+            return team_stats.loc[action, column] if action in team_stats.index else None
+
+        def cohort_median(action, column):
+            return format_hours(cohort_stats.loc[action, column] if action in cohort_stats.index else None)
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Median PR Time to Close", format_hours(team_stat("pull_request", "Open Hours p50")),
+                    help=f"Cohort median: {cohort_median('pull_request', 'Open Hours p50')}")
+        col2.metric("Median Time to First Review", format_hours(team_stat("pull_request", "First Review Hours p50")),
+                    help=f"Cohort median: {cohort_median('pull_request', 'First Review Hours p50')}")
+        col3.metric("Median Issue Time to Close", format_hours(team_stat("issue", "Open Hours p50")),
+                    help=f"Cohort median: {cohort_median('issue', 'Open Hours p50')}")
+        col4.metric("Still Open", int(team_items["Open Age Hours"].notna().sum()),
+                    help="Issues and pull requests never closed; aged against the team's last event")
+
+        show_figure("lifecycle", lambda: lifecycle_figure(team_items), selected_team)
+
+        with st.expander("View Lifecycle by Member"):
+            member_stats = member_lifecycle.loc[selected_team].reset_index()
+            member_stats["Action"] = member_stats["Action"].map(LIFECYCLE_LABELS)
+            hour_columns = [c for c in member_stats.columns if "Hours" in c]
+            member_stats[hour_columns] = member_stats[hour_columns].map(format_hours)
+            st.dataframe(member_stats.rename(columns={"Author": "Team Member", "Action": "Item Type"}),
+                         hide_index=True)
+
+
+@st.fragment
+@profiler.fragment("tab: Member Insights", PROFILE_LOG_PATH)
+def member_insights_tab(selected_team, team_data, all_team_members, show_activity_log):
+    # The member filter lives here rather than in the sidebar so that picking
+    # a member only reruns this fragment
+    member_options = ["All Members"] + sorted(all_team_members)
+    selected_member = st.selectbox("Select a Team Member", member_options)
+    
     # Member-specific drilldown - more consolidated and visually appealing
     if selected_member != "All Members":
         # Filter data for the selected member
         member_data = team_data[team_data["Author"] == selected_member]
+        profiler.scanned(len(team_data))
         
         if not member_data.empty:
             st.header(f"{selected_member}'s Contributions")
             
             # Display member's overall contributions with visually appealing cards
+            member_totals = activity_cube.action_totals(selected_team, member=selected_member)
             member_metrics = {
-                "📝 Commits": member_data[member_data["Action"] == "commit"].shape[0],
-                "🔍 Issues": member_data[member_data["Action"] == "issue"].shape[0],
-                "🔄 PRs": member_data[member_data["Action"] == "pull_request"].shape[0],
-                "✅ Reviews": member_data[member_data["Action"] == "code_review"].shape[0],
-                "💬 Comments": member_data[member_data["Action"] == "comment"].shape[0]
+                "📝 Commits": member_totals["commit"],
+                "🔍 Issues": member_totals["issue"],
+                "🔄 PRs": member_totals["pull_request"],
+                "✅ Reviews": member_totals["code_review"],
+                "💬 Comments": member_totals["comment"]
             }
             
             cols = st.columns(5)
@@ -524,6 +727,16 @@ with tab3:
                         <div class='metric-label'>{text}</div>
                         </div>
                     """, unsafe_allow_html=True)
+
+            # Size of the member's commits, not just their number
+            if activity_cube.has_churn:
+                member_lines = activity_cube.churn_totals(selected_team, member=selected_member)
+                lines_changed = int(member_lines.sum())
+                col1, col2, col3 = st.columns(3)
+                col1.metric("Lines Added", int(member_lines["Lines Added"]))
+                col2.metric("Lines Deleted", int(member_lines["Lines Deleted"]))
+                col3.metric("Lines per Commit",
+                            f"{lines_changed / member_totals['commit']:.1f}" if member_totals["commit"] else "N/A")
             # Create two columns for charts
             col1, col2 = st.columns(2)
             
@@ -531,6 +744,7 @@ with tab3:
                 # Display a timeline of contributions - interactive chart
                 st.subheader("Contribution Timeline")
                 timeline_data = member_data.groupby("week")["Action"].value_counts().unstack(fill_value=0)
+                timeline_data = timeline_data.loc[:, timeline_data.sum() > 0]
                 
                 if not timeline_data.empty:
                     # Convert to long format for plotly
@@ -542,39 +756,17 @@ with tab3:
                     )
                     
                     # Create interactive area chart
-                    fig = px.area(
-                        timeline_long, 
-                        x="week", 
-                        y="Count", 
-                        color="Action",
-                        title=f"Activity Timeline for {selected_member}",
-                        labels={"week": "Week", "Count": "Number of Actions"}
-                    )
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
+                    show_figure("member_timeline", lambda: member_timeline_figure(timeline_long, selected_member),
+                                selected_team, member=selected_member)
             
             with col2:
                 # Visualize the breakdown of actions - more visually appealing
                 st.subheader("Action Breakdown")
                 action_counts = member_data["Action"].value_counts()
+                action_counts = action_counts[action_counts > 0]
                 
-                colors = ['rgba(31, 119, 180, 0.8)', 'rgba(255, 127, 14, 0.8)', 
-                         'rgba(44, 160, 44, 0.8)', 'rgba(214, 39, 40, 0.8)', 
-                         'rgba(148, 103, 189, 0.8)']
-                
-                fig = go.Figure(data=[go.Bar(
-                    x=action_counts.index,
-                    y=action_counts.values,
-                    marker_color=colors[:len(action_counts)]
-                )])
-                
-                fig.update_layout(
-                    title=f"Activity Distribution for {selected_member}",
-                    xaxis_title="Action Type",
-                    yaxis_title="Count",
-                    height=400
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                show_figure("member_actions", lambda: member_actions_figure(action_counts, selected_member),
+                            selected_team, member=selected_member)
             
             # Show detailed activity log if requested
             if show_activity_log:
@@ -587,78 +779,160 @@ with tab3:
         # Display aggregated view for all members
         st.header("All Team Members Comparison")
         
-        # Create a DataFrame for comparative analysis
-        member_summary = []
-        for member in all_team_members:
-            member_data = team_data[team_data["Author"] == member]
-            
-            member_summary.append({
-                "Team Member": member,
-                "Commits": member_data[member_data["Action"] == "commit"].shape[0],
-                "Issues": member_data[member_data["Action"] == "issue"].shape[0],
-                "Pull Requests": member_data[member_data["Action"] == "pull_request"].shape[0],
-                "Code Reviews": member_data[member_data["Action"] == "code_review"].shape[0],
-                "Comments": member_data[member_data["Action"] == "comment"].shape[0],
-                "Total Actions": member_data.shape[0],
-                "Active Weeks": member_data["week"].nunique()
-            })
+        # How evenly the work is shared, relative to every other team
+        workload_gini = profiler.cached("load_workload_gini", load_workload_gini, data_version)
+        team_gini = workload_gini.get(selected_team)
+        if team_gini is not None and pd.notna(team_gini):
+            col1, col2 = st.columns(2)
+            col1.metric("Workload Gini", f"{team_gini:.2f}",
+                        help="0 means every member contributed equally; values near 1 mean one member did nearly everything.")
+            col2.metric("Cohort Median Workload Gini", f"{workload_gini.median():.2f}")
         
-        member_summary_df = pd.DataFrame(member_summary).sort_values("Total Actions", ascending=False)
+        # Create a DataFrame for comparative analysis from the team's slice of the cube
+        member_summary = member_summary_table(activity_cube, selected_team)
+        member_summary_df = member_summary.drop(columns="Consistency %").sort_values("Total Actions", ascending=False)
         
         # Create an interactive visualization comparing all members
-        fig = px.bar(
-            member_summary_df, 
-            x="Team Member", 
-            y=["Commits", "Issues", "Pull Requests", "Code Reviews", "Comments"],
-            title="Contribution Comparison Across Team",
-            labels={"value": "Number of Actions", "variable": "Action Type"},
-            height=500
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        show_figure("member_comparison", lambda: member_comparison_figure(member_summary_df), selected_team)
         
         # Show the data table with expandable view
         with st.expander("View Detailed Member Comparison"):
             st.dataframe(member_summary_df.set_index("Team Member"))
+
+        # Many small commits and a few large ones look alike by count alone
+        if activity_cube.has_churn:
+            st.subheader("Lines Changed by Member")
+            member_churn_df = member_churn_table(activity_cube, selected_team)
+            show_figure("member_churn", lambda: member_churn_figure(member_churn_df), selected_team)
+            with st.expander("View Lines Changed Table"):
+                st.dataframe(member_churn_df.set_index("Team Member"))
         
         # Show consistency analysis - who contributes most consistently
         st.subheader("Contribution Consistency Analysis")
         
-        # Calculate consistency metrics
+        # Consistency metrics come with the member summary
         if "week" in team_data.columns:
-            total_weeks = team_data["week"].nunique()
-            
-            for i in range(len(member_summary)):
-                if total_weeks > 0:
-                    member_summary[i]["Consistency %"] = round((member_summary[i]["Active Weeks"] / total_weeks) * 100, 1)
-                else:
-                    member_summary[i]["Consistency %"] = 0
-            
-            consistency_df = pd.DataFrame(member_summary)[["Team Member", "Active Weeks", "Consistency %", "Total Actions"]]
+            consistency_df = member_summary[["Team Member", "Active Weeks", "Consistency %", "Total Actions"]]
             consistency_df = consistency_df.sort_values("Consistency %", ascending=False)
             
             # Create a scatterplot showing consistency vs total contributions
-            fig = px.scatter(
-                consistency_df,
-                x="Consistency %",
-                y="Total Actions",
-                size="Total Actions",
-                color="Consistency %",
-                hover_name="Team Member",
-                text="Team Member",
-                title="Contribution Volume vs Consistency",
-                labels={"Consistency %": "% of Weeks with Activity", "Total Actions": "Total Contributions"},
-                height=500,
-                color_continuous_scale="viridis"
-            )
-            
-            fig.update_traces(textposition='top center')
-            fig.update_layout(xaxis_range=[0, 105])
-            st.plotly_chart(fig, use_container_width=True)
+            show_figure("consistency", lambda: consistency_figure(consistency_df), selected_team)
 
-# Footer with information
-st.markdown("---")
-st.markdown("""
-<div style="text-align: center; color: #666;">
-    Team Contribution Dashboard v2.0 | Updated: March 2025
-</div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+
+@st.fragment
+@profiler.fragment("tab: Collaboration", PROFILE_LOG_PATH)
+def collaboration_tab(selected_team):
+    st.header("Collaboration Network")
+    if event_store is None:
+        graph = profiler.cached("load_collaboration", load_collaboration, data_version)
+        team_metrics = graph.team_metrics
+    else:
+        team_metrics = profiler.cached("load_collaboration_metrics", load_collaboration_metrics, data_version)
+        graph = profiler.cached("load_team_collaboration", load_team_collaboration, data_version, selected_team)
+    if selected_team not in graph.team_metrics.index:
+        st.info("No members found for this team.")
+        return
+
+    team_stats = graph.team_metrics.loc[selected_team]
+    cohort_stats = team_metrics.median()
+    reciprocity = team_stats["Reciprocity"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Collaborator Pairs", int(team_stats["Interactions"]),
+                help=f"Who reviewed, assigned or tagged whom. Cohort median: {cohort_stats['Interactions']:.0f}")
+    col2.metric("Reciprocity", "N/A" if pd.isna(reciprocity) else f"{reciprocity:.0%}",
+                help=f"Share of pairs that go both ways. Cohort median: {cohort_stats['Reciprocity']:.0%}")
+    col3.metric("Density", f"{team_stats['Density']:.0%}",
+                help=f"Share of possible pairs that interacted. Cohort median: {cohort_stats['Density']:.0%}")
+    col4.metric("Isolated Members", int(team_stats["Isolated Members"]),
+                help=f"Members nobody reviewed, assigned or tagged, and who did none of that. "
+                     f"Cohort median: {cohort_stats['Isolated Members']:.0f}")
+
+    members = graph.member_metrics.iloc[slice(*graph.team_slice(selected_team))]
+    present = [relation for relation in RELATION_COLUMNS
+               if members[f"{RELATION_LABELS[relation]} Given"].sum() > 0]
+    if not present:
+        st.info("No reviews, assignments or tags are recorded for this team.")
+    else:
+        relations = st.multiselect("Relations", present, default=present, format_func=RELATION_LABELS.get)
+        show_figure(f"collaboration_network:{'+'.join(relations)}",
+                    lambda: team_network_figure(graph, selected_team, relations), selected_team)
+
+    isolated = members.loc[members["Isolated"], "Person"].tolist()
+    if isolated:
+        st.caption(f"Isolated: {', '.join(isolated)}")
+    with st.expander("View Collaboration by Member"):
+        st.dataframe(members.drop(columns=["Your Team", "Isolated"]).rename(columns={"Person": "Team Member"})
+                     .sort_values("Degree", ascending=False), hide_index=True)
+
+
+@st.fragment
+@profiler.fragment("tab: Message Search", PROFILE_LOG_PATH)
+def message_search_tab(selected_team):
+    st.header("Message Search")
+    index_mtime = os.path.getmtime(SEARCH_META_PATH) if os.path.exists(SEARCH_META_PATH) else None
+    search, search_meta = profiler.cached("load_search_index", load_search_index, data_version, index_mtime)
+    if search is None:
+        st.info("No message index has been built yet. Run `python semantic_search.py` to embed the event messages.")
+        return
+
+    query = st.text_input("Search commit, issue, pull request and comment messages",
+                          placeholder="e.g. authentication, database migration, CSS fixes")
+    col1, col2, col3 = st.columns([1, 2, 2])
+    scope = col1.radio("Teams", ["This team", "All teams"], horizontal=True)
+    search_actions = col2.multiselect("Actions", ACTIONS, format_func=ACTION_LABELS.get)
+    search_weeks = col3.multiselect("Weeks", weeks)
+    if search.unindexed:
+        st.caption(f"{search.unindexed} messages are not indexed yet; run `python semantic_search.py` to add them.")
+    if not query.strip():
+        return
+
+    try:
+        encoder = load_search_encoder(search_meta["model"])
+    except (ImportError, OSError) as e:
+        st.warning(f"Could not load the embedding model {search_meta['model']}: {e}")
+        return
+
+    with profiler.section("query"):
+        start = time.perf_counter()
+        results = search.search(
+            embed_texts(encoder, [query])[0], k=SEARCH_RESULT_LIMIT,
+            teams=[selected_team] if scope == "This team" else None,
+            weeks=search_weeks or None, actions=search_actions or None,
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    st.caption(f"{len(results)} matches in {elapsed_ms:.0f} ms")
+    st.dataframe(results.round({"Score": 3}), hide_index=True)
+
+
+# Get all team members from entire dataset for selected team/semester/year
+all_team_members = set(activity_cube.team_members(selected_team))
+
+# Create tabs for better organization of content; the tabs track which one is
+# open so hidden tabs are not computed at all
+tab1, tab2, tab3, tab4, tab5 = st.tabs(
+    ["Weekly Activity", "Team Analysis", "Member Insights", "Collaboration", "Message Search"],
+    key="dashboard_tab", on_change="rerun"
+)
+profiler.context = {"team": selected_team, "week": selected_week, "tab": st.session_state.get("dashboard_tab")}
+
+with tab1:
+    if tab1.open:
+        weekly_activity_tab(selected_team, selected_week, team_data_week, all_team_members, show_member_details)
+
+with tab2:
+    if tab2.open and show_trends:
+        team_analysis_tab(selected_team, team_data, all_team_members)
+
+with tab3:
+    if tab3.open:
+        member_insights_tab(selected_team, team_data, all_team_members, show_activity_log)
+
+with tab4:
+    if tab4.open:
+        collaboration_tab(selected_team)
+
+with tab5:
+    if tab5.open:
+        message_search_tab(selected_team)
+
+page_footer()
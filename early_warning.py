@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import gini_by_group
+
+# A member is inactive once this many numbered weeks have passed since
+# their last action (measured up to the team's last active week)
+INACTIVE_WEEKS = 3
+
+# A run of this many silent weeks inside the team's active span puts a
+# member at risk even if they came back later
+INACTIVE_STREAK_WEEKS = 6
+
+# Teams whose workload Gini reaches this are flagged as imbalanced
+IMBALANCE_GINI = 0.5
+
+STRUGGLING_LABEL = "Struggling"
+
+
+def trailing_run_lengths(mask):
+    """
+    Length of the run of True values ending at each position along the last axis.
+    """
+    runs = np.cumsum(mask, axis=-1, dtype=np.int32)
+    resets = np.maximum.accumulate(np.where(mask, 0, runs), axis=-1)
+    return runs - resets
+
+
+def scan_cohort(member_week, teams, members, weeks, classifications=None, terms=None):
+    """
+    Early-warning metrics for every member and team from one dense
+    (team, member, week) array of event counts, in a single vectorized pass.
+
+    `members[t]` is the roster of `teams[t]` (shorter rosters leave trailing
+    member slots unused) and `weeks` are the numbered weeks on the last axis.
+    Each team is measured over its own active span, from its first to its
+    last week with any event, so finished and ongoing terms compare fairly.
+    Events without a week number are not counted.
+
+    Returns (team_table, member_table). Member columns: Weeks Since Last
+    Action, Longest Inactive Streak, Workload Share, Inactive and At Risk.
+    Team columns add Inactive Members, Members At Risk, Max Workload Share,
+    Workload Gini, the Struggling classification and a Warnings count.
+    """
+    member_week = np.asarray(member_week)
+    n_teams, n_slots, n_weeks = member_week.shape
+    week_numbers = np.asarray(weeks, dtype=np.int64)
+    roster_sizes = np.array([len(roster) for roster in members], dtype=np.int64)
+    in_roster = np.arange(n_slots)[None, :] < roster_sizes[:, None]
+
+    active = member_week > 0
+    team_active = active.any(axis=1)
+    has_weeks = team_active.any(axis=1)
+    team_first = np.argmax(team_active, axis=1)
+    team_last = n_weeks - 1 - np.argmax(team_active[:, ::-1], axis=1)
+    member_has = active.any(axis=2)
+    member_last = n_weeks - 1 - np.argmax(active[:, :, ::-1], axis=2)
+
+    if n_weeks:
+        last_week = week_numbers[team_last]
+        last_active = np.where(member_has, week_numbers[member_last], 0)
+        span_weeks = last_week - week_numbers[team_first] + 1
+        # Members with no numbered-week action at all were silent the whole span
+        weeks_since = np.where(member_has, last_week[:, None] - week_numbers[member_last], span_weeks[:, None])
+    else:
+        last_week = np.zeros(n_teams, dtype=np.int64)
+        last_active = np.zeros((n_teams, n_slots), dtype=np.int64)
+        weeks_since = np.zeros((n_teams, n_slots), dtype=np.int64)
+    weeks_since = np.where(has_weeks[:, None], weeks_since, 0)
+
+    slots = np.arange(n_weeks)
+    in_span = (slots[None, :] >= team_first[:, None]) & (slots[None, :] <= team_last[:, None])
+    silent = ~active & in_span[:, None, :]
+    longest_streak = trailing_run_lengths(silent).max(axis=2, initial=0)
+
+    member_total = member_week.sum(axis=2)
+    team_total = member_total.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(team_total[:, None] > 0, member_total / team_total[:, None], 0.0)
+
+    inactive = in_roster & has_weeks[:, None] & (weeks_since >= INACTIVE_WEEKS)
+    at_risk = inactive | (in_roster & (longest_streak >= INACTIVE_STREAK_WEEKS))
+
+    team_ids, slot_ids = np.nonzero(in_roster)
+    member_table = pd.DataFrame({
+        "Your Team": np.asarray(teams, dtype=object)[team_ids],
+        "Team Member": np.concatenate([np.asarray(roster, dtype=object) for roster in members])
+        if len(team_ids) else np.array([], dtype=object),
+        "Total Actions": member_total[team_ids, slot_ids],
+        "Workload Share": share[team_ids, slot_ids],
+        "Last Active Week": pd.array(last_active[team_ids, slot_ids], dtype="Int64"),
+        "Weeks Since Last Action": weeks_since[team_ids, slot_ids],
+        "Longest Inactive Streak": longest_streak[team_ids, slot_ids],
+        "Inactive": inactive[team_ids, slot_ids],
+        "At Risk": at_risk[team_ids, slot_ids],
+    })
+    member_table.loc[~member_has[team_ids, slot_ids], "Last Active Week"] = pd.NA
+
+    gini = gini_by_group(member_total[team_ids, slot_ids], team_ids).reindex(range(n_teams))
+    team_table = pd.DataFrame({
+        "Your Team": list(teams),
+        "Members": roster_sizes,
+        "Total Actions": team_total,
+        "Last Week": pd.array(np.where(has_weeks, last_week, 0), dtype="Int64"),
+        "Inactive Members": inactive.sum(axis=1),
+        "Members At Risk": at_risk.sum(axis=1),
+        "Max Workload Share": np.where(in_roster, share, 0.0).max(axis=1, initial=0.0),
+        "Workload Gini": gini.to_numpy(),
+    })
+    team_table.loc[~has_weeks, "Last Week"] = pd.NA
+
+    classifications = classifications or {}
+    terms = terms or {}
+    team_table.insert(1, "Term", [" ".join(str(part) for part in terms.get(team, ("", ""))).strip()
+                                  for team in teams])
+    team_table.insert(2, "Classification", [classifications.get(team, "Unknown") for team in teams])
+    team_table["Struggling"] = team_table["Classification"] == STRUGGLING_LABEL
+    team_table["Imbalanced"] = team_table["Workload Gini"] >= IMBALANCE_GINI
+    team_table["Warnings"] = ((team_table["Inactive Members"] > 0).astype(int)
+                              + team_table["Struggling"].astype(int) + team_table["Imbalanced"].astype(int))
+    team_table = team_table.sort_values(["Warnings", "Members At Risk", "Workload Gini"],
+                                        ascending=False, kind="stable")
+    return team_table.reset_index(drop=True), member_table
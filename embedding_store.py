@@ -0,0 +1,141 @@
+import json
+import os
+
+import numpy as np
+
+# Bump when the on-disk layout changes
+STORE_FORMAT_VERSION = 1
+
+VECTOR_DTYPE = np.float16
+KEY_DTYPE = np.uint64
+
+
+class EmbeddingStore:
+    """
+    Append-only on-disk embedding matrix with a row -> key index.
+
+    A store directory holds three files:
+
+    * vectors.f16 - raw float16 rows, `dim` values each
+    * keys.u64    - the uint64 key (e.g. a message or event hash) of each row
+    * meta.json   - dim, model name and the number of committed rows
+
+    Readers memory-map only the committed rows, read-only, so every session
+    and worker process shares one copy through the OS page cache. A writer
+    appends raw rows and then atomically rewrites meta.json; rows past the
+    committed count (from an interrupted append) are ignored and truncated by
+    the next append.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.meta = self._read_meta()
+        self.dim = self.meta["dim"]
+        self.model = self.meta.get("model")
+        self._key_rows = None
+
+    @property
+    def _vectors_path(self):
+        return os.path.join(self.path, "vectors.f16")
+
+    @property
+    def _keys_path(self):
+        return os.path.join(self.path, "keys.u64")
+
+    @property
+    def _meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    def _read_meta(self):
+        with open(os.path.join(self.path, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported embedding store format {meta.get('format_version')} in {self.path}")
+        return meta
+
+    def _write_meta(self):
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, self._meta_path)
+
+    @classmethod
+    def create(cls, path, dim, model=None):
+        """
+        Create an empty store, replacing any store already at `path`.
+        """
+        os.makedirs(path, exist_ok=True)
+        for name in ("vectors.f16", "keys.u64"):
+            open(os.path.join(path, name), "wb").close()
+        meta = {"format_version": STORE_FORMAT_VERSION, "dim": int(dim), "model": model, "rows": 0}
+        tmp_path = os.path.join(path, "meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, "meta.json"))
+        return cls(path)
+
+    @classmethod
+    def open(cls, path):
+        """
+        Open an existing store, or return None if there is none at `path`.
+        """
+        try:
+            return cls(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __len__(self):
+        return self.meta["rows"]
+
+    def vectors(self):
+        """
+        Read-only (rows, dim) float16 memory map of the committed rows.
+        """
+        if len(self) == 0:
+            return np.empty((0, self.dim), dtype=VECTOR_DTYPE)
+        return np.memmap(self._vectors_path, dtype=VECTOR_DTYPE, mode="r", shape=(len(self), self.dim))
+
+    def keys(self):
+        """
+        Read-only memory map of the committed row keys.
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=KEY_DTYPE)
+        return np.memmap(self._keys_path, dtype=KEY_DTYPE, mode="r", shape=(len(self),))
+
+    def rows_for(self, keys):
+        """
+        Row of each key in `keys`, or -1 for keys not in the store.
+        """
+        if self._key_rows is None or len(self._key_rows[0]) != len(self):
+            stored = np.asarray(self.keys())
+            sorter = np.argsort(stored, kind="stable")
+            self._key_rows = (stored[sorter], sorter)
+        sorted_keys, sorter = self._key_rows
+        keys = np.asarray(keys, dtype=KEY_DTYPE)
+        if len(sorted_keys) == 0:
+            return np.full(len(keys), -1, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        return np.where(sorted_keys[positions] == keys, sorter[positions], -1).astype(np.int64)
+
+    def append(self, keys, vectors):
+        """
+        Append rows and commit them. Existing rows are never rewritten, so
+        readers holding a map of the old rows are unaffected.
+        """
+        keys = np.ascontiguousarray(keys, dtype=KEY_DTYPE)
+        vectors = np.ascontiguousarray(vectors, dtype=VECTOR_DTYPE).reshape(len(keys), self.dim)
+        if len(keys) == 0:
+            return
+        committed = len(self)
+        for file_path, array, itemsize in ((self._vectors_path, vectors, 2 * self.dim),
+                                           (self._keys_path, keys, 8)):
+            with open(file_path, "r+b") as f:
+                # Drop anything an interrupted append left past the committed rows
+                f.truncate(committed * itemsize)
+                f.seek(committed * itemsize)
+                f.write(array.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.meta["rows"] = committed + len(keys)
+        self._write_meta()
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from aggregates import gini_by_group
+from ingest import CACHE_DIR
+
+# Per-team behavioral features, one column each
+ACTIVITY_FEATURES = [
+    "actions_per_member_week", "active_week_ratio", "workload_gini", "review_share", "churn_per_member_week"
+]
+
+# Event columns the features read, so callers can load just these
+FEATURE_EVENT_COLUMNS = ["Your Team", "Author", "Action", "week", "Additions", "Deletions"]
+
+# One Parquet table of survey + activity features per data version
+FEATURE_STORE_DIR = os.path.join(CACHE_DIR, "features")
+FEATURE_VERSIONS_KEPT = 8
+
+
+def activity_features(events):
+    """
+    Behavioral features of every team from the event table, in one grouped
+    pass per level (team, member, member-week).
+
+    Like the activity cube, only events with a member and an action count.
+    Rates are taken over the team's active span (its first to last numbered
+    week) times its roster:
+
+    - actions_per_member_week: events in numbered weeks per member-week
+    - active_week_ratio: share of member-weeks with at least one event
+    - workload_gini: Gini index of members' total event counts
+    - review_share: share of events that are code reviews
+    - churn_per_member_week: lines added plus deleted per member-week
+
+    Returns a DataFrame indexed by team with ACTIVITY_FEATURES columns.
+    """
+    events = events[events["Your Team"].notna() & events["Author"].notna() & events["Action"].notna()]
+    team = events["Your Team"].astype(str)
+    author = events["Author"].astype(str)
+    week = pd.to_numeric(events["week"], errors="coerce")
+    lines = (pd.to_numeric(events["Additions"], errors="coerce").fillna(0)
+             + pd.to_numeric(events["Deletions"], errors="coerce").fillna(0))
+
+    member_totals = author.groupby([team, author], sort=False).size()
+    members = member_totals.groupby(level=0, sort=False).size()
+    totals = team.groupby(team, sort=False).size()
+    reviews = (events["Action"] == "code_review").groupby(team, sort=False).sum()
+
+    has_week = week.notna()
+    weeks = week[has_week].groupby(team[has_week], sort=False).agg(["min", "max"])
+    span = (weeks["max"] - weeks["min"] + 1).reindex(totals.index)
+    numbered = team[has_week].groupby(team[has_week], sort=False).size().reindex(totals.index, fill_value=0)
+    active_member_weeks = (pd.DataFrame({"team": team[has_week], "author": author[has_week], "week": week[has_week]})
+                           .drop_duplicates().groupby("team", sort=False).size()
+                           .reindex(totals.index, fill_value=0))
+    churn = lines[has_week].groupby(team[has_week], sort=False).sum().reindex(totals.index, fill_value=0)
+
+    member_weeks = members.reindex(totals.index) * span
+    with np.errstate(divide="ignore", invalid="ignore"):
+        features = pd.DataFrame({
+            "actions_per_member_week": numbered / member_weeks,
+            "active_week_ratio": active_member_weeks / member_weeks,
+            "workload_gini": gini_by_group(member_totals.to_numpy(),
+                                           member_totals.index.get_level_values(0)).reindex(totals.index),
+            "review_share": reviews.reindex(totals.index) / totals,
+            "churn_per_member_week": churn / member_weeks,
+        })
+    # Teams without a numbered week have no span to rate over
+    features = features.fillna(0.0).astype(float)
+    features.index.name = "Your Team"
+    return features.sort_index()
+
+
+def build_team_features(survey_metrics, events):
+    """
+    Join per-team survey scores (e.g. clustering.prepare_survey_data) with
+    the activity features of the same teams.
+
+    Every surveyed team is kept; a team with no events gets zero activity.
+    """
+    activity = activity_features(events)
+    survey_metrics = survey_metrics.copy()
+    survey_metrics.index = survey_metrics.index.astype(str)
+    table = survey_metrics.join(activity, how="left")
+    table[ACTIVITY_FEATURES] = table[ACTIVITY_FEATURES].fillna(0.0)
+    table.index.name = "Your Team"
+    return table
+
+
+def _store_path(store_dir, data_version):
+    return os.path.join(store_dir, f"team_features-{data_version}.parquet")
+
+
+def load_team_features(survey_metrics, events, data_version, store_dir=FEATURE_STORE_DIR):
+    """
+    The joint survey + activity feature table for `data_version`, built once
+    and then read from the feature store.
+
+    `events` may be a callable returning the event table, so a store hit
+    never loads the events. Only the FEATURE_VERSIONS_KEPT most recent
+    versions stay on disk.
+    """
+    path = _store_path(store_dir, data_version)
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path)
+        except (ImportError, OSError, ValueError):
+            pass
+
+    table = build_team_features(survey_metrics, events() if callable(events) else events)
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        table.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        stored = sorted((os.path.join(store_dir, name) for name in os.listdir(store_dir)
+                         if name.startswith("team_features-") and name.endswith(".parquet")),
+                        key=os.path.getmtime, reverse=True)
+        for old_path in stored[FEATURE_VERSIONS_KEPT:]:
+            os.remove(old_path)
+    except (ImportError, OSError) as e:
+        print(f"Could not write feature store for {data_version}: {e}")
+    return table
@@ -0,0 +1,376 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Red -> yellow -> green, the same ramp the old seaborn heatmap used
+ACTIVITY_COLORSCALE = [
+    [0.0, "rgb(204, 51, 51)"],
+    [0.5, "rgb(255, 255, 153)"],
+    [1.0, "rgb(51, 204, 51)"],
+]
+
+# Above this many cells the per-cell labels cost more than they tell
+HEATMAP_ANNOTATION_CELL_LIMIT = 600
+
+
+def activity_heatmap_figure(member_week, title="Team Activity Intensity by Week",
+                            annotation_cell_limit=HEATMAP_ANNOTATION_CELL_LIMIT, value_label="Actions"):
+    """
+    Build an interactive member x week activity heatmap from a pivot table
+    (members as rows, week numbers as columns, event counts or another
+    per-week measure named by `value_label` as values).
+
+    Cell labels are drawn only while the grid has at most
+    `annotation_cell_limit` cells; hover text always shows the exact count.
+    """
+    n_members, n_weeks = member_week.shape
+    annotate = n_members * n_weeks <= annotation_cell_limit
+
+    fig = go.Figure(data=go.Heatmap(
+        z=member_week.to_numpy(),
+        x=[f"Week {week}" for week in member_week.columns],
+        y=[str(member) for member in member_week.index],
+        colorscale=ACTIVITY_COLORSCALE,
+        xgap=1,
+        ygap=1,
+        text=member_week.to_numpy() if annotate else None,
+        texttemplate="%{text}" if annotate else None,
+        hovertemplate=f"%{{y}}<br>%{{x}}<br>%{{z}} {value_label.lower()}<extra></extra>",
+        colorbar=dict(title=value_label),
+    ))
+    fig.update_layout(
+        title=title,
+        height=max(300, 28 * n_members + 160),
+        yaxis=dict(autorange="reversed", type="category"),
+        xaxis=dict(type="category"),
+    )
+    return fig
+
+
+ACTION_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+
+CHURN_COLORS = {"Lines Added": 'rgba(44, 160, 44, 0.8)', "Lines Deleted": 'rgba(214, 39, 40, 0.8)'}
+
+MEMBER_BAR_COLORS = {
+    "Commits": 'rgba(31, 119, 180, 0.8)',
+    "Issues": 'rgba(255, 127, 14, 0.8)',
+    "Pull Requests": 'rgba(44, 160, 44, 0.8)',
+    "Code Reviews": 'rgba(214, 39, 40, 0.8)',
+    "Comments": 'rgba(148, 103, 189, 0.8)',
+}
+
+
+def weekly_breakdown_figure(week_metrics):
+    """
+    Bar chart of one week's action counts, given a {label: count} dict.
+    """
+    fig = go.Figure(data=[
+        go.Bar(
+            x=list(week_metrics.keys()),
+            y=list(week_metrics.values()),
+            marker_color=ACTION_COLORS
+        )
+    ])
+    fig.update_layout(
+        title="Weekly Activity Breakdown",
+        xaxis_title="Activity Type",
+        yaxis_title="Count",
+        height=400
+    )
+    return fig
+
+
+def member_status_figure(active_count, inactive_count):
+    """
+    Donut chart of active vs inactive members.
+    """
+    fig = go.Figure(data=[go.Pie(
+        labels=["Active", "Inactive"],
+        values=[active_count, inactive_count],
+        hole=.5,
+        marker_colors=['#2ecc71', '#e74c3c']
+    )])
+    fig.update_layout(
+        title_text="Member Activity Status",
+        showlegend=True,
+        height=300
+    )
+    return fig
+
+
+def member_breakdown_figure(active_members_df):
+    """
+    Horizontal stacked bars of each active member's actions, from rows of
+    the member contribution table.
+    """
+    fig = go.Figure()
+
+    # Add traces, one for each action type
+    for label, color in MEMBER_BAR_COLORS.items():
+        fig.add_trace(go.Bar(
+            y=active_members_df["Team Member"],
+            x=active_members_df[label],
+            name=label,
+            orientation='h',
+            marker=dict(color=color)
+        ))
+
+    fig.update_layout(
+        barmode='stack',
+        title="Activity Breakdown by Member",
+        height=400,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+
+def weekly_trends_figure(weekly_activity):
+    """
+    Line chart of action counts per week from a long (week, Action, Count) table.
+    """
+    fig = px.line(
+        weekly_activity,
+        x="week",
+        y="Count",
+        color="Action",
+        markers=True,
+        title="Weekly Activity Trends",
+        labels={"week": "Week", "Count": "Number of Actions", "Action": "Activity Type"}
+    )
+    fig.update_layout(height=500)
+    return fig
+
+
+def activity_distribution_figure(action_counts):
+    """
+    Donut chart of a team's actions by type, from an action -> count Series.
+    """
+    fig = go.Figure(data=[go.Pie(
+        labels=action_counts.index,
+        values=action_counts.values,
+        hole=.4,
+        marker_colors=ACTION_COLORS
+    )])
+    fig.update_layout(
+        title_text="Overall Activity Distribution",
+        height=400
+    )
+    return fig
+
+
+def member_timeline_figure(timeline_long, member):
+    """
+    Area chart of a member's actions per week from a long (week, Action, Count) table.
+    """
+    fig = px.area(
+        timeline_long,
+        x="week",
+        y="Count",
+        color="Action",
+        title=f"Activity Timeline for {member}",
+        labels={"week": "Week", "Count": "Number of Actions"}
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+def member_actions_figure(action_counts, member):
+    """
+    Bar chart of a member's actions by type, from an action -> count Series.
+    """
+    colors = list(MEMBER_BAR_COLORS.values())
+    fig = go.Figure(data=[go.Bar(
+        x=action_counts.index,
+        y=action_counts.values,
+        marker_color=colors[:len(action_counts)]
+    )])
+
+    fig.update_layout(
+        title=f"Activity Distribution for {member}",
+        xaxis_title="Action Type",
+        yaxis_title="Count",
+        height=400
+    )
+    return fig
+
+
+def member_comparison_figure(member_summary_df):
+    """
+    Grouped bars comparing every member's actions by type.
+    """
+    return px.bar(
+        member_summary_df,
+        x="Team Member",
+        y=["Commits", "Issues", "Pull Requests", "Code Reviews", "Comments"],
+        title="Contribution Comparison Across Team",
+        labels={"value": "Number of Actions", "variable": "Action Type"},
+        height=500
+    )
+
+
+def consistency_figure(consistency_df):
+    """
+    Scatter of each member's share of active weeks against total actions.
+    """
+    fig = px.scatter(
+        consistency_df,
+        x="Consistency %",
+        y="Total Actions",
+        size="Total Actions",
+        color="Consistency %",
+        hover_name="Team Member",
+        text="Team Member",
+        title="Contribution Volume vs Consistency",
+        labels={"Consistency %": "% of Weeks with Activity", "Total Actions": "Total Contributions"},
+        height=500,
+        color_continuous_scale="viridis"
+    )
+
+    fig.update_traces(textposition='top center')
+    fig.update_layout(xaxis_range=[0, 105])
+    return fig
+
+
+def lifecycle_figure(team_lifecycle):
+    """
+    Box plots of hours from opening to closing and to first review for a
+    team's issues and pull requests, on a log axis.
+    """
+    durations = team_lifecycle.melt(
+        id_vars="Action", value_vars=["Open Hours", "First Review Hours"], var_name="Measure", value_name="Hours"
+    ).dropna(subset=["Hours"])
+    # Items closed within seconds would vanish from a log axis
+    durations["Hours"] = durations["Hours"].clip(lower=1 / 60)
+    fig = px.box(
+        durations,
+        x="Measure",
+        y="Hours",
+        color="Action",
+        log_y=True,
+        title="Time to Close and to First Review",
+        labels={"Measure": "", "Hours": "Hours (log scale)", "Action": "Item Type"},
+        height=450
+    )
+    return fig
+
+
+def weekly_churn_figure(weekly_churn):
+    """
+    Bars of lines added (up) and deleted (down) per week, from a frame
+    indexed by week with Lines Added and Lines Deleted columns.
+    """
+    fig = go.Figure()
+    for label, sign in (("Lines Added", 1), ("Lines Deleted", -1)):
+        fig.add_trace(go.Bar(
+            x=weekly_churn.index,
+            y=sign * weekly_churn[label],
+            customdata=weekly_churn[label],
+            name=label,
+            marker_color=CHURN_COLORS[label],
+            hovertemplate="Week %{x}<br>%{customdata} " + label.lower() + "<extra></extra>"
+        ))
+    fig.update_layout(
+        barmode='relative',
+        title="Lines Changed per Week",
+        xaxis_title="Week",
+        yaxis_title="Lines",
+        height=400
+    )
+    return fig
+
+
+def member_churn_figure(member_churn_df):
+    """
+    Horizontal stacked bars of each member's lines added and deleted, from
+    rows of the member churn table.
+    """
+    fig = go.Figure()
+    for label, color in CHURN_COLORS.items():
+        fig.add_trace(go.Bar(
+            y=member_churn_df["Team Member"],
+            x=member_churn_df[label],
+            name=label,
+            orientation='h',
+            marker=dict(color=color)
+        ))
+    fig.update_layout(
+        barmode='stack',
+        title="Lines Changed by Member",
+        height=max(300, 28 * len(member_churn_df) + 160),
+        yaxis=dict(autorange="reversed", type="category"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+RELATION_COLORS = {"Reviews": 'rgba(214, 39, 40, 0.6)', "Assignments": 'rgba(31, 119, 180, 0.6)',
+                   "Tags": 'rgba(148, 103, 189, 0.6)'}
+
+
+def collaboration_network_figure(nodes, edges):
+    """
+    Network of who reviewed, assigned or tagged whom in a team.
+
+    `nodes` has Person, x, y, Degree, On Roster and Isolated columns; `edges`
+    has Source, Target, Relation and Weight. Each relation is one line trace
+    (segments separated by gaps) with hoverable markers at the edge
+    midpoints, so the figure size grows with edges rather than traces.
+    """
+    positions = nodes.set_index("Person")[["x", "y"]]
+    fig = go.Figure()
+    for relation, group in edges.groupby("Relation", sort=False):
+        start = positions.reindex(group["Source"]).to_numpy()
+        end = positions.reindex(group["Target"]).to_numpy()
+        gaps = np.full(len(group), np.nan)
+        fig.add_trace(go.Scatter(
+            x=np.column_stack([start[:, 0], end[:, 0], gaps]).ravel(),
+            y=np.column_stack([start[:, 1], end[:, 1], gaps]).ravel(),
+            mode="lines",
+            line=dict(color=RELATION_COLORS.get(relation, "rgba(120, 120, 120, 0.6)"), width=2),
+            name=relation,
+            legendgroup=relation,
+            hoverinfo="skip",
+        ))
+        # Markers 60% of the way along show the direction and count on hover
+        fig.add_trace(go.Scatter(
+            x=start[:, 0] + 0.6 * (end[:, 0] - start[:, 0]),
+            y=start[:, 1] + 0.6 * (end[:, 1] - start[:, 1]),
+            mode="markers",
+            marker=dict(symbol="circle", size=np.clip(4 + 2 * np.sqrt(group["Weight"].to_numpy()), 4, 16),
+                        color=RELATION_COLORS.get(relation, "rgba(120, 120, 120, 0.6)")),
+            text=[f"{s} → {t}: {w} {relation.lower()}"
+                  for s, t, w in zip(group["Source"], group["Target"], group["Weight"])],
+            hovertemplate="%{text}<extra></extra>",
+            legendgroup=relation,
+            showlegend=False,
+        ))
+
+    colors = np.where(nodes["Isolated"], "rgb(204, 51, 51)", np.where(nodes["On Roster"], "rgb(31, 119, 180)",
+                                                                       "rgb(170, 170, 170)"))
+    fig.add_trace(go.Scatter(
+        x=nodes["x"],
+        y=nodes["y"],
+        mode="markers+text",
+        marker=dict(size=14 + 3 * np.sqrt(nodes["Degree"].to_numpy()), color=colors,
+                    line=dict(color="white", width=1)),
+        text=nodes["Person"],
+        textposition="top center",
+        customdata=nodes["Degree"],
+        hovertemplate="%{text}<br>%{customdata} collaborators<extra></extra>",
+        name="Members",
+        showlegend=False,
+    ))
+    fig.update_layout(
+        title="Collaboration Network",
+        height=550,
+        xaxis=dict(visible=False, range=[-1.3, 1.3]),
+        yaxis=dict(visible=False, range=[-1.3, 1.3], scaleanchor="x"),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+    )
+    return fig
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# Columnar copies of the CSV inputs live next to the data they were built from
+CACHE_DIR = os.path.join("data", ".cache")
+
+# Bump when the typing rules below change so stale caches are rebuilt
+CACHE_SCHEMA_VERSION = 1
+
+# Column order of data/coded_collated_data.csv
+EVENT_COLUMNS = [
+    "Semester", "Year", "Your Team", "Timestamp", "Action", "Author", "Repo_ID", "Additions", "Deletions",
+    "Message", "Assignees", "Close_date", "Closed_by", "Request_Status", "Reviewers", "Review_Recommendation",
+    "Tagged", "week"
+]
+
+EVENT_CATEGORICAL_COLUMNS = ["Semester", "Your Team", "Action", "Author"]
+EVENT_NULLABLE_INT_COLUMNS = ["week", "Additions", "Deletions"]
+EVENT_TEXT_COLUMNS = [
+    "Repo_ID", "Message", "Assignees", "Closed_by", "Request_Status",
+    "Reviewers", "Review_Recommendation", "Tagged"
+]
+
+
+def file_fingerprint(path):
+    """
+    Return the size, modification time and content hash of a source file.
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def parse_event_data(df):
+    """
+    Convert a raw collated event table into typed columns: categorical
+    identifiers, parsed datetimes and nullable integers for counts and weeks.
+    """
+    df = df.copy()
+
+    for col in EVENT_TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("object").map(lambda v: str(v) if pd.notna(v) else None)
+
+    # Both are UTC: event timestamps are written naive, close dates as ISO-8601 with a Z suffix
+    if "Timestamp" in df.columns:
+        df["Timestamp"] = pd.to_datetime(df["Timestamp"], format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    if "Close_date" in df.columns:
+        df["Close_date"] = pd.to_datetime(df["Close_date"], utc=True, errors="coerce").dt.tz_localize(None)
+
+    for col in EVENT_NULLABLE_INT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+
+    if "Year" in df.columns:
+        df["Year"] = pd.to_numeric(df["Year"], errors="coerce").astype("Int64")
+
+    for col in EVENT_CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    return df
+
+
+def read_event_csv(path):
+    """
+    Parse the collated GitHub event CSV into a typed DataFrame.
+    """
+    raw = pd.read_csv(path, dtype={col: str for col in EVENT_TEXT_COLUMNS})
+    return parse_event_data(raw)
+
+
+def read_survey_csv(path):
+    """
+    Parse the anonymized survey CSV; team identifiers become categorical.
+    """
+    df = pd.read_csv(path)
+    df["Your Team"] = df["Your Team"].astype("category")
+    return df
+
+
+def read_classification_csv(path):
+    """
+    Parse the team classification CSV written by clustering.py.
+    """
+    return pd.read_csv(path)
+
+
+def _cache_paths(csv_path, cache_dir):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return (
+        os.path.join(cache_dir, f"{name}.parquet"),
+        os.path.join(cache_dir, f"{name}.meta.json"),
+    )
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, meta_path)
+
+
+def source_unchanged(source, csv_path):
+    """
+    Check a recorded source fingerprint against the file on disk.
+
+    The fingerprint is trusted when size and mtime match. If only the mtime
+    moved (e.g. the file was re-copied) the content hash decides, so a touched
+    but identical file does not force a rebuild. Returns the (possibly
+    refreshed) fingerprint when the content is unchanged, otherwise None.
+    """
+    stat = os.stat(csv_path)
+    if source["size"] != stat.st_size:
+        return None
+    if source["mtime_ns"] == stat.st_mtime_ns:
+        return source
+    fingerprint = file_fingerprint(csv_path)
+    return fingerprint if fingerprint["sha256"] == source["sha256"] else None
+
+
+def compose_data_version(*source_hashes):
+    """
+    Short version string for a set of source hashes, used as a cache key for
+    anything computed from those sources.
+    """
+    return hashlib.sha256(":".join([str(CACHE_SCHEMA_VERSION), *source_hashes]).encode()).hexdigest()[:16]
+
+
+def load_cached_table(csv_path, reader, cache_dir=CACHE_DIR):
+    """
+    Load a CSV through `reader`, reusing a Parquet copy of the typed result
+    while the source file is unchanged (see `source_unchanged`).
+    """
+    parquet_path, meta_path = _cache_paths(csv_path, cache_dir)
+    meta = _read_meta(meta_path)
+
+    if meta is not None and meta.get("schema_version") == CACHE_SCHEMA_VERSION and os.path.exists(parquet_path):
+        source = source_unchanged(meta["source"], csv_path)
+        if source is not None:
+            if source is not meta["source"]:
+                meta["source"] = source
+                _write_meta(meta_path, meta)
+            try:
+                return pd.read_parquet(parquet_path), source["sha256"]
+            except (ImportError, OSError, ValueError):
+                pass
+
+    fingerprint = file_fingerprint(csv_path)
+    df = reader(csv_path)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = parquet_path + ".tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        _write_meta(meta_path, {
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "source_path": os.path.abspath(csv_path),
+            "source": fingerprint,
+        })
+    except (ImportError, OSError) as e:
+        # Without pyarrow (or a writable data dir) we simply fall back to the CSV parse
+        print(f"Could not write ingest cache for {csv_path}: {e}")
+
+    return df, fingerprint["sha256"]
+
+
+def load_all(repo_path="data/coded_collated_data.csv",
+             survey_path="data/coded_survey_anonymous.csv",
+             classification_path="team_classifications.csv",
+             cache_dir=CACHE_DIR):
+    """
+    Load the event, survey and classification tables through the typed cache.
+
+    Returns the three DataFrames plus a data version string derived from the
+    source hashes, suitable as a cache key for anything computed from them.
+    """
+    repo_data, repo_hash = load_cached_table(repo_path, read_event_csv, cache_dir)
+    survey_data, survey_hash = load_cached_table(survey_path, read_survey_csv, cache_dir)
+    classification_data, classification_hash = load_cached_table(
+        classification_path, read_classification_csv, cache_dir
+    )
+    data_version = compose_data_version(repo_hash, survey_hash, classification_hash)
+    return repo_data, survey_data, classification_data, data_version
+
+
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    repo_data, survey_data, classification_data, data_version = load_all()
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {len(repo_data)} events, {len(survey_data)} survey responses and "
+          f"{len(classification_data)} classifications in {elapsed:.3f}s (data version {data_version})")
+    print(repo_data.dtypes)
@@ -0,0 +1,113 @@
+import pandas as pd
+
+# Issues and pull requests are the items with a lifecycle; code reviews
+# reference a pull request of the same team through Repo_ID
+LIFECYCLE_ACTIONS = ["issue", "pull_request"]
+REVIEW_ACTION = "code_review"
+LIFECYCLE_LABELS = {"issue": "Issues", "pull_request": "Pull Requests"}
+
+LIFECYCLE_PERCENTILES = (0.5, 0.9)
+
+# Event columns build_lifecycle_table reads
+LIFECYCLE_EVENT_COLUMNS = ["Your Team", "Timestamp", "Action", "Author", "Repo_ID", "Close_date", "Request_Status"]
+
+HOUR = pd.Timedelta(hours=1)
+
+
+def _as_datetime(values, utc=False):
+    # Already-typed columns (from ingest) pass through untouched
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    parsed = pd.to_datetime(values, utc=utc, errors="coerce")
+    return parsed.dt.tz_localize(None) if utc else parsed
+
+
+def build_lifecycle_table(repo_data, as_of=None):
+    """
+    One row per issue and pull request of every team, in one vectorized pass.
+
+    Columns: Your Team, Action, Repo_ID, Author, Opened, Closed, Status,
+    Open Hours (opened to closed), Reviews, First Review Hours (opened to the
+    earliest code review, pull requests only) and Open Age Hours (age of items
+    that are still open). Open items are aged against `as_of` (a timestamp, or
+    a Series of timestamps indexed by team), or by default against the team's
+    last event in `repo_data`, since most terms are long over.
+    """
+    timestamps = _as_datetime(repo_data["Timestamp"])
+    close_dates = _as_datetime(repo_data["Close_date"], utc=True)
+    teams = repo_data["Your Team"].astype(str)
+    actions = repo_data["Action"].astype(str)
+
+    events = pd.DataFrame({
+        "Your Team": teams,
+        "Action": actions,
+        "Repo_ID": repo_data["Repo_ID"].astype(str),
+        "Author": repo_data["Author"].astype(str),
+        "Opened": timestamps,
+        "Closed": close_dates,
+        "Status": repo_data["Request_Status"],
+    })
+
+    # An item can appear more than once in the export; its first event opened it
+    items = events[actions.isin(LIFECYCLE_ACTIONS).to_numpy()].sort_values("Opened", kind="stable")
+    items = items.drop_duplicates(["Your Team", "Action", "Repo_ID"]).reset_index(drop=True)
+
+    reviews = events[(actions == REVIEW_ACTION).to_numpy()]
+    review_stats = reviews.groupby(["Your Team", "Repo_ID"]).agg(
+        Reviews=("Opened", "size"), First_Review=("Opened", "min")
+    ).reset_index()
+    review_stats["Action"] = "pull_request"
+    items = items.merge(review_stats, on=["Your Team", "Action", "Repo_ID"], how="left")
+    items["Reviews"] = items["Reviews"].fillna(0).astype(int)
+
+    # Timestamp and Close_date are both UTC to the second, so these are never
+    # clamped: a negative duration means the export ordered an item wrongly
+    items["Open Hours"] = (items["Closed"] - items["Opened"]) / HOUR
+    items["First Review Hours"] = (items.pop("First_Review") - items["Opened"]) / HOUR
+
+    if as_of is None:
+        reference = items["Your Team"].map(timestamps.groupby(teams).max())
+    elif isinstance(as_of, pd.Series):
+        reference = items["Your Team"].map(as_of)
+    else:
+        reference = pd.Timestamp(as_of)
+    still_open = items["Closed"].isna()
+    # An explicit `as_of` can precede items opened later, which have no age yet
+    items["Open Age Hours"] = ((reference - items["Opened"]) / HOUR).clip(lower=0).where(still_open)
+    return items
+
+
+def lifecycle_percentiles(lifecycle, by=("Your Team",), percentiles=LIFECYCLE_PERCENTILES):
+    """
+    Per-group (e.g. team, or team and author) and per item type counts plus
+    percentiles of open duration, time to first review and still-open age.
+
+    Returns one row per group and Action with columns such as
+    "Open Hours p50" and "First Review Hours p90".
+    """
+    keys = list(by) + ["Action"]
+    grouped = lifecycle.assign(Reviewed=lifecycle["Reviews"] > 0).groupby(keys, observed=True)
+    summary = grouped.agg(
+        Items=("Repo_ID", "size"),
+        Closed=("Closed", "count"),
+        Still_Open=("Open Age Hours", "count"),
+        Reviewed=("Reviewed", "sum"),
+    ).rename(columns={"Still_Open": "Still Open"})
+
+    measures = ["Open Hours", "First Review Hours", "Open Age Hours"]
+    quantiles = grouped[measures].quantile(list(percentiles)).unstack()
+    quantiles.columns = [f"{measure} p{int(round(q * 100))}" for measure, q in quantiles.columns]
+    return summary.join(quantiles)
+
+
+def format_hours(hours):
+    """
+    Short human-readable duration for a number of hours ("45 min", "6.5 h", "3.2 d").
+    """
+    if hours is None or pd.isna(hours):
+        return "N/A"
+    if hours < 1:
+        return f"{hours * 60:.0f} min"
+    if hours < 48:
+        return f"{hours:.1f} h"
+    return f"{hours / 24:.1f} d"
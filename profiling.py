@@ -0,0 +1,227 @@
+import functools
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+# Setting GITDASH_PROFILE=1 turns the dashboard's Performance panel on by default
+PROFILE_ENV_VAR = "GITDASH_PROFILE"
+PROFILE_LOG_ENV_VAR = "GITDASH_PROFILE_LOG"
+DEFAULT_LOG_PATH = os.path.join("logs", "rerun_profile.jsonl")
+
+
+def profiling_enabled_by_env():
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def profile_log_path():
+    return os.environ.get(PROFILE_LOG_ENV_VAR, DEFAULT_LOG_PATH)
+
+
+class RerunProfiler:
+    """
+    Collects timings of named sections, cache hits/misses and rows scanned
+    for one Streamlit rerun.
+
+    Sections nest; a nested section is recorded as "outer / inner". When
+    disabled every method is a cheap no-op so the instrumentation can stay
+    in the dashboard code permanently.
+    """
+
+    def __init__(self, enabled=True, clock=time.perf_counter):
+        self.enabled = enabled
+        self._clock = clock
+        self._stack = []
+        self._misses = set()
+        self.finished = False
+        self.reset("rerun")
+
+    def reset(self, kind):
+        self.kind = kind
+        self.started = self._clock()
+        self.sections = []
+        self.cache = {}
+        self.context = {}
+
+    @contextmanager
+    def section(self, name, rows=None):
+        """
+        Time the enclosed block; `rows` is the number of event rows it scans
+        (or call `scanned` from inside the block once that is known).
+        """
+        if not self.enabled:
+            yield
+            return
+        path = " / ".join([entry["name"] for entry in self._stack[-1:]] + [name])
+        entry = {"name": path, "depth": len(self._stack), "ms": None, "rows": rows}
+        self._stack.append(entry)
+        start = self._clock()
+        try:
+            yield
+        finally:
+            entry["ms"] = (self._clock() - start) * 1000
+            self._stack.pop()
+            self.sections.append(entry)
+
+    def scanned(self, rows):
+        """
+        Add `rows` to the rows scanned by the innermost open section.
+        """
+        if self.enabled and self._stack:
+            entry = self._stack[-1]
+            entry["rows"] = (entry["rows"] or 0) + int(rows)
+
+    def mark_miss(self, name):
+        """
+        Called from inside a cached function body, which only runs on a miss.
+        """
+        self._misses.add(name)
+
+    def cached(self, name, func, *args):
+        """
+        Call a Streamlit-cached function, recording a hit unless its body ran.
+        """
+        if not self.enabled:
+            return func(*args)
+        self._misses.discard(name)
+        with self.section(name):
+            result = func(*args)
+        self.record_cache(name, hit=name not in self._misses)
+        return result
+
+    def record_cache(self, name, hit):
+        if not self.enabled:
+            return
+        counts = self.cache.setdefault(name, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    def total_ms(self):
+        return (self._clock() - self.started) * 1000
+
+    def to_record(self):
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "kind": self.kind,
+            **self.context,
+            "total_ms": self.total_ms(),
+            "sections": self.sections,
+            "cache": self.cache,
+        }
+
+    def finish(self, log_path=None):
+        """
+        Close the rerun and append its record to the JSONL log.
+        """
+        if not self.enabled:
+            return None
+        record = self.to_record()
+        self.finished = True
+        if log_path is not None:
+            append_log(record, log_path)
+        return record
+
+    def fragment(self, name, log_path=None):
+        """
+        Decorator timing a fragment body as section `name`. When the fragment
+        reruns on its own (after the full rerun has finished) the run is
+        logged as a separate "fragment" record.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                standalone = self.finished
+                if standalone:
+                    context = self.context
+                    self.reset("fragment")
+                    self.context = context
+                with self.section(name):
+                    result = func(*args, **kwargs)
+                if standalone:
+                    self.finish(log_path)
+                return result
+            return wrapper
+        return decorator
+
+    def sections_frame(self):
+        return pd.DataFrame(self.sections, columns=["name", "depth", "ms", "rows"])
+
+
+def append_log(record, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # One write per record keeps lines whole when several sessions append
+    with open(path, "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+def read_log(path, limit=None):
+    """
+    Read the JSONL rerun log (only the last `limit` records if given),
+    skipping lines cut short by an interrupted write.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        lines = deque(f, maxlen=limit)
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def latency_summary(records, percentiles=(50, 95)):
+    """
+    Count and p50/p95 (by default) latency in ms of whole reruns, fragment
+    reruns and every named section across `records`.
+    """
+    rows = []
+    for record in records:
+        rows.append((f"[{record.get('kind', 'rerun')} total]", record["total_ms"]))
+        rows.extend((section["name"], section["ms"]) for section in record.get("sections", []))
+    if not rows:
+        return pd.DataFrame(columns=["count"] + [f"p{p}_ms" for p in percentiles])
+
+    timings = pd.DataFrame(rows, columns=["name", "ms"])
+    grouped = timings.groupby("name", sort=False)["ms"]
+    summary = pd.DataFrame({"count": grouped.size()})
+    for p in percentiles:
+        summary[f"p{p}_ms"] = grouped.agg(lambda ms: float(np.percentile(ms, p)))
+    return summary.sort_values(f"p{percentiles[-1]}_ms", ascending=False)
+
+
+def cache_summary(records):
+    """
+    Total hits, misses and hit rate per cache across `records`.
+    """
+    totals = {}
+    for record in records:
+        for name, counts in record.get("cache", {}).items():
+            entry = totals.setdefault(name, {"hits": 0, "misses": 0})
+            entry["hits"] += counts.get("hits", 0)
+            entry["misses"] += counts.get("misses", 0)
+    summary = pd.DataFrame.from_dict(totals, orient="index", columns=["hits", "misses"])
+    lookups = summary["hits"] + summary["misses"]
+    summary["hit_rate"] = (summary["hits"] / lookups.where(lookups > 0)).fillna(0.0)
+    return summary
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else profile_log_path()
+    records = read_log(path)
+    print(f"{len(records)} records in {path}")
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.max_colwidth", 80):
+        print(latency_summary(records).round(1))
+        print()
+        print(cache_summary(records).round(3))
@@ -0,0 +1,323 @@
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from collector import MENTION_PATTERN, MISSING
+from ingest import EVENT_COLUMNS
+
+# The secret the identifiers are hashed with; without it the mapping cannot be
+# linked back to logins or team names by hashing guesses
+KEY_ENV_VAR = "GITDASH_PSEUDONYM_KEY"
+
+# Keyed hash -> code of every team and person coded so far, so later exports
+# reuse the same codes; it holds no raw identifiers but should stay private
+DEFAULT_MAPPING_PATH = os.path.join("data", "pseudonym_map.json")
+
+EVENTS_OUTPUT_NAME = "coded_collated_data.csv"
+SURVEY_OUTPUT_NAME = "coded_survey_anonymous.csv"
+
+CHUNK_ROWS = 100_000
+
+# Columns holding one login or a semicolon-separated list of them
+PERSON_COLUMNS = ["Author", "Assignees", "Closed_by", "Reviewers", "Tagged"]
+
+# Free-text survey columns that would identify the respondent
+IDENTIFYING_SURVEY_COLUMNS = {
+    "name", "full name", "first name", "last name", "email", "email address", "username",
+    "github username", "student id",
+}
+
+TEAM_PREFIX = "t"
+PERSON_PREFIX = "p"
+
+
+def read_key(key_file=None):
+    """
+    The pseudonymization key from `key_file`, or from $GITDASH_PSEUDONYM_KEY.
+    """
+    if key_file:
+        with open(key_file, "rb") as f:
+            key = f.read().strip()
+    else:
+        key = os.environ.get(KEY_ENV_VAR, "").encode()
+    if not key:
+        raise ValueError(f"No pseudonymization key: set ${KEY_ENV_VAR} or pass --key-file")
+    return key
+
+
+def _digest(key, kind, value):
+    return hmac.new(key, f"{kind}:{value}".encode(), hashlib.sha256).hexdigest()
+
+
+def _is_missing(value):
+    return value == "" or value == MISSING
+
+
+def _team_value(semester, year, team, per_term=False):
+    # A team keeps one code across terms (its survey may be filed under
+    # another term than its events) unless names like "Team 3" are reused
+    # every term and per_term scoping is asked for
+    if per_term:
+        return f"{semester.strip()} {year.strip()} {team.strip()}"
+    return team.strip()
+
+
+def _person_value(login):
+    return login.strip().lstrip("@").lower()
+
+
+def _logins(cell):
+    return [login for login in cell.split(";") if login.strip()]
+
+
+class PseudonymMap:
+    """
+    Persisted mapping from keyed hashes of identifiers to stable codes.
+
+    Teams (by name, or by term and name with `per_term`) become t0001,
+    t0002, ... and people p0001, ... in the order they are first seen; codes
+    already in the mapping never change. The file stores a check value of
+    the key and the team scoping, so running with a different key or scoping
+    fails instead of silently coding everyone anew.
+    """
+
+    def __init__(self, key, path=DEFAULT_MAPPING_PATH, per_term=False):
+        self.key = key
+        self.path = path
+        self.per_term = per_term
+        self.key_check = _digest(key, "check", "gitdash")
+        self.codes = {"team": {}, "person": {}}
+        if os.path.exists(path):
+            with open(path) as f:
+                stored = json.load(f)
+            if stored["key_check"] != self.key_check:
+                raise ValueError(f"{path} was built with a different key")
+            if stored.get("per_term", False) != per_term:
+                raise ValueError(f"{path} codes teams {'per term' if stored.get('per_term') else 'by name'}; "
+                                 f"run {'with' if stored.get('per_term') else 'without'} --per-term")
+            self.codes = {"team": stored["teams"], "person": stored["people"]}
+
+    def assign(self, kind, digests):
+        """
+        Give every new digest the next free code; returns how many were new.
+        """
+        codes = self.codes[kind]
+        prefix = TEAM_PREFIX if kind == "team" else PERSON_PREFIX
+        next_number = max((int(code[len(prefix):]) for code in codes.values()), default=0) + 1
+        added = 0
+        for digest in digests:
+            if digest not in codes:
+                codes[digest] = f"{prefix}{next_number:04d}"
+                next_number += 1
+                added += 1
+        return added
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"key_check": self.key_check, "per_term": self.per_term, "teams": self.codes["team"],
+                       "people": self.codes["person"]}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _read_chunks(path, chunk_rows):
+    # Every value stays the exact text of the export, "N/A" and blanks included
+    return pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+
+
+def _chunk_identifiers(key, chunk, per_term=False):
+    """
+    Team and person digests of one chunk, each in first-appearance order.
+    """
+    teams, people = {}, {}
+    if "Your Team" in chunk.columns:
+        keys = chunk[["Semester", "Year", "Your Team"]].drop_duplicates()
+        for semester, year, team in keys.itertuples(index=False):
+            if not _is_missing(team):
+                teams.setdefault(_digest(key, "team", _team_value(semester, year, team, per_term)), None)
+    for column in PERSON_COLUMNS:
+        if column in chunk.columns:
+            for cell in chunk[column].unique():
+                for login in _logins(cell):
+                    if not _is_missing(login.strip()):
+                        people.setdefault(_digest(key, "person", _person_value(login)), None)
+    if "Message" in chunk.columns:
+        for message in chunk["Message"].unique():
+            for login in MENTION_PATTERN.findall(message):
+                people.setdefault(_digest(key, "person", _person_value(login)), None)
+    return teams, people
+
+
+def scan_file(key, path, chunk_rows=CHUNK_ROWS, per_term=False):
+    """
+    Ordered team and person digests of a raw CSV, read chunk by chunk.
+    """
+    teams, people = {}, {}
+    for chunk in _read_chunks(path, chunk_rows):
+        chunk_teams, chunk_people = _chunk_identifiers(key, chunk, per_term)
+        teams.update(chunk_teams)
+        people.update(chunk_people)
+    return list(teams), list(people)
+
+
+def code_chunk(key, codes, chunk, per_term=False):
+    """
+    Replace the team and person identifiers of one chunk with their codes.
+
+    Every value is hashed once per chunk, however often it repeats.
+    """
+    chunk = chunk.copy()
+    if "Your Team" in chunk.columns:
+        keys = chunk[["Semester", "Year", "Your Team"]].drop_duplicates()
+        team_codes = {
+            (semester, year, team): team if _is_missing(team)
+            else codes["team"][_digest(key, "team", _team_value(semester, year, team, per_term))]
+            for semester, year, team in keys.itertuples(index=False)
+        }
+        chunk["Your Team"] = [team_codes[row] for row in
+                              zip(chunk["Semester"], chunk["Year"], chunk["Your Team"])]
+
+    def person(login):
+        return codes["person"][_digest(key, "person", _person_value(login))]
+
+    for column in PERSON_COLUMNS:
+        if column in chunk.columns:
+            cell_codes = {
+                cell: cell if _is_missing(cell.strip())
+                else ";".join(login if _is_missing(login.strip()) else person(login) for login in _logins(cell))
+                for cell in chunk[column].unique()
+            }
+            chunk[column] = chunk[column].map(cell_codes)
+    if "Message" in chunk.columns:
+        messages = chunk["Message"]
+        mentioned = messages.str.contains("@", regex=False)
+        if mentioned.any():
+            chunk.loc[mentioned, "Message"] = messages[mentioned].map(
+                lambda text: MENTION_PATTERN.sub(lambda m: "@" + person(m.group(1)), text)
+            )
+    # Survey exports may carry names or emails next to the answers
+    identifying = [column for column in chunk.columns if column.strip().lower() in IDENTIFYING_SURVEY_COLUMNS]
+    return chunk.drop(columns=identifying)
+
+
+def code_file(key, codes, path, part_path, chunk_rows=CHUNK_ROWS, per_term=False):
+    """
+    Write the coded rows of a raw CSV to `part_path`, without a header.
+
+    Returns (columns, rows).
+    """
+    columns, rows = None, 0
+    with open(part_path, "w", newline="") as f:
+        for chunk in _read_chunks(path, chunk_rows):
+            coded = code_chunk(key, codes, chunk, per_term)
+            columns = list(coded.columns)
+            coded.to_csv(f, header=False, index=False)
+            rows += len(coded)
+    return columns, rows
+
+
+def _check_columns(kind, columns):
+    if kind == "events" and columns != EVENT_COLUMNS:
+        raise ValueError(f"Event export columns differ from the collated data: {columns}")
+
+
+def pseudonymize(event_paths, survey_paths, output_dir="data", mapping_path=DEFAULT_MAPPING_PATH, key=None,
+                 chunk_rows=CHUNK_ROWS, workers=None, per_term=False):
+    """
+    Code raw event and survey exports into coded_collated_data.csv and
+    coded_survey_anonymous.csv in `output_dir`.
+
+    Both passes read every input in chunks of `chunk_rows`, one file per
+    worker process, so memory stays bounded by the chunk size times the
+    workers. The first pass collects the identifiers of every file and
+    extends the persisted mapping in input order, which keeps the codes
+    independent of the number of workers; the second rewrites each file to
+    a part next to the output, and the parts are concatenated in input
+    order. A team gets the same code in the events and the survey whatever
+    term each files it under; `per_term` codes a name anew in every term,
+    in both. Returns a summary dict.
+    """
+    pseudonyms = PseudonymMap(key, mapping_path, per_term)
+    inputs = [("events", path) for path in event_paths] + [("survey", path) for path in survey_paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        scans = [pool.submit(scan_file, key, path, chunk_rows, per_term) for _, path in inputs]
+        new_teams = new_people = 0
+        for future in scans:
+            teams, people = future.result()
+            new_teams += pseudonyms.assign("team", teams)
+            new_people += pseudonyms.assign("person", people)
+        pseudonyms.save()
+
+        os.makedirs(output_dir, exist_ok=True)
+        outputs = {"events": os.path.join(output_dir, EVENTS_OUTPUT_NAME),
+                   "survey": os.path.join(output_dir, SURVEY_OUTPUT_NAME)}
+        parts = [f"{outputs[kind]}.part{i}" for i, (kind, _) in enumerate(inputs)]
+        writes = [pool.submit(code_file, key, pseudonyms.codes, path, part_path, chunk_rows, per_term)
+                  for (_, path), part_path in zip(inputs, parts)]
+        try:
+            results = [future.result() for future in writes]
+            rows = {}
+            for kind, output in outputs.items():
+                pieces = [(part_path, columns) for (k, _), part_path, (columns, _) in zip(inputs, parts, results)
+                          if k == kind]
+                if not pieces:
+                    continue
+                header = pieces[0][1]
+                for _, columns in pieces:
+                    if columns != header:
+                        raise ValueError(f"The {kind} exports have different columns")
+                _check_columns(kind, header)
+                tmp_path = output + ".tmp"
+                with open(tmp_path, "w", newline="") as out:
+                    pd.DataFrame(columns=header).to_csv(out, index=False)
+                    for part_path, _ in pieces:
+                        with open(part_path, newline="") as part:
+                            shutil.copyfileobj(part, out, 1 << 20)
+                os.replace(tmp_path, output)
+                rows[kind] = sum(count for (k, _), (_, count) in zip(inputs, results) if k == kind)
+        finally:
+            for part_path in parts:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+
+    return {"rows": rows, "outputs": {kind: outputs[kind] for kind in rows}, "new_teams": new_teams,
+            "new_people": new_people, "teams": len(pseudonyms.codes["team"]),
+            "people": len(pseudonyms.codes["person"])}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replace team names and logins in raw exports with stable codes")
+    parser.add_argument("--events", nargs="*", default=[], help="raw event CSVs in the collated schema")
+    parser.add_argument("--survey", nargs="*", default=[], help="raw survey CSVs (Semester, Year, Your Team, ...)")
+    parser.add_argument("--output-dir", default="data", help="where the coded CSVs go (default: %(default)s)")
+    parser.add_argument("--mapping", default=DEFAULT_MAPPING_PATH, help="code mapping file (default: %(default)s)")
+    parser.add_argument("--key-file", help=f"file holding the key (default: ${KEY_ENV_VAR})")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--per-term", action="store_true",
+                        help="code team names separately in every Semester and Year (events and survey alike)")
+    args = parser.parse_args()
+    if not args.events and not args.survey:
+        parser.error("nothing to do: pass --events and/or --survey")
+
+    start = time.perf_counter()
+    try:
+        summary = pseudonymize(args.events, args.survey, args.output_dir, args.mapping, read_key(args.key_file),
+                               args.chunk_rows, args.workers, args.per_term)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    for kind, output in summary["outputs"].items():
+        print(f"Wrote {summary['rows'][kind]} {kind} rows to {output}")
+    print(f"{summary['teams']} teams ({summary['new_teams']} new), {summary['people']} people "
+          f"({summary['new_people']} new) in {args.mapping} ({time.perf_counter() - start:.1f}s)")
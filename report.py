@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from html import escape
+
+import pandas as pd
+
+from aggregates import (ACTION_LABELS, build_activity_cube, build_classification_lookup,
+                        member_summary_table, weekly_action_counts)
+from figures import (activity_distribution_figure, activity_heatmap_figure, consistency_figure,
+                     member_comparison_figure, weekly_trends_figure)
+from segments import SEGMENT_DIR, load_incremental
+
+DEFAULT_OUTPUT_DIR = "reports"
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{plotly_script}
+<style>
+    body {{font-family: sans-serif; margin: 2rem;}}
+    .cards {{display: flex; gap: 1rem; margin: 1rem 0;}}
+    .metric-card {{background-color: #f9f9f9; border-radius: 0.5rem; padding: 1rem; box-shadow: 0 0 10px rgba(0,0,0,0.1); text-align: center; flex: 1;}}
+    .metric-value {{font-size: 2rem; font-weight: bold;}}
+    .classification {{border-radius: 0.5rem; padding: 1rem; text-align: center; font-size: 1.3rem; font-weight: bold;}}
+    .classification-High-performing {{background-color: #d1e7dd; color: #0f5132;}}
+    .classification-Balanced {{background-color: #fff3cd; color: #664d03;}}
+    .classification-Struggling {{background-color: #f8d7da; color: #842029;}}
+    table {{border-collapse: collapse;}}
+    td, th {{padding: 0.3rem 0.6rem; border-bottom: 1px solid #ddd; text-align: right;}}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+PLOTLY_JS_CHOICES = ["cdn", "directory"]
+
+
+def plotly_script_tag(plotly_js):
+    """
+    Script tag loading plotly.js from the CDN (matching the installed plotly
+    version) or from plotly.min.js next to the report.
+    """
+    if plotly_js == "directory":
+        return '<script src="plotly.min.js" charset="utf-8"></script>'
+    from plotly.offline import get_plotlyjs_version
+    return f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" charset="utf-8"></script>'
+
+
+def build_team_report(team, team_data, classification, semester, year, formats=("html", "json")):
+    """
+    Compute the metrics and figures of one team's dashboard without Streamlit.
+
+    Returns a JSON-serializable metrics dict and a {name: figure} dict; the
+    figures are only built when "html" is among `formats`.
+    """
+    cube = build_activity_cube(team_data)
+    totals = cube.action_totals(team)
+    member_summary = member_summary_table(cube, team).sort_values("Total Actions", ascending=False)
+    member_week = cube.member_week_totals(team)
+    member_week = member_week.loc[:, member_week.sum(axis=0) > 0]
+
+    weekly = cube.team_counts(team)[:, :len(cube.weeks)].sum(axis=0)
+    weekly_counts = {
+        str(week): {action: int(count) for action, count in zip(cube.actions, weekly[w])}
+        for w, week in enumerate(cube.weeks) if weekly[w].sum() > 0
+    }
+
+    timestamps = pd.to_datetime(team_data["Timestamp"], errors="coerce")
+    metrics = {
+        "team": team,
+        "semester": None if pd.isna(semester) else str(semester),
+        "year": None if pd.isna(year) else int(year),
+        "classification": classification,
+        "events": int(len(team_data)),
+        "first_event": None if timestamps.isna().all() else timestamps.min().isoformat(),
+        "last_event": None if timestamps.isna().all() else timestamps.max().isoformat(),
+        "totals": {action: int(count) for action, count in totals.items()},
+        "weekly_counts": weekly_counts,
+        "members": json.loads(member_summary.to_json(orient="records")),
+    }
+
+    figures = {}
+    if "html" not in formats:
+        return metrics, figures
+    weekly_activity = weekly_action_counts(team_data)
+    if not weekly_activity.empty:
+        figures["weekly_trends"] = weekly_trends_figure(weekly_activity)
+    if not member_week.empty:
+        figures["activity_heatmap"] = activity_heatmap_figure(member_week)
+        action_counts = team_data["Action"].value_counts()
+        figures["activity_distribution"] = activity_distribution_figure(action_counts[action_counts > 0])
+    if not member_summary.empty:
+        figures["member_comparison"] = member_comparison_figure(member_summary.drop(columns="Consistency %"))
+        figures["consistency"] = consistency_figure(
+            member_summary.sort_values("Consistency %", ascending=False)
+        )
+    return metrics, figures
+
+
+def render_team_html(metrics, figures, plotly_js="cdn"):
+    """
+    Render a team report as a standalone HTML page.
+    """
+    team = escape(metrics["team"])
+    classification = metrics["classification"]
+    cards = "".join(
+        f'<div class="metric-card"><div class="metric-value">{metrics["totals"].get(action, 0)}</div>'
+        f'<div>{escape(label)}</div></div>'
+        for action, label in ACTION_LABELS.items()
+    )
+    members = pd.DataFrame(metrics["members"])
+    parts = [
+        "<h1>Team Contribution Report</h1>",
+        f"<h2>Team {team} &mdash; {escape(str(metrics['semester']))} {escape(str(metrics['year']))}</h2>",
+    ]
+    if classification != "Unknown":
+        parts.append(f'<div class="classification classification-{escape(classification)}">'
+                     f'Classification: {escape(classification)}</div>')
+    parts.append(f'<div class="cards">{cards}</div>')
+    for fig in figures.values():
+        parts.append(fig.to_html(full_html=False, include_plotlyjs=False))
+    if not members.empty:
+        parts.append("<h3>Member Comparison</h3>")
+        parts.append(members.to_html(index=False, border=0))
+    return PAGE_TEMPLATE.format(
+        title=f"Team {team} Report",
+        plotly_script=plotly_script_tag(plotly_js),
+        body="\n".join(parts),
+    )
+
+
+def render_team(team, team_data, classification, semester, year, output_dir, formats, plotly_js):
+    """
+    Worker entry point: build and write one team's report files.
+    """
+    start = time.perf_counter()
+    metrics, figures = build_team_report(team, team_data, classification, semester, year, formats)
+    paths = []
+    if "json" in formats:
+        path = os.path.join(output_dir, f"{team}.json")
+        with open(path, "w") as f:
+            json.dump(metrics, f, indent=2)
+        paths.append(path)
+    if "html" in formats:
+        path = os.path.join(output_dir, f"{team}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render_team_html(metrics, figures, plotly_js))
+        paths.append(path)
+    return team, metrics, paths, time.perf_counter() - start
+
+
+def select_teams(partition, teams=None, since=None):
+    """
+    Yield (team, team_data) for the requested teams, keeping only events on
+    or after `since` and skipping teams left without events.
+    """
+    wanted = partition.teams if not teams else [t for t in partition.teams if t in set(teams)]
+    for team in wanted:
+        team_data = partition.team_rows(team)
+        if since is not None:
+            team_data = team_data[pd.to_datetime(team_data["Timestamp"], errors="coerce") >= since]
+        if not team_data.empty:
+            yield team, team_data
+
+
+def write_index(output_dir, results):
+    """
+    Write summary.json and an index.html linking every team report.
+    """
+    summary = [
+        {
+            "team": metrics["team"],
+            "semester": metrics["semester"],
+            "year": metrics["year"],
+            "classification": metrics["classification"],
+            "events": metrics["events"],
+            **{ACTION_LABELS.get(a, a): n for a, n in metrics["totals"].items()},
+        }
+        for metrics in sorted(results, key=lambda m: m["team"])
+    ]
+    with open(os.path.join(output_dir, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    table = pd.DataFrame(summary)
+    if not table.empty:
+        table["team"] = table["team"].map(lambda t: f'<a href="{escape(t)}.html">{escape(t)}</a>')
+    body = "<h1>Team Contribution Reports</h1>\n" + table.to_html(index=False, border=0, escape=False)
+    with open(os.path.join(output_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(PAGE_TEMPLATE.format(title="Team Contribution Reports", plotly_script="", body=body))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate static per-team dashboard reports.")
+    parser.add_argument("--teams", nargs="+", help="only report these teams (default: all)")
+    parser.add_argument("--since", type=pd.Timestamp, help="only include events on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="output directory (default: %(default)s)")
+    parser.add_argument("--format", dest="formats", nargs="+", choices=["html", "json"], default=["html", "json"],
+                        help="report formats to write (default: html json)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--plotly-js", choices=PLOTLY_JS_CHOICES, default="cdn",
+                        help="load plotly.js from the CDN or from a copy written to the output directory")
+    parser.add_argument("--repo-data", default="data/coded_collated_data.csv")
+    parser.add_argument("--survey-data", default="data/coded_survey_anonymous.csv")
+    parser.add_argument("--classifications", default="team_classifications.csv")
+    parser.add_argument("--segments", default=SEGMENT_DIR, help="segment log appended to the events "
+                                                                "(default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    # The collated events plus any segments appended since, as the dashboard sees them
+    event_log, _, classification_data = load_incremental(
+        args.repo_data, args.survey_data, args.classifications, args.segments
+    )
+    partition, data_version = event_log.snapshot.partition, event_log.snapshot.data_version
+    classifications = build_classification_lookup(classification_data)
+    unknown = sorted(set(args.teams or []) - set(partition.teams))
+    if unknown:
+        print(f"Unknown teams: {', '.join(unknown)}", file=sys.stderr)
+        return 1
+    jobs = list(select_teams(partition, args.teams, args.since))
+    if not jobs:
+        print("No teams matched the given filters.")
+        return 1
+
+    os.makedirs(args.output, exist_ok=True)
+    if "html" in args.formats and args.plotly_js == "directory":
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(args.output, "plotly.min.js"), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    print(f"Rendering {len(jobs)} teams with {args.workers} workers (data version {data_version})")
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(
+                render_team, team, team_data, classifications.get(team, "Unknown"),
+                *partition.team_term(team), args.output, args.formats, args.plotly_js
+            )
+            for team, team_data in jobs
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            team, metrics, paths, elapsed = future.result()
+            results.append(metrics)
+            print(f"[{done}/{len(jobs)}] {team}: {metrics['events']} events in {elapsed:.2f}s")
+
+    write_index(args.output, results)
+    print(f"Wrote {len(results)} team reports to {args.output}/ in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
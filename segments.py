@@ -0,0 +1,306 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from aggregates import TeamPartition, build_activity_cube, concat_events
+from ingest import (CACHE_DIR, compose_data_version, file_fingerprint, load_cached_table, read_classification_csv,
+                    read_event_csv, read_survey_csv)
+
+# New weeks of GitHub activity are appended here instead of regenerating the
+# collated CSV; each batch becomes one typed Parquet segment
+SEGMENT_DIR = os.path.join("data", "segments")
+MANIFEST_NAME = "manifest.json"
+
+
+class SegmentLog:
+    """
+    Append-only log of event batches that extend the collated CSV.
+
+    Every batch is written once as a Parquet segment and recorded in a
+    manifest with its row count, teams, weeks and content hash. The manifest
+    also records the hash of the collated CSV the segments extend, so a log
+    left over from an older base is ignored rather than counted twice.
+    """
+
+    def __init__(self, path=SEGMENT_DIR):
+        self.path = path
+        self.manifest_path = os.path.join(path, MANIFEST_NAME)
+
+    def manifest_mtime(self):
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"base_sha256": None, "segments": []}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def segments(self, base_sha256):
+        """
+        Manifest entries of the segments that extend the base with this hash.
+        """
+        manifest = self.read_manifest()
+        if manifest.get("base_sha256") != base_sha256:
+            return []
+        return manifest["segments"]
+
+    def append(self, events, base_sha256, columns=None, source_sha256=None):
+        """
+        Write a typed event batch as a new segment and return its manifest entry.
+
+        `columns` are the base table's columns; a batch with a different
+        schema is rejected. `source_sha256` identifies the file the batch came
+        from so the same pull is not appended twice.
+        """
+        manifest = self.read_manifest()
+        if manifest["segments"] and manifest.get("base_sha256") != base_sha256:
+            raise ValueError(f"{self.path} extends a different collated CSV; run `python segments.py reset` "
+                             "after regenerating the CSV")
+        if columns is not None:
+            missing = [column for column in columns if column not in events.columns]
+            extra = [column for column in events.columns if column not in columns]
+            if missing or extra:
+                raise ValueError(f"Batch schema differs from the collated data (missing {missing}, extra {extra})")
+            events = events[list(columns)]
+        if source_sha256 is not None and any(s.get("source_sha256") == source_sha256
+                                             for s in manifest["segments"]):
+            raise ValueError("This batch has already been appended")
+
+        segment_id = max((s["id"] for s in manifest["segments"]), default=0) + 1
+        file_name = f"segment-{segment_id:06d}.parquet"
+        path = os.path.join(self.path, file_name)
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = path + ".tmp"
+        events.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        weeks = pd.to_numeric(events["week"], errors="coerce").dropna().astype(int)
+        entry = {
+            "id": segment_id,
+            "file": file_name,
+            "rows": len(events),
+            "sha256": file_fingerprint(path)["sha256"],
+            "source_sha256": source_sha256,
+            "teams": sorted(str(team) for team in events["Your Team"].dropna().unique()),
+            "weeks": sorted(int(week) for week in weeks.unique()),
+            "appended_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        # The manifest is replaced last, so readers never see a half-written segment
+        self._write_manifest({"base_sha256": base_sha256, "segments": manifest["segments"] + [entry]})
+        return entry
+
+    def read(self, entries):
+        """
+        Read the given segments as one typed event table.
+        """
+        frames = [pd.read_parquet(os.path.join(self.path, entry["file"])) for entry in entries]
+        return concat_events(frames)
+
+    def reset(self):
+        """
+        Delete every segment, e.g. once a regenerated collated CSV includes them.
+        """
+        manifest = self.read_manifest()
+        for entry in manifest["segments"]:
+            try:
+                os.remove(os.path.join(self.path, entry["file"]))
+            except OSError:
+                pass
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        return len(manifest["segments"])
+
+
+class EventSnapshot:
+    """
+    One consistent version of the event data: the base table plus the
+    segments applied so far, with the activity cube and team partition.
+
+    `team_versions` maps each team touched by a segment to the data version
+    it last changed in; other teams still match `base_version`, so anything
+    computed for one team can be keyed on `team_version(team)` and survive
+    appends that do not touch it.
+    """
+
+    def __init__(self, data_version, base_version, frames, cube, partition, segments, team_versions,
+                 affected_teams=(), previous_tables=None):
+        self.data_version = data_version
+        self.base_version = base_version
+        self.frames = frames
+        self.cube = cube
+        self.partition = partition
+        self.segments = segments
+        self.team_versions = team_versions
+        self.affected_teams = list(affected_teams)
+        self._previous_tables = previous_tables or {}
+        self._tables = {}
+        self._events = None
+        self._lock = threading.Lock()
+
+    def team_version(self, team):
+        return self.team_versions.get(team, self.base_version)
+
+    def events(self):
+        """
+        The full event table, assembled on first use.
+        """
+        with self._lock:
+            if self._events is None:
+                self._events = self.frames[0] if len(self.frames) == 1 else concat_events(self.frames)
+            return self._events
+
+    def team_table(self, name, build):
+        """
+        A table of per-team rows ("Your Team" column) built by `build(events)`.
+
+        When the previous snapshot had built it, only the teams the new
+        segments touched are rebuilt from their partition rows.
+        """
+        with self._lock:
+            if name in self._tables:
+                return self._tables[name]
+            previous = self._previous_tables.get(name)
+        if previous is None:
+            table = build(self.events())
+        elif not self.affected_teams:
+            table = previous
+        else:
+            rows = self.partition.teams_rows(self.affected_teams)
+            kept = previous[~previous["Your Team"].astype(str).isin(self.affected_teams)]
+            table = pd.concat([kept, build(rows)], ignore_index=True)
+        with self._lock:
+            self._tables[name] = table
+        return table
+
+
+class IncrementalEvents:
+    """
+    The collated events plus the segment log, kept current by `refresh()`.
+
+    A refresh reads only the segments appended since the previous one and
+    folds them into the cube and partition (ActivityCube.with_events,
+    TeamPartition.with_events), so a mid-semester refresh counts only the
+    new events rather than the whole history. Each refresh publishes a new
+    EventSnapshot and never modifies an older one (the cube is counted into
+    a copy), so sessions still holding the previous snapshot keep a
+    consistent event table, partition and cube.
+    """
+
+    def __init__(self, base_data, base_sha256, base_version, log=None):
+        self.base_data = base_data
+        self.base_sha256 = base_sha256
+        self.base_version = base_version
+        self.log = log or SegmentLog()
+        self._lock = threading.Lock()
+        self._manifest_mtime = None
+        self.snapshot = EventSnapshot(base_version, base_version, [base_data], build_activity_cube(base_data),
+                                      TeamPartition(base_data), [], {})
+        self.refresh()
+
+    def refresh(self):
+        """
+        Apply any newly appended segments and return the current snapshot.
+
+        With nothing new this is a single stat of the manifest.
+        """
+        mtime = self.log.manifest_mtime()
+        if mtime == self._manifest_mtime:
+            return self.snapshot
+        with self._lock:
+            mtime = self.log.manifest_mtime()
+            if mtime == self._manifest_mtime:
+                return self.snapshot
+            entries = self.log.segments(self.base_sha256)
+            snapshot = self.snapshot
+            applied = [entry["sha256"] for entry in snapshot.segments]
+            if applied != [entry["sha256"] for entry in entries[:len(applied)]]:
+                # The log was reset or rewritten: start again from the base
+                snapshot = EventSnapshot(self.base_version, self.base_version, [self.base_data],
+                                         build_activity_cube(self.base_data), TeamPartition(self.base_data), [], {})
+            pending = entries[len(snapshot.segments):]
+            if pending:
+                snapshot = self._apply(snapshot, pending)
+            self.snapshot = snapshot
+            self._manifest_mtime = mtime
+            return snapshot
+
+    def _apply(self, snapshot, entries):
+        new_events = self.log.read(entries)
+        segments = snapshot.segments + entries
+        data_version = compose_data_version(self.base_version, *[entry["sha256"] for entry in segments])
+        affected = sorted({team for entry in entries for team in entry["teams"]})
+        team_versions = dict(snapshot.team_versions)
+        team_versions.update({team: data_version for team in affected})
+        with snapshot._lock:
+            previous_tables = dict(snapshot._tables)
+        return EventSnapshot(data_version, self.base_version, snapshot.frames + [new_events],
+                             snapshot.cube.with_events(new_events), snapshot.partition.with_events(new_events),
+                             segments, team_versions, affected, previous_tables)
+
+
+def load_incremental(repo_path="data/coded_collated_data.csv",
+                     survey_path="data/coded_survey_anonymous.csv",
+                     classification_path="team_classifications.csv",
+                     segment_dir=SEGMENT_DIR,
+                     cache_dir=CACHE_DIR):
+    """
+    Load the inputs like ingest.load_all, with the events wrapped in an
+    IncrementalEvents over the segment log.
+
+    Returns (events, survey_data, classification_data); the data version is
+    the snapshot's, since it moves with every applied segment.
+    """
+    repo_data, repo_hash = load_cached_table(repo_path, read_event_csv, cache_dir)
+    survey_data, survey_hash = load_cached_table(survey_path, read_survey_csv, cache_dir)
+    classification_data, classification_hash = load_cached_table(
+        classification_path, read_classification_csv, cache_dir
+    )
+    base_version = compose_data_version(repo_hash, survey_hash, classification_hash)
+    events = IncrementalEvents(repo_data, repo_hash, base_version, SegmentLog(segment_dir))
+    return events, survey_data, classification_data
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Append new event batches to the segment log")
+    parser.add_argument("command", choices=["append", "status", "reset"])
+    parser.add_argument("batches", nargs="*", help="Event CSVs with the collated data's columns (append)")
+    parser.add_argument("--repo-data", default="data/coded_collated_data.csv")
+    parser.add_argument("--segments", default=SEGMENT_DIR)
+    args = parser.parse_args()
+
+    log = SegmentLog(args.segments)
+    if args.command == "reset":
+        print(f"Removed {log.reset()} segments from {args.segments}")
+    else:
+        repo_data, repo_hash = load_cached_table(args.repo_data, read_event_csv)
+        if args.command == "append":
+            for batch_path in args.batches:
+                start = time.perf_counter()
+                try:
+                    entry = log.append(read_event_csv(batch_path), repo_hash, columns=repo_data.columns,
+                                       source_sha256=file_fingerprint(batch_path)["sha256"])
+                except ValueError as e:
+                    parser.error(f"{batch_path}: {e}")
+                print(f"Appended {batch_path} as segment {entry['id']}: {entry['rows']} events, "
+                      f"{len(entry['teams'])} teams, weeks {entry['weeks']} "
+                      f"({time.perf_counter() - start:.3f}s)")
+        manifest = log.read_manifest()
+        if manifest["segments"] and manifest.get("base_sha256") != repo_hash:
+            print(f"{args.segments} extends a different collated CSV and is ignored")
+        else:
+            rows = sum(entry["rows"] for entry in manifest["segments"])
+            print(f"{len(repo_data)} base events + {rows} events in {len(manifest['segments'])} segments")
@@ -0,0 +1,324 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from embedding_store import EmbeddingStore
+from ingest import CACHE_DIR, load_all
+
+# Small CPU-friendly model; embeddings are normalized so inner product = cosine
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+SEARCH_INDEX_DIR = os.path.join(CACHE_DIR, "message_search")
+EMBED_BATCH_SIZE = 256
+
+# Event columns carried into search results
+RESULT_COLUMNS = ["Your Team", "week", "Action", "Author", "Timestamp", "Repo_ID", "Message"]
+
+# Event columns search_keys reads
+SEARCH_EVENT_COLUMNS = ["Your Team", "week", "Action", "Timestamp", "Message"]
+
+# Filtered searches over at most this many messages skip FAISS and score the
+# subset directly, which beats an ID selector over a mostly-excluded index
+SUBSET_SEARCH_LIMIT = 50_000
+
+# Rows converted from float16 at a time when filling the index or scanning
+SCORE_CHUNK_ROWS = 65_536
+
+# FAISS copy of the store's vectors, written next to them and memory-mapped by readers
+FAISS_INDEX_NAME = "vectors.faiss"
+
+
+def message_keys(messages):
+    """
+    Stable 64-bit hash of each message text: the same text gets the same key
+    in every run, so stored embeddings can be matched to new events.
+    """
+    return pd.util.hash_pandas_object(pd.Series(messages, dtype=object).fillna(""), index=False).to_numpy()
+
+
+def load_encoder(model_name=DEFAULT_MODEL_NAME, device="cpu"):
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name, device=device)
+
+
+def embed_texts(encoder, texts, batch_size=EMBED_BATCH_SIZE):
+    vectors = encoder.encode(list(texts), batch_size=batch_size, normalize_embeddings=True,
+                             convert_to_numpy=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def update_embeddings(messages, encoder, model_name=DEFAULT_MODEL_NAME, index_dir=SEARCH_INDEX_DIR,
+                      batch_size=EMBED_BATCH_SIZE, progress=None):
+    """
+    Embed every distinct message not yet in the store and append it.
+
+    Messages are keyed by hash, so re-running after new events arrive only
+    embeds the new texts. Each chunk is committed as soon as it is embedded,
+    so an interrupted run resumes where it stopped. A store built with a
+    different model is rebuilt. Returns the number of messages embedded.
+    """
+    store = EmbeddingStore.open(index_dir)
+    if store is not None and store.model != model_name:
+        store = None
+
+    texts = pd.Series(messages, dtype=object).dropna().astype(str)
+    texts = texts[texts.str.strip() != ""]
+    text_keys, first = np.unique(message_keys(texts), return_index=True)
+    new = np.ones(len(text_keys), dtype=bool) if store is None else store.rows_for(text_keys) < 0
+    new_keys = text_keys[new]
+    new_texts = texts.iloc[first[new]].tolist()
+
+    chunk_size = batch_size * 16
+    for start in range(0, len(new_texts), chunk_size):
+        vectors = embed_texts(encoder, new_texts[start:start + chunk_size], batch_size)
+        if store is None:
+            store = EmbeddingStore.create(index_dir, vectors.shape[1], model_name)
+        store.append(new_keys[start:start + chunk_size], vectors)
+        if progress is not None:
+            progress(min(start + chunk_size, len(new_texts)), len(new_texts))
+    if new_texts:
+        # Write the FAISS index here rather than in the first dashboard process
+        open_faiss_index(store)
+    return len(new_texts)
+
+
+def write_faiss_index(store):
+    """
+    Write the store's vectors as a float16 inner-product FAISS index in the
+    store directory, replacing any older one.
+    """
+    import faiss
+    index = faiss.IndexScalarQuantizer(store.dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT)
+    vectors = store.vectors()
+    for start in range(0, len(vectors), SCORE_CHUNK_ROWS):
+        index.add(np.asarray(vectors[start:start + SCORE_CHUNK_ROWS], dtype=np.float32))
+    path = os.path.join(store.path, FAISS_INDEX_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    faiss.write_index(index, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def open_faiss_index(store):
+    """
+    The store's FAISS index, memory-mapped read-only so that every process
+    shares one copy of its codes through the OS page cache. The index is
+    written first if it is missing or older than the store's last commit.
+
+    Returns None without faiss (or with one too old to map flat indexes), or
+    if the index cannot be written; search then scans the store directly.
+    """
+    try:
+        import faiss
+    except ImportError:
+        return None
+    mmap_flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+    if mmap_flag is None:
+        return None
+    path = os.path.join(store.path, FAISS_INDEX_NAME)
+    try:
+        index = None
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(os.path.join(store.path, "meta.json")):
+            index = faiss.read_index(path, mmap_flag)
+        if index is None or index.ntotal != len(store):
+            index = faiss.read_index(write_faiss_index(store), mmap_flag)
+    except (OSError, RuntimeError) as e:
+        print(f"Could not open FAISS index {path}: {e}")
+        return None
+    return index
+
+
+def search_keys(events):
+    """
+    The compact per-event rows a MessageSearch holds, for the events that
+    carry a message: the id the full row is fetched back by (event_id if
+    `events` has one, else the row position), the message key, and the
+    filter and tie-break columns.
+    """
+    has_message = events["Message"].notna().to_numpy()
+    ids = events["event_id"].to_numpy() if "event_id" in events.columns else np.arange(len(events))
+    events = events[has_message]
+    return pd.DataFrame({
+        "event_id": ids[has_message],
+        "message_key": message_keys(events["Message"]),
+        "Your Team": events["Your Team"].to_numpy(),
+        "Action": events["Action"].to_numpy(),
+        "week": pd.to_numeric(events["week"], errors="coerce").to_numpy(dtype=float),
+        # NaT becomes the smallest int64, so undated events sort last
+        "Timestamp": np.asarray(events["Timestamp"], dtype="datetime64[ns]").view(np.int64),
+    })
+
+
+class MessageSearch:
+    """
+    Nearest-neighbour search over event messages with team/week/action filters.
+
+    Each distinct message is embedded once in an EmbeddingStore; a FAISS
+    float16 inner-product index memory-mapped from disk (or a chunked NumPy
+    scan of the memory-mapped store without faiss) ranks messages, which
+    are then expanded back to the events that carry them. Only the
+    search_keys of the events are held; `fetch(ids)` returns the
+    RESULT_COLUMNS rows of the top hits.
+    """
+
+    def __init__(self, keys, store, fetch):
+        rows = store.rows_for(keys["message_key"].to_numpy())
+        found = rows >= 0
+
+        self.unindexed = int((~found).sum())
+        keys = keys[found]
+        self._fetch = fetch
+        self._rows = rows[found]
+        self._ids = keys["event_id"].to_numpy()
+        self._teams = keys["Your Team"].astype("category")
+        self._actions = keys["Action"].astype("category")
+        self._weeks = keys["week"].to_numpy(dtype=float)
+        self._stamps = keys["Timestamp"].to_numpy(dtype=np.int64)
+        self.vectors = store.vectors()
+        self._index = open_faiss_index(store)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _event_mask(self, teams=None, weeks=None, actions=None):
+        mask = np.ones(len(self._ids), dtype=bool)
+        # Filters compare integer category codes rather than strings
+        for column, values in ((self._teams, teams), (self._actions, actions)):
+            if values:
+                wanted = column.cat.categories.get_indexer(list(values))
+                mask &= np.isin(column.cat.codes.to_numpy(), wanted[wanted >= 0])
+        if weeks:
+            mask &= np.isin(self._weeks, [float(w) for w in weeks])
+        return mask
+
+    def _top_messages(self, query_vector, k, allowed=None):
+        """
+        Rows and scores of the best `k` messages, optionally only among the
+        messages flagged in the boolean array `allowed`.
+        """
+        if allowed is not None and allowed.sum() <= SUBSET_SEARCH_LIMIT:
+            candidates = np.flatnonzero(allowed)
+            scores = self.vectors[candidates].astype(np.float32) @ query_vector
+            top = np.argsort(-scores) if len(scores) <= k else np.argpartition(-scores, k)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")][:k]
+            return candidates[top], scores[top]
+        if self._index is None:
+            scores = np.concatenate([
+                np.asarray(self.vectors[start:start + SCORE_CHUNK_ROWS], dtype=np.float32) @ query_vector
+                for start in range(0, len(self.vectors), SCORE_CHUNK_ROWS)
+            ])
+            if allowed is not None:
+                scores = np.where(allowed, scores, -np.inf)
+            top = np.argpartition(-scores, k)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            top = top[np.isfinite(scores[top])]
+            return top, scores[top]
+
+        # Broad filters: over-fetch from the full index and drop excluded rows,
+        # falling back to an ID selector if too few survive
+        fetch = len(self.vectors) if allowed is None else min(len(self.vectors), k * 8)
+        scores, rows = self._index.search(query_vector[None, :], min(k, fetch) if allowed is None else fetch)
+        scores, rows = scores[0], rows[0]
+        keep = rows >= 0
+        if allowed is not None:
+            keep &= allowed[np.maximum(rows, 0)]
+        if allowed is None or keep.sum() >= k:
+            return rows[keep][:k], scores[keep][:k]
+        import faiss
+        selector = faiss.IDSelectorBatch(np.flatnonzero(allowed).astype(np.int64))
+        scores, rows = self._index.search(query_vector[None, :], k, params=faiss.SearchParameters(sel=selector))
+        keep = rows[0] >= 0
+        return rows[0][keep], scores[0][keep]
+
+    def search(self, query_vector, k=20, teams=None, weeks=None, actions=None):
+        """
+        Return up to `k` events whose messages are closest to `query_vector`,
+        best first, restricted to the given teams, weeks and actions.
+        """
+        query_vector = np.asarray(query_vector, dtype=np.float32).ravel()
+        mask = self._event_mask(teams, weeks, actions)
+        hits, hit_scores = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if len(self.vectors) and mask.any():
+            allowed = None
+            if not mask.all():
+                allowed = np.zeros(len(self.vectors), dtype=bool)
+                allowed[self._rows[mask]] = True
+            rows, scores = self._top_messages(query_vector, k, allowed)
+            score_by_row = np.full(len(self.vectors), np.nan, dtype=np.float32)
+            score_by_row[rows] = scores
+            hits = np.flatnonzero(mask & ~np.isnan(score_by_row[self._rows]))
+            hit_scores = score_by_row[self._rows[hits]]
+
+        # Best score first, newest first among events sharing a message, then
+        # event order; only the k displayed rows are fetched
+        top = np.lexsort((-hits, self._stamps[hits], hit_scores))[::-1][:k]
+        results = self._fetch(self._ids[hits[top]])
+        results.insert(0, "Score", hit_scores[top])
+        return results[["Score"] + RESULT_COLUMNS]
+
+
+def load_message_search(repo_data, index_dir=SEARCH_INDEX_DIR, fetch=None):
+    """
+    Build a MessageSearch over the embedding store, or return None (and the
+    store metadata) if no messages have been embedded yet.
+
+    `repo_data` is the event table, whose result rows are then taken by
+    position, or with `fetch` (ids -> RESULT_COLUMNS rows) the search_keys
+    of events kept elsewhere, such as the SQL event store.
+    """
+    store = EmbeddingStore.open(index_dir)
+    if store is None or len(store) == 0:
+        return None, None if store is None else store.meta
+    if fetch is None:
+        keys = search_keys(repo_data)
+
+        def fetch(ids):
+            return repo_data.iloc[ids][RESULT_COLUMNS].reset_index(drop=True)
+    else:
+        keys = repo_data
+    return MessageSearch(keys, store, fetch), store.meta
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the message embedding index and search it.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="sentence-transformers model (default: %(default)s)")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE)
+    parser.add_argument("--index-dir", default=SEARCH_INDEX_DIR)
+    parser.add_argument("--query", help="search the index for this text after updating it")
+    parser.add_argument("--teams", nargs="+", help="only return events of these teams")
+    parser.add_argument("--weeks", nargs="+", type=int, help="only return events of these weeks")
+    parser.add_argument("--actions", nargs="+", help="only return these actions (e.g. pull_request issue)")
+    parser.add_argument("-k", type=int, default=20, help="number of results (default: %(default)s)")
+    parser.add_argument("--repo-data", default="data/coded_collated_data.csv")
+    parser.add_argument("--survey-data", default="data/coded_survey_anonymous.csv")
+    parser.add_argument("--classifications", default="team_classifications.csv")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    repo_data, _, _, _ = load_all(args.repo_data, args.survey_data, args.classifications)
+
+    encoder = load_encoder(args.model)
+    start = time.perf_counter()
+    added = update_embeddings(
+        repo_data["Message"], encoder, args.model, args.index_dir, args.batch_size,
+        progress=lambda done, total: print(f"Embedded {done}/{total} new messages", file=sys.stderr),
+    )
+    print(f"Added {added} message embeddings in {time.perf_counter() - start:.1f}s ({args.index_dir})")
+
+    if args.query:
+        search, _ = load_message_search(repo_data, args.index_dir)
+        start = time.perf_counter()
+        results = search.search(embed_texts(encoder, [args.query])[0], args.k, args.teams, args.weeks, args.actions)
+        print(f"{len(results)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+        with pd.option_context("display.width", 200, "display.max_colwidth", 80):
+            print(results.to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
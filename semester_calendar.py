@@ -0,0 +1,269 @@
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import pandas as pd
+
+# One row per term: Semester, Year, Start and End (first and last day, ISO
+# dates), optional Breaks ("2024-03-11/2024-03-15", several separated by
+# ";"), optional Finals (one such range) and optional Timezone (IANA name of
+# the campus the dates are local to; UTC when empty)
+DEFAULT_CALENDAR_PATH = os.path.join("data", "semester_calendar.csv")
+
+# Where an event falls relative to its term's calendar
+IN_TERM = "term"
+BREAK = "break"
+FINALS = "finals"
+BEFORE_TERM = "before_term"
+AFTER_TERM = "after_term"
+NO_CALENDAR = "no_calendar"
+NO_TIMESTAMP = "no_timestamp"
+STATUSES = [IN_TERM, FINALS, BREAK, BEFORE_TERM, AFTER_TERM, NO_CALENDAR, NO_TIMESTAMP]
+_STATUS_CODE = {status: code for code, status in enumerate(STATUSES)}
+
+
+def _date_range(value):
+    start, _, end = value.strip().partition("/")
+    start = date.fromisoformat(start.strip())
+    return start, date.fromisoformat(end.strip()) if end.strip() else start
+
+
+def _day_ns(day):
+    return pd.Timestamp(day).value
+
+
+class SemesterCalendar:
+    """
+    The teaching calendar of one term and the week number of every moment in it.
+
+    Weeks are 7-day steps from `start`, counted in local days of the term's
+    `timezone` (UTC by default). Timestamps stay UTC, like the collated
+    Timestamp column, and are only converted to place them. Break days get
+    no week number, and a week without a teaching weekday (e.g. a
+    Monday-Friday break and its weekend) is not counted, so teaching resumes
+    with the next number. Finals (which may run longer than seven days) form
+    one week after the last teaching week. Events before `start` or after
+    `end` get no week number either.
+
+    The calendar is compiled into sorted boundaries with the week number and
+    status of each interval between them, so assigning weeks is one
+    searchsorted over the boundaries.
+    """
+
+    def __init__(self, semester, year, start, end, breaks=(), finals=None, timezone=None):
+        self.semester = semester
+        self.year = int(year)
+        self.start = start
+        self.end = end
+        self.breaks = sorted(breaks)
+        self.finals = finals
+        self.timezone = timezone or "UTC"
+        if end < start:
+            raise ValueError(f"{semester} {year}: term ends before it starts")
+        try:
+            ZoneInfo(self.timezone)
+        except (ValueError, ZoneInfoNotFoundError):
+            raise ValueError(f"{semester} {year}: unknown timezone {self.timezone!r}") from None
+        for first, last in self.breaks + ([finals] if finals else []):
+            if last < first or first < start or last > end:
+                raise ValueError(f"{semester} {year}: {first}/{last} is not a range inside the term")
+        self.boundaries, self.weeks, self.statuses = self._compile()
+
+    def _day_kind(self, day):
+        if self.finals and self.finals[0] <= day <= self.finals[1]:
+            return FINALS
+        if any(first <= day <= last for first, last in self.breaks):
+            return BREAK
+        return IN_TERM
+
+    def _compile(self):
+        # A term has at most a few hundred days, so it is compiled day by day
+        # and then collapsed into intervals
+        days = [self.start + timedelta(days=i) for i in range((self.end - self.start).days + 1)]
+        kinds = [self._day_kind(day) for day in days]
+        teaching_weeks = sorted({i // 7 for i, (day, kind) in enumerate(zip(days, kinds))
+                                 if kind == IN_TERM and day.weekday() < 5})
+        week_number = {week: n + 1 for n, week in enumerate(teaching_weeks)}
+        finals_week = len(teaching_weeks) + 1
+
+        labels = []
+        for i, kind in enumerate(kinds):
+            if kind == IN_TERM and i // 7 in week_number:
+                labels.append((week_number[i // 7], IN_TERM))
+            elif kind == FINALS:
+                labels.append((finals_week, FINALS))
+            else:
+                labels.append((0, BREAK))
+
+        # Boundary k starts interval k; the first and last intervals lie outside the term
+        boundaries, weeks, statuses = [_day_ns(self.start)], [0], [BEFORE_TERM]
+        for i, label in enumerate(labels):
+            if i == 0 or label != labels[i - 1]:
+                if i:
+                    boundaries.append(_day_ns(days[i]))
+                weeks.append(label[0])
+                statuses.append(label[1])
+        boundaries.append(_day_ns(self.end + timedelta(days=1)))
+        weeks.append(0)
+        statuses.append(AFTER_TERM)
+        status_codes = np.array([_STATUS_CODE[status] for status in statuses], dtype=np.int8)
+        return np.array(boundaries, dtype=np.int64), np.array(weeks, dtype=np.int64), status_codes
+
+    @property
+    def teaching_weeks(self):
+        return int(self.weeks[self.statuses == _STATUS_CODE[IN_TERM]].max(initial=0))
+
+    def locate(self, timestamps_ns):
+        """
+        Week numbers (0 outside teaching and finals weeks) and status codes
+        (positions in STATUSES) of int64 nanosecond UTC timestamps.
+        """
+        if self.timezone != "UTC":
+            # Boundaries are local midnights, so compare local wall-clock times
+            timestamps_ns = pd.DatetimeIndex(timestamps_ns.view("datetime64[ns]"), tz="UTC").tz_convert(
+                self.timezone).tz_localize(None).asi8
+        interval = np.searchsorted(self.boundaries, timestamps_ns, side="right")
+        return self.weeks[interval], self.statuses[interval]
+
+    def week_of(self, moment):
+        """
+        Week number of one datetime (aware, or naive UTC), or None outside the term's weeks.
+        """
+        moment = pd.Timestamp(moment)
+        if moment.tzinfo is not None:
+            moment = moment.tz_convert("UTC").tz_localize(None)
+        weeks, _ = self.locate(np.array([moment.value], dtype=np.int64))
+        return int(weeks[0]) or None
+
+
+def read_calendar(path=DEFAULT_CALENDAR_PATH):
+    """
+    Read the calendar CSV into {(Semester, Year): SemesterCalendar}.
+    """
+    table = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [column for column in ("Semester", "Year", "Start", "End") if column not in table.columns]
+    if missing:
+        raise ValueError(f"{path} is missing columns {missing}")
+    calendars = {}
+    for row in table.to_dict("records"):
+        breaks = [_date_range(value) for value in row.get("Breaks", "").split(";") if value.strip()]
+        finals = _date_range(row["Finals"]) if row.get("Finals", "").strip() else None
+        calendar = SemesterCalendar(row["Semester"].strip(), row["Year"], date.fromisoformat(row["Start"].strip()),
+                                    date.fromisoformat(row["End"].strip()), breaks, finals,
+                                    row.get("Timezone", "").strip() or None)
+        key = (calendar.semester, calendar.year)
+        if key in calendars:
+            raise ValueError(f"{path} defines {key[0]} {key[1]} twice")
+        calendars[key] = calendar
+    return calendars
+
+
+def assign_weeks(events, calendars):
+    """
+    Week number and calendar status of every event from its Semester, Year
+    and Timestamp.
+
+    Events are grouped by term with one factorize, then each term's
+    timestamps go through a single searchsorted over its boundaries, so the
+    cost is one pass plus O(n log b) for b boundaries. Returns a DataFrame
+    on the events' index with `week` (Int64, NA outside teaching and finals
+    weeks) and `calendar_status` (see STATUSES).
+    """
+    timestamps = pd.to_datetime(events["Timestamp"], format="ISO8601", errors="coerce")
+    if getattr(timestamps.dt, "tz", None) is not None:
+        timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+    stamps = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    has_time = timestamps.notna().to_numpy()
+    years = pd.to_numeric(events["Year"], errors="coerce")
+
+    semester_codes, semesters = pd.factorize(events["Semester"].astype(str))
+    year_codes, year_values = pd.factorize(years)
+    term_codes = semester_codes * (len(year_values) + 1) + year_codes
+    weeks = np.zeros(len(events), dtype=np.int64)
+    statuses = np.full(len(events), _STATUS_CODE[NO_CALENDAR], dtype=np.int8)
+
+    order = np.argsort(term_codes, kind="stable")
+    sorted_codes = term_codes[order]
+    for (semester, year), calendar in calendars.items():
+        if semester not in semesters or year not in year_values:
+            continue
+        code = semesters.get_loc(semester) * (len(year_values) + 1) + year_values.get_loc(year)
+        rows = order[np.searchsorted(sorted_codes, code):np.searchsorted(sorted_codes, code, side="right")]
+        rows = rows[has_time[rows]]
+        weeks[rows], statuses[rows] = calendar.locate(stamps[rows])
+    statuses[~has_time] = _STATUS_CODE[NO_TIMESTAMP]
+
+    return pd.DataFrame({
+        "week": pd.Series(weeks, index=events.index, dtype="Int64").mask(weeks <= 0),
+        "calendar_status": pd.Categorical.from_codes(statuses, categories=STATUSES),
+    }, index=events.index)
+
+
+def derive_weeks(events, calendars):
+    """
+    A copy of `events` whose `week` column is derived from the calendars.
+    """
+    assigned = assign_weeks(events, calendars)
+    events = events.copy()
+    events["week"] = assigned["week"].to_numpy()
+    return events
+
+
+def out_of_term_report(events, assigned):
+    """
+    Events outside the teaching weeks, per term and status (break, before or
+    after the term, no calendar or no timestamp), with their time span.
+
+    Finals count as in term.
+    """
+    outside = ~assigned["calendar_status"].isin([IN_TERM, FINALS]).to_numpy()
+    table = pd.DataFrame({
+        "Semester": events["Semester"].astype(str).to_numpy()[outside],
+        "Year": pd.array(pd.to_numeric(events["Year"], errors="coerce").to_numpy()[outside], dtype="Int64"),
+        "Status": assigned["calendar_status"].to_numpy()[outside],
+        "Timestamp": pd.to_datetime(events["Timestamp"], format="ISO8601", errors="coerce").to_numpy()[outside],
+    })
+    report = table.groupby(["Semester", "Year", "Status"], observed=True, dropna=False).agg(
+        Events=("Timestamp", "size"), First=("Timestamp", "min"), Last=("Timestamp", "max")
+    )
+    return report.reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Derive the week column of the collated events from the "
+                                                 "semester calendar")
+    parser.add_argument("--calendar", default=DEFAULT_CALENDAR_PATH, help="calendar CSV (default: %(default)s)")
+    parser.add_argument("--events", default="data/coded_collated_data.csv", help="events CSV (default: %(default)s)")
+    parser.add_argument("--output", help="write the events with the derived week column here (e.g. the same file)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        calendars = read_calendar(args.calendar)
+    except ValueError as e:
+        parser.error(str(e))
+    # Read as text so every other column is written back exactly as it was
+    events = pd.read_csv(args.events, dtype=str, keep_default_na=False)
+    assigned = assign_weeks(events, calendars)
+    derived = time.perf_counter() - start
+
+    if "week" in events.columns:
+        previous = pd.to_numeric(events["week"], errors="coerce").astype("Int64")
+        same = (previous == assigned["week"]).fillna(False) | (previous.isna() & assigned["week"].isna())
+        changed = int((~same).sum())
+        print(f"{changed} of {len(events)} week numbers differ from {args.events}")
+    report = out_of_term_report(events, assigned)
+    if len(report):
+        print("Events outside the teaching weeks:")
+        print(report.to_string(index=False))
+    if args.output:
+        events["week"] = assigned["week"].astype("string").fillna("N/A")
+        tmp_path = args.output + ".tmp"
+        events.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, args.output)
+        print(f"Wrote {args.output}")
+    print(f"Derived weeks for {len(events)} events in {derived:.2f}s", file=sys.stderr)
@@ -0,0 +1,527 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregates import ACTIONS, CHURN_COLUMNS, gini_by_group
+from ingest import (CACHE_DIR, CACHE_SCHEMA_VERSION, EVENT_CATEGORICAL_COLUMNS, EVENT_NULLABLE_INT_COLUMNS,
+                    EVENT_TEXT_COLUMNS,
+                    compose_data_version, file_fingerprint, load_cached_table, parse_event_data,
+                    read_classification_csv, read_survey_csv, source_unchanged)
+
+# GITDASH_BACKEND=sqlite (or duckdb) serves the dashboard from an embedded
+# database instead of the in-memory event table; GITDASH_DB overrides its path
+BACKEND_ENV_VAR = "GITDASH_BACKEND"
+DB_PATH_ENV_VAR = "GITDASH_DB"
+BACKENDS = ["pandas", "sqlite", "duckdb"]
+DB_EXTENSIONS = {"sqlite": "sqlite", "duckdb": "duckdb"}
+
+# Events are parsed and inserted this many CSV rows at a time
+LOAD_CHUNK_ROWS = 100_000
+
+TIMESTAMP_COLUMNS = ["Timestamp", "Close_date"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+INTEGER_COLUMNS = EVENT_NULLABLE_INT_COLUMNS + ["Year"]
+
+# Every filter and aggregation the dashboard pushes down starts from a team
+# and narrows by week, member and action, so one composite index covers them
+EVENT_INDEX_COLUMNS = ["Your Team", "week", "Author", "Action"]
+
+# Bump when the database layout (tables, indexes) changes so old files are rebuilt
+DB_FORMAT_VERSION = 2
+
+
+def event_backend():
+    backend = os.environ.get(BACKEND_ENV_VAR, "pandas").strip().lower() or "pandas"
+    if backend not in BACKENDS:
+        raise ValueError(f"{BACKEND_ENV_VAR} must be one of {', '.join(BACKENDS)}, not {backend!r}")
+    return backend
+
+
+def default_db_path(backend, cache_dir=CACHE_DIR):
+    return os.environ.get(DB_PATH_ENV_VAR) or os.path.join(cache_dir, f"events.{DB_EXTENSIONS[backend]}")
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _column_type(column, backend):
+    if column in TIMESTAMP_COLUMNS:
+        # SQLite has no timestamp type; "YYYY-MM-DD HH:MM:SS" text sorts correctly
+        return "TIMESTAMP" if backend == "duckdb" else "TEXT"
+    if column in INTEGER_COLUMNS:
+        return "BIGINT" if backend == "duckdb" else "INTEGER"
+    return "VARCHAR" if backend == "duckdb" else "TEXT"
+
+
+def _connect(backend, db_path, read_only=True):
+    if backend == "duckdb":
+        import duckdb
+        return duckdb.connect(db_path, read_only=read_only)
+    if read_only:
+        return sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True, check_same_thread=False)
+    return sqlite3.connect(db_path)
+
+
+def _typed_events(names, rows, keep_ids=False):
+    """
+    Build an event table with the ingest cache's dtypes from fetched rows
+    (without the internal event_id unless `keep_ids`).
+
+    The stored values are already typed (text, integers, timestamps), so
+    unlike ingest.parse_event_data nothing is parsed value by value and each
+    column becomes its final array directly; a team-week slice is small, and
+    per-column pandas overhead would otherwise dominate its cost.
+    """
+    values = np.empty((len(rows), len(names)), dtype=object)
+    if rows:
+        values[:] = rows
+    columns = {}
+    for i, column in enumerate(names):
+        column_values = values[:, i]
+        if column == "event_id":
+            if keep_ids:
+                columns[column] = column_values.astype(np.int64)
+            continue
+        if column in TIMESTAMP_COLUMNS:
+            # SQLite returns "YYYY-MM-DD HH:MM:SS" text and DuckDB datetimes; None becomes NaT
+            columns[column] = np.array(column_values, dtype="datetime64[ns]")
+        elif column in INTEGER_COLUMNS:
+            missing = pd.isna(column_values)
+            columns[column] = pd.arrays.IntegerArray(np.where(missing, 0, column_values).astype(np.int64), missing)
+        elif column in EVENT_CATEGORICAL_COLUMNS:
+            codes, categories = pd.factorize(column_values, sort=True)
+            columns[column] = pd.Categorical.from_codes(codes, categories)
+        else:
+            columns[column] = column_values
+    return pd.DataFrame(columns)
+
+
+def _insert_chunk(con, backend, chunk, columns):
+    if backend == "duckdb":
+        con.register("event_chunk", chunk)
+        con.execute(f"INSERT INTO events_load SELECT {', '.join(_quote(c) for c in columns)} FROM event_chunk")
+        con.unregister("event_chunk")
+        return
+    for column in TIMESTAMP_COLUMNS:
+        if column in chunk.columns:
+            chunk[column] = chunk[column].dt.strftime(TIMESTAMP_FORMAT)
+    rows = chunk[columns].astype(object).where(chunk[columns].notna(), None).itertuples(index=False, name=None)
+    con.executemany(f"INSERT INTO events_load VALUES ({', '.join('?' * len(columns))})", rows)
+
+
+def build_event_db(csv_path, db_path, backend="sqlite", chunk_rows=LOAD_CHUNK_ROWS):
+    """
+    Load the collated event CSV into a file-based SQLite or DuckDB database.
+
+    The CSV is parsed in chunks with the same typing rules as the ingest
+    cache, so memory stays bounded by `chunk_rows`. Rows are stored clustered
+    by team and week (file order within a week, kept as `event_id`) and
+    indexed on (team, week, author, action). The database is written next to
+    `db_path` and swapped in atomically once complete.
+    """
+    fingerprint = file_fingerprint(csv_path)
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = db_path + ".tmp"
+    for path in (tmp_path, tmp_path + ".wal"):
+        if os.path.exists(path):
+            os.remove(path)
+
+    con = _connect(backend, tmp_path, read_only=False)
+    try:
+        columns = None
+        next_id = 0
+        for chunk in pd.read_csv(csv_path, dtype={col: str for col in EVENT_TEXT_COLUMNS},
+                                 chunksize=chunk_rows):
+            chunk = parse_event_data(chunk)
+            for column in chunk.columns:
+                if isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                    chunk[column] = chunk[column].astype(object)
+            chunk.insert(0, "event_id", range(next_id, next_id + len(chunk)))
+            next_id += len(chunk)
+            if columns is None:
+                columns = list(chunk.columns)
+                definitions = ", ".join(
+                    [f"{_quote(c)} {_column_type(c, backend)}" for c in columns[1:]]
+                )
+                schema = f"(event_id BIGINT, {definitions})"
+                con.execute(f"CREATE TABLE events_load {schema}")
+                con.execute(f"CREATE TABLE events {schema}")
+            _insert_chunk(con, backend, chunk, columns)
+
+        # Cluster rows by team and week so a team's slice is read from
+        # neighbouring pages, then index the filter columns
+        con.execute(f"INSERT INTO events SELECT * FROM events_load "
+                    f"ORDER BY {_quote('Your Team')}, week NULLS LAST, event_id")
+        con.execute("DROP TABLE events_load")
+        con.execute(f"CREATE INDEX events_team_week_author_action ON events "
+                    f"({', '.join(_quote(c) for c in EVENT_INDEX_COLUMNS)})")
+        # Search results are fetched back by id
+        con.execute("CREATE INDEX events_id ON events (event_id)")
+        con.execute("CREATE TABLE meta (key VARCHAR PRIMARY KEY, value VARCHAR)")
+        con.execute("INSERT INTO meta VALUES (?, ?)", ["source", json.dumps({
+            "schema_version": CACHE_SCHEMA_VERSION,
+            "db_format": DB_FORMAT_VERSION,
+            "source_path": os.path.abspath(csv_path),
+            "source": fingerprint,
+        })])
+        if backend == "sqlite":
+            con.commit()
+            con.execute("VACUUM")
+            con.execute("ANALYZE")
+    finally:
+        con.close()
+    os.replace(tmp_path, db_path)
+    return fingerprint
+
+
+def _read_db_meta(backend, db_path):
+    try:
+        con = _connect(backend, db_path)
+    except Exception:
+        return None
+    try:
+        row = con.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        return json.loads(row[0]) if row else None
+    except Exception:
+        return None
+    finally:
+        con.close()
+
+
+def open_event_db(csv_path, db_path=None, backend="sqlite"):
+    """
+    Return an EventStore over `db_path`, (re)building the database first if
+    it is missing or was built from a different version of `csv_path`, plus
+    the source hash.
+    """
+    db_path = db_path or default_db_path(backend)
+    meta = _read_db_meta(backend, db_path) if os.path.exists(db_path) else None
+    source = None
+    if (meta is not None and meta.get("schema_version") == CACHE_SCHEMA_VERSION
+            and meta.get("db_format") == DB_FORMAT_VERSION):
+        source = source_unchanged(meta["source"], csv_path)
+    if source is None:
+        source = build_event_db(csv_path, db_path, backend)
+    return EventStore(db_path, backend), source["sha256"]
+
+
+def load_event_store(repo_path="data/coded_collated_data.csv",
+                     survey_path="data/coded_survey_anonymous.csv",
+                     classification_path="team_classifications.csv",
+                     backend="sqlite", db_path=None, cache_dir=CACHE_DIR):
+    """
+    Counterpart of `ingest.load_all` for the SQL backend: the events stay in
+    the database and only the small survey and classification tables are
+    loaded. The data version matches the one `load_all` returns.
+    """
+    store, repo_hash = open_event_db(repo_path, db_path or default_db_path(backend, cache_dir), backend)
+    survey_data, survey_hash = load_cached_table(survey_path, read_survey_csv, cache_dir)
+    classification_data, classification_hash = load_cached_table(
+        classification_path, read_classification_csv, cache_dir
+    )
+    return store, survey_data, classification_data, compose_data_version(repo_hash, survey_hash, classification_hash)
+
+
+class EventStore:
+    """
+    Read access to the event table in an embedded SQLite or DuckDB database.
+
+    Offers the read interface of both TeamPartition (team and team-week row
+    slices, team terms) and ActivityCube (action totals, member x action and
+    member x week counts), so the dashboard can use it in place of either.
+    Filters and GROUP BYs run in the database; only the rows or counts that
+    are asked for come back, typed as by the ingest cache.
+    """
+
+    def __init__(self, db_path, backend="sqlite"):
+        self.db_path = db_path
+        self.backend = backend
+        # Each thread (Streamlit runs every session in its own) keeps one
+        # read-only connection: a cursor of the shared DuckDB connection, or
+        # its own SQLite connection
+        self._con = _connect(backend, db_path) if backend == "duckdb" else None
+        self._local = threading.local()
+
+        terms = self.query(
+            f"SELECT {_quote('Your Team')}, Semester, Year FROM events "
+            f"WHERE event_id IN (SELECT MIN(event_id) FROM events GROUP BY {_quote('Your Team')}) "
+            f"AND {_quote('Your Team')} IS NOT NULL ORDER BY {_quote('Your Team')}"
+        )
+        self.teams = terms["Your Team"].tolist()
+        self.team_terms = {
+            team: (semester, None if pd.isna(year) else int(year))
+            for team, semester, year in terms.itertuples(index=False, name=None)
+        }
+        self._team_set = set(self.teams)
+        weeks = self.query("SELECT DISTINCT week FROM events WHERE week IS NOT NULL ORDER BY week")
+        self.weeks = [int(w) for w in weeks["week"]]
+        extra = self.query("SELECT DISTINCT Action FROM events WHERE Action IS NOT NULL ORDER BY Action")
+        self.actions = ACTIONS + [a for a in extra["Action"] if a not in ACTIONS]
+        lines = self.query("SELECT COUNT(Additions) + COUNT(Deletions) AS n FROM events")
+        self.has_churn = bool(lines["n"].iloc[0])
+        self._members = {}
+
+    def query(self, sql, params=()):
+        """
+        Run a query and return the result as a DataFrame.
+        """
+        if self.backend == "duckdb":
+            return self._connection().execute(sql, list(params)).df()
+        names, rows = self._fetch(sql, params)
+        return pd.DataFrame.from_records(rows, columns=names)
+
+    def _connection(self):
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = self._local.con = (self._con.cursor() if self.backend == "duckdb"
+                                     else _connect(self.backend, self.db_path))
+        return con
+
+    def _fetch(self, sql, params=()):
+        cursor = self._connection().execute(sql, list(params))
+        rows = cursor.fetchall()
+        return [d[0] for d in cursor.description], rows
+
+    def __len__(self):
+        return int(self.query("SELECT COUNT(*) AS n FROM events")["n"].iloc[0])
+
+    @staticmethod
+    def _where(teams=None, weeks=None, authors=None, actions=None, any_not_null=None):
+        clauses, params = [], []
+        for column, values in (("Your Team", teams), ("week", weeks), ("Author", authors), ("Action", actions)):
+            if values is not None:
+                values = list(values)
+                clauses.append(f"{_quote(column)} IN ({', '.join('?' * len(values))})" if values else "FALSE")
+                params.extend(int(v) if column == "week" else str(v) for v in values)
+        if any_not_null:
+            clauses.append("(" + " OR ".join(f"{_quote(c)} IS NOT NULL" for c in any_not_null) + ")")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def events(self, columns=None, teams=None, weeks=None, authors=None, actions=None, any_not_null=None):
+        """
+        Typed event rows matching the filters, ordered by team and week (file
+        order within a week). `columns` projects to a subset of columns (which
+        may include event_id) and `any_not_null` keeps rows with a value in at
+        least one of its columns.
+        """
+        select = "*" if columns is None else ", ".join(_quote(c) for c in columns)
+        where, params = self._where(teams, weeks, authors, actions, any_not_null)
+        names, rows = self._fetch(f"SELECT {select} FROM events{where} "
+                                  f"ORDER BY {_quote('Your Team')}, week NULLS LAST, event_id", params)
+        return _typed_events(names, rows, keep_ids=columns is not None and "event_id" in columns)
+
+    def events_by_id(self, ids, columns=None):
+        """
+        Typed event rows with the given event ids, in the order of `ids`.
+        """
+        ids = [int(i) for i in ids]
+        select = "*" if columns is None else ", ".join(_quote(c) for c in ["event_id"] + list(columns))
+        names, rows = self._fetch(f"SELECT {select} FROM events "
+                                  f"WHERE event_id IN ({', '.join('?' * len(ids)) or 'NULL'})", ids)
+        events = _typed_events(names, rows, keep_ids=True)
+        order = pd.Index(events["event_id"]).get_indexer(ids)
+        return events.iloc[order].drop(columns="event_id").reset_index(drop=True)
+
+    def _counts(self, group_by, teams=None, weeks=None, authors=None, actions=None, has_week=False):
+        where, params = self._where(teams, weeks, authors, actions)
+        if has_week:
+            where += (" AND " if where else " WHERE ") + "week IS NOT NULL"
+        keys = ", ".join(_quote(c) for c in group_by)
+        return self.query(f"SELECT {keys}, COUNT(*) AS n FROM events{where} GROUP BY {keys}", params)
+
+    def _churn(self, group_by, teams=None, weeks=None, authors=None, has_week=False):
+        where, params = self._where(teams, weeks, authors)
+        # Like the cube, only count lines of events with a member and action
+        where += (" AND " if where else " WHERE ") + "Author IS NOT NULL AND Action IS NOT NULL"
+        if has_week:
+            where += " AND week IS NOT NULL"
+        keys = ", ".join(_quote(c) for c in group_by)
+        sums = (f'COALESCE(SUM(Additions), 0) AS "{CHURN_COLUMNS[0]}", '
+                f'COALESCE(SUM(Deletions), 0) AS "{CHURN_COLUMNS[1]}"')
+        if not group_by:
+            return self.query(f"SELECT {sums} FROM events{where}", params)
+        return self.query(f"SELECT {keys}, {sums} FROM events{where} GROUP BY {keys}", params)
+
+    # TeamPartition interface
+
+    def team_rows(self, team):
+        return self.events(teams=[team])
+
+    def team_week_rows(self, team, week):
+        return self.events(teams=[team], weeks=[week])
+
+    def team_term(self, team):
+        return self.team_terms.get(team, ("Unknown", "Unknown"))
+
+    # ActivityCube interface
+
+    def team_members(self, team):
+        if team not in self._members:
+            members = self.query(
+                f"SELECT DISTINCT Author FROM events WHERE {_quote('Your Team')} = ? "
+                f"AND Author IS NOT NULL AND Action IS NOT NULL ORDER BY Author", [team]
+            )
+            self._members[team] = members["Author"].tolist()
+        return self._members[team]
+
+    def action_totals(self, team, week=None, member=None):
+        """
+        Action counts for a team, optionally narrowed to one week and/or member.
+        """
+        counts = self._counts(["Action"], teams=[team], weeks=None if week is None else [week],
+                              authors=None if member is None else [member])
+        totals = counts.set_index("Action")["n"].reindex(self.actions, fill_value=0)
+        return totals.astype(int).rename(None).rename_axis(None)
+
+    def member_week_action(self, team, week=None):
+        """
+        Per-member action counts for one week, or across all weeks when
+        `week` is None, as a DataFrame indexed by member.
+        """
+        counts = self._counts(["Author", "Action"], teams=[team], weeks=None if week is None else [week])
+        table = counts.pivot(index="Author", columns="Action", values="n")
+        return table.reindex(index=pd.Index(self.team_members(team), name="Author"), columns=self.actions,
+                             fill_value=0).fillna(0).astype(int).rename_axis(columns=None)
+
+    def member_week_totals(self, team):
+        """
+        Total events per member per numbered week as a (member, week) DataFrame.
+        """
+        counts = self._counts(["Author", "week"], teams=[team], has_week=True)
+        counts["week"] = counts["week"].astype(int)
+        table = counts.pivot(index="Author", columns="week", values="n")
+        return table.reindex(index=pd.Index(self.team_members(team), name="Author"), columns=self.weeks,
+                             fill_value=0).fillna(0).astype(int).rename_axis(columns=None)
+
+    def churn_totals(self, team, week=None, member=None):
+        """
+        Lines added and deleted by a team, optionally narrowed to one week
+        and/or member, as a Series indexed by CHURN_COLUMNS.
+        """
+        totals = self._churn([], teams=[team], weeks=None if week is None else [week],
+                             authors=None if member is None else [member])
+        return totals.iloc[0].astype(int).rename(None)
+
+    def member_churn(self, team):
+        """
+        Lines added and deleted per member across all weeks.
+        """
+        churn = self._churn(["Author"], teams=[team]).set_index("Author")
+        return churn.reindex(pd.Index(self.team_members(team), name="Author"), fill_value=0).astype(int)
+
+    def weekly_churn(self, team):
+        """
+        Lines added and deleted by the whole team in each numbered week.
+        """
+        churn = self._churn(["week"], teams=[team], has_week=True)
+        churn["week"] = churn["week"].astype(int)
+        return churn.set_index("week").reindex(pd.Index(self.weeks, name="week"), fill_value=0).astype(int)
+
+    def member_week_churn(self, team):
+        """
+        Lines changed (added plus deleted) per member per numbered week.
+        """
+        churn = self._churn(["Author", "week"], teams=[team], has_week=True)
+        churn["week"] = churn["week"].astype(int)
+        churn["Lines Changed"] = churn[CHURN_COLUMNS].sum(axis=1)
+        table = churn.pivot(index="Author", columns="week", values="Lines Changed")
+        return table.reindex(index=pd.Index(self.team_members(team), name="Author"), columns=self.weeks,
+                             fill_value=0).fillna(0).astype(int).rename_axis(columns=None)
+
+    # Whole-cohort aggregations
+
+    def rosters(self):
+        """
+        Members of every team, as ActivityCube numbers them, from one query.
+        """
+        pairs = self.query(
+            f"SELECT DISTINCT {_quote('Your Team')}, Author FROM events WHERE {_quote('Your Team')} IS NOT NULL "
+            f"AND Author IS NOT NULL AND Action IS NOT NULL ORDER BY {_quote('Your Team')}, Author"
+        )
+        return {team: group["Author"].tolist() for team, group in pairs.groupby("Your Team", sort=False)}
+
+    def member_week_counts(self):
+        """
+        Events per member per numbered week for every team, as a dense
+        (team, member, week) array, plus the rosters numbering its members.
+        """
+        rosters = self.rosters()
+        members = [rosters.get(team, []) for team in self.teams]
+        counts = self._counts(["Your Team", "Author", "week"], has_week=True).dropna()
+        slots = pd.MultiIndex.from_tuples([(team, member) for team, roster in zip(self.teams, members)
+                                           for member in roster])
+        slot_of = np.concatenate([np.arange(len(roster)) for roster in members] + [np.zeros(0, dtype=np.int64)])
+        team_of = np.repeat(np.arange(len(self.teams)), [len(roster) for roster in members])
+        pair = slots.get_indexer(pd.MultiIndex.from_arrays([counts["Your Team"], counts["Author"]]))
+        week = np.searchsorted(self.weeks, counts["week"].astype(int).to_numpy())
+        keep = pair >= 0
+        array = np.zeros((len(self.teams), max((len(r) for r in members), default=0), len(self.weeks)),
+                         dtype=np.int64)
+        np.add.at(array, (team_of[pair[keep]], slot_of[pair[keep]], week[keep]), counts["n"].to_numpy()[keep])
+        return array, members
+
+    def team_workload_gini(self):
+        """
+        Gini index of members' total action counts for every team, from one
+        GROUP BY over (team, member).
+        """
+        counts = self.query(
+            f"SELECT {_quote('Your Team')}, Author, COUNT(*) AS n FROM events "
+            f"WHERE {_quote('Your Team')} IS NOT NULL AND Author IS NOT NULL AND Action IS NOT NULL "
+            f"GROUP BY {_quote('Your Team')}, Author"
+        )
+        gini = gini_by_group(counts["n"], counts["Your Team"])
+        return pd.Series(gini.reindex(self.teams).to_numpy(), index=pd.Index(self.teams, name="Your Team"),
+                         name="workload_gini")
+
+    def team_last_event(self):
+        """
+        Latest event timestamp of every team.
+        """
+        last = self.query(f"SELECT {_quote('Your Team')}, MAX(Timestamp) AS last FROM events "
+                          f"GROUP BY {_quote('Your Team')}")
+        return pd.Series(pd.to_datetime(last["last"]).to_numpy(), index=last["Your Team"].astype(str))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the embedded event database used by GITDASH_BACKEND.")
+    parser.add_argument("--backend", choices=BACKENDS[1:], default="sqlite")
+    parser.add_argument("--db", help="database path (default: data/.cache/events.<backend>)")
+    parser.add_argument("--repo-data", default="data/coded_collated_data.csv")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild even if the database is up to date")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db_path = args.db or default_db_path(args.backend)
+    start = time.perf_counter()
+    if args.rebuild:
+        build_event_db(args.repo_data, db_path, args.backend)
+    store, source_hash = open_event_db(args.repo_data, db_path, args.backend)
+    print(f"{len(store)} events from {len(store.teams)} teams in {db_path} "
+          f"({time.perf_counter() - start:.2f}s, source {source_hash[:12]})")
+
+    team = store.teams[len(store.teams) // 2]
+    for name, func in (("team rows", lambda: store.team_rows(team)),
+                       ("action totals", lambda: store.action_totals(team)),
+                       ("member x week totals", lambda: store.member_week_totals(team)),
+                       ("workload gini (all teams)", store.team_workload_gini)):
+        start = time.perf_counter()
+        func()
+        print(f"{name:<28} {(time.perf_counter() - start) * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from clustering import COMMITMENT_QUESTIONS, SURVEY_QUESTIONS
+from ingest import EVENT_COLUMNS
+
+SURVEY_COLUMNS = ["Semester", "Year", "Your Team"] + SURVEY_QUESTIONS
+
+# Action mix and per-action field rates measured on the shipped data set
+ACTION_PROBABILITIES = {
+    "commit": 0.66,
+    "issue": 0.10,
+    "pull_request": 0.11,
+    "code_review": 0.10,
+    "comment": 0.03,
+}
+ISSUE_ASSIGNED_RATE = 0.65
+ISSUE_CLOSED_RATE = 0.51
+PULL_REQUEST_CLOSED_RATE = 0.98
+PULL_REQUEST_REVIEWER_RATE = 0.08
+REVIEW_WITHOUT_MESSAGE_RATE = 0.47
+REVIEW_STATUSES = ["APPROVED", "COMMENTED", "CHANGES_REQUESTED", "DISMISSED"]
+REVIEW_STATUS_PROBABILITIES = [0.79, 0.145, 0.051, 0.014]
+
+TERMS = [("Fall", 2018), ("Fall", 2019), ("Spring", 2019), ("Spring", 2020), ("Fall", 2020),
+         ("Spring", 2022), ("Fall", 2022), ("Spring", 2023), ("Fall", 2023), ("Spring", 2024)]
+TERM_START = {"Spring": (1, 15), "Fall": (8, 26)}
+
+MESSAGE_VERBS = ["Add", "Fix", "Update", "Refactor", "Remove", "Implement", "Test", "Document", "Style",
+                 "Clean up", "Rename", "Move", "Merge", "Improve", "Handle", "Validate"]
+MESSAGE_OBJECTS = ["login page", "user model", "navbar", "database schema", "API endpoint", "unit tests",
+                   "README", "search form", "profile view", "error handling", "CSS layout", "routing",
+                   "session handling", "build script", "settings page", "dashboard", "seed data",
+                   "password reset", "file upload", "pagination", "dependencies", "CI config",
+                   "landing page", "notifications", "admin panel", "date picker", "sort order",
+                   "input validation", "footer", "deployment"]
+MESSAGE_SUFFIXES = ["", "", "", " for sprint review", " per code review", " (WIP)", " and tests",
+                    " after merge conflict", " to match mockups", " closes issue"]
+
+DEFAULT_OUTPUT_DIR = os.path.join("data", "synthetic")
+CHUNK_EVENTS = 1_000_000
+
+
+def team_ids(n_teams):
+    width = max(4, len(str(n_teams)))
+    return np.array([f"t{i:0{width}d}" for i in range(1, n_teams + 1)], dtype=object)
+
+
+def _hex_ids(rng, n, n_bytes):
+    """
+    Random lowercase hex strings (n_bytes * 2 characters), built without a
+    Python-level loop over rows.
+    """
+    table = np.array([f"{b:02x}".encode() for b in range(256)], dtype="S2")
+    raw = rng.integers(0, 256, size=(n, n_bytes), dtype=np.uint8)
+    return table[raw].view(f"S{2 * n_bytes}").ravel().astype(str).astype(object)
+
+
+def _sample_rows(rng, weights, rows):
+    """
+    For each entry of `rows`, draw a column index of `weights[row]` (rows of
+    cumulative probabilities) with one uniform draw per entry.
+    """
+    cumulative = np.cumsum(weights, axis=1)
+    cumulative /= cumulative[:, -1:]
+    draws = rng.random(len(rows))
+    return (draws[:, None] > cumulative[rows]).sum(axis=1)
+
+
+def _format_iso(timestamps):
+    return pd.Series(timestamps).dt.strftime("%Y-%m-%dT%H:%M:%S.000Z").to_numpy(dtype=object)
+
+
+def generate_events(n_teams=94, n_events=19_095, n_weeks=16, min_members=2, max_members=11,
+                    with_churn=False, seed=0, first_team=0, first_author=0, author_width=4):
+    """
+    Generate a synthetic event table with the schema of coded_collated_data.csv.
+
+    Teams get skewed event counts, members skewed shares of their team's work
+    and each team an uneven weekly rhythm, so per-team and per-member views
+    look like the real data. Code reviews point at pull requests of the same
+    team. Additions/Deletions are N/A as in the shipped export unless
+    `with_churn` is set. Returns the table and the number of authors used.
+    """
+    rng = np.random.default_rng(seed)
+    actions = np.array(list(ACTION_PROBABILITIES), dtype=object)
+    team_names = team_ids(first_team + n_teams)[first_team:]
+
+    team_sizes = rng.integers(min_members, max_members + 1, size=n_teams)
+    author_offsets = first_author + np.concatenate([[0], np.cumsum(team_sizes)[:-1]])
+    team_weights = rng.lognormal(0.0, 0.5, size=n_teams)
+    team_events = rng.multinomial(n_events, team_weights / team_weights.sum())
+
+    member_weights = rng.gamma(2.0, 1.0, size=(n_teams, max_members))
+    member_weights[np.arange(max_members)[None, :] >= team_sizes[:, None]] = 0
+    week_weights = rng.gamma(1.5, 1.0, size=(n_teams, n_weeks))
+    week_weights[rng.random((n_teams, n_weeks)) < 0.15] = 1e-9  # weeks a team sat out
+
+    terms = rng.integers(0, len(TERMS), size=n_teams)
+    semesters = np.array([TERMS[t][0] for t in terms], dtype=object)
+    years = np.array([TERMS[t][1] for t in terms])
+    starts = np.array([
+        np.datetime64(f"{year}-{TERM_START[sem][0]:02d}-{TERM_START[sem][1]:02d}")
+        for sem, year in zip(semesters, years)
+    ], dtype="datetime64[s]")
+
+    team = np.repeat(np.arange(n_teams), team_events)
+    n = len(team)
+    member = _sample_rows(rng, member_weights, team)
+    week = _sample_rows(rng, week_weights, team) + 1
+    action = actions[rng.choice(len(actions), size=n, p=list(ACTION_PROBABILITIES.values()))]
+    authors = np.array([f"p{i:0{author_width}d}" for i in range(first_author, author_offsets[-1] + team_sizes[-1])],
+                       dtype=object)
+    author = authors[author_offsets[team] + member - first_author]
+
+    offsets = ((week - 1) * 7 * 86400 + rng.integers(0, 7 * 86400, size=n)).astype("timedelta64[s]")
+    timestamp = starts[team] + offsets
+
+    # Events of a team are written in time order, as in the collated export
+    order = np.lexsort((timestamp, team))
+    team, week, action, author, timestamp = team[order], week[order], action[order], author[order], timestamp[order]
+
+    is_commit = action == "commit"
+    is_issue = action == "issue"
+    is_pr = action == "pull_request"
+    is_review = action == "code_review"
+    is_comment = action == "comment"
+
+    repo_id = np.empty(n, dtype=object)
+    repo_id[is_commit] = _hex_ids(rng, int(is_commit.sum()), 20)
+    repo_id[is_comment] = rng.integers(1_000_000_000, 2_200_000_000, size=int(is_comment.sum())).astype(str)
+
+    # Issues and pull requests share one number sequence per team
+    numbered = is_issue | is_pr
+    team_start = np.searchsorted(team, np.arange(n_teams))
+    running = np.cumsum(numbered)
+    before_team = np.concatenate([[0], running])[team_start][team]
+    number = running - before_team
+    repo_id[numbered] = number[numbered].astype(str)
+
+    # Reviews point at a random pull request of their team (or become comments)
+    pr_rows = np.flatnonzero(is_pr)
+    pr_bounds = np.searchsorted(team[pr_rows], np.arange(n_teams + 1))
+    review_rows = np.flatnonzero(is_review)
+    review_team = team[review_rows]
+    pr_count = pr_bounds[review_team + 1] - pr_bounds[review_team]
+    has_pr = pr_count > 0
+    picked = pr_bounds[review_team] + (rng.random(len(review_rows)) * np.maximum(pr_count, 1)).astype(int)
+    repo_id[review_rows[has_pr]] = repo_id[pr_rows[picked[has_pr]]]
+    orphan_reviews = review_rows[~has_pr]
+    action[orphan_reviews] = "comment"
+    repo_id[orphan_reviews] = rng.integers(1_000_000_000, 2_200_000_000, size=len(orphan_reviews)).astype(str)
+    is_review[orphan_reviews] = False
+    is_comment[orphan_reviews] = True
+
+    message_pool = np.array([
+        f"{verb} {obj}{suffix}" for verb in MESSAGE_VERBS for obj in MESSAGE_OBJECTS for suffix in MESSAGE_SUFFIXES
+    ], dtype=object)
+    message = message_pool[rng.integers(0, len(message_pool), size=n)]
+    message[is_review & (rng.random(n) < REVIEW_WITHOUT_MESSAGE_RATE)] = np.nan
+
+    # Assignees and reviewers are teammates of the author
+    def teammates(rows):
+        picks = (rng.random(len(rows)) * team_sizes[team[rows]]).astype(int)
+        return authors[author_offsets[team[rows]] + picks - first_author]
+
+    assignees = np.full(n, np.nan, dtype=object)
+    assigned = np.flatnonzero(is_issue & (rng.random(n) < ISSUE_ASSIGNED_RATE))
+    assignees[assigned] = teammates(assigned)
+    reviewers = np.full(n, np.nan, dtype=object)
+    reviewed = np.flatnonzero(is_pr & (rng.random(n) < PULL_REQUEST_REVIEWER_RATE))
+    reviewers[reviewed] = teammates(reviewed)
+
+    close_date = np.full(n, np.nan, dtype=object)
+    closed = (is_issue & (rng.random(n) < ISSUE_CLOSED_RATE)) | (is_pr & (rng.random(n) < PULL_REQUEST_CLOSED_RATE))
+    open_seconds = rng.exponential(4 * 86400, size=int(closed.sum())).astype("timedelta64[s]")
+    close_date[closed] = _format_iso(timestamp[closed] + open_seconds)
+
+    status = np.full(n, np.nan, dtype=object)
+    status[(is_issue | is_pr) & closed] = "closed"
+    status[(is_issue | is_pr) & ~closed] = "open"
+    status[is_review] = np.array(REVIEW_STATUSES, dtype=object)[
+        rng.choice(len(REVIEW_STATUSES), size=int(is_review.sum()), p=REVIEW_STATUS_PROBABILITIES)
+    ]
+
+    additions = np.full(n, np.nan)
+    deletions = np.full(n, np.nan)
+    if with_churn:
+        additions[is_commit] = rng.geometric(1 / 40, size=int(is_commit.sum()))
+        deletions[is_commit] = rng.geometric(1 / 15, size=int(is_commit.sum())) - 1
+
+    events = pd.DataFrame({
+        "Semester": semesters[team],
+        "Year": years[team],
+        "Your Team": team_names[team],
+        "Timestamp": pd.Series(timestamp).dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object),
+        "Action": action,
+        "Author": author,
+        "Repo_ID": repo_id,
+        "Additions": pd.array(additions, dtype="Int64"),
+        "Deletions": pd.array(deletions, dtype="Int64"),
+        "Message": message,
+        "Assignees": assignees,
+        "Close_date": close_date,
+        "Closed_by": np.nan,
+        "Request_Status": status,
+        "Reviewers": reviewers,
+        "Review_Recommendation": np.nan,
+        "Tagged": np.nan,
+        "week": week,
+    }, columns=EVENT_COLUMNS)
+    return events, int(author_offsets[-1] + team_sizes[-1] - first_author)
+
+
+def generate_survey(teams, terms, responses_per_team=(3, 8), seed=0):
+    """
+    Generate Likert survey responses (1-5) for `teams` with the columns of
+    coded_survey_anonymous.csv. Each team gets its own latent conflict,
+    collaboration and commitment level so the teams fall into clusters.
+    """
+    rng = np.random.default_rng(seed)
+    n_teams = len(teams)
+    counts = rng.integers(responses_per_team[0], responses_per_team[1] + 1, size=n_teams)
+    team = np.repeat(np.arange(n_teams), counts)
+
+    # Healthy teams report low conflict and high collaboration and commitment;
+    # each dimension mixes the shared health level with its own variation
+    health = rng.normal(0.0, 1.0, size=n_teams)
+    conflict, collaboration, commitment = 0.7 * health + 0.7 * rng.normal(0.0, 1.0, size=(3, n_teams))
+    responses = {}
+    for question in SURVEY_QUESTIONS:
+        if question.startswith("How"):
+            center = 1.5 - 0.35 * conflict
+        elif question == COMMITMENT_QUESTIONS[1]:
+            center = 3.6 + 0.4 * commitment
+        elif question in COMMITMENT_QUESTIONS:
+            center = 2.3 - 0.4 * commitment
+        else:
+            center = 4.0 + 0.5 * collaboration
+        values = np.rint(center[team] + rng.normal(0.0, 0.8, size=len(team)))
+        responses[question] = np.clip(values, 1, 5).astype(int)
+
+    survey = pd.DataFrame({
+        "Semester": [terms[t][0] for t in np.asarray(teams)[team]],
+        "Year": [terms[t][1] for t in np.asarray(teams)[team]],
+        "Your Team": np.asarray(teams)[team],
+        **responses,
+    }, columns=SURVEY_COLUMNS)
+    return survey
+
+
+def write_dataset(output_dir=DEFAULT_OUTPUT_DIR, n_teams=94, n_events=19_095, n_weeks=16, with_churn=False,
+                  seed=0, classify=True):
+    """
+    Write a synthetic coded_collated_data.csv, coded_survey_anonymous.csv and
+    (optionally, via clustering.classify_teams) team_classifications.csv.
+
+    Events are generated and appended in chunks of teams so memory stays
+    bounded at any scale. Returns the paths written.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    repo_path = os.path.join(output_dir, "coded_collated_data.csv")
+    survey_path = os.path.join(output_dir, "coded_survey_anonymous.csv")
+    classification_path = os.path.join(output_dir, "team_classifications.csv")
+
+    events_per_team = max(1, n_events // max(n_teams, 1))
+    teams_per_chunk = max(1, CHUNK_EVENTS // events_per_team)
+    author_width = max(4, len(str(n_teams * 11)))
+    terms = {}
+    first_author = 0
+    for chunk, first_team in enumerate(range(0, n_teams, teams_per_chunk)):
+        chunk_teams = min(teams_per_chunk, n_teams - first_team)
+        chunk_events = n_events * (first_team + chunk_teams) // n_teams - n_events * first_team // n_teams
+        events, n_authors = generate_events(
+            chunk_teams, chunk_events, n_weeks, with_churn=with_churn, seed=[seed, chunk],
+            first_team=first_team, first_author=first_author, author_width=author_width,
+        )
+        first_author += n_authors
+        first_rows = events.drop_duplicates("Your Team")
+        terms.update(zip(first_rows["Your Team"], zip(first_rows["Semester"], first_rows["Year"])))
+        events.to_csv(repo_path, mode="w" if chunk == 0 else "a", header=chunk == 0, index=False, na_rep="N/A")
+
+    teams = sorted(terms)
+    generate_survey(teams, terms, seed=seed).to_csv(survey_path, index=False)
+    paths = [repo_path, survey_path]
+
+    if classify:
+        from clustering import classify_teams
+        classifications = classify_teams(survey_path)
+        classifications[["classification"]].reset_index().to_csv(classification_path, index=False)
+        paths.append(classification_path)
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic data set with the dashboard's input schema.")
+    parser.add_argument("--teams", type=int, default=94, help="number of teams (default: %(default)s)")
+    parser.add_argument("--events", type=int, default=19_095, help="total events (default: %(default)s)")
+    parser.add_argument("--weeks", type=int, default=16, help="weeks per term (default: %(default)s)")
+    parser.add_argument("--churn", action="store_true", help="fill Additions/Deletions for commits")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-classify", dest="classify", action="store_false",
+                        help="skip writing team_classifications.csv")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="output directory (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    paths = write_dataset(args.output, args.teams, args.events, args.weeks, args.churn, args.seed, args.classify)
+    print(f"Wrote {args.events} events for {args.teams} teams in {time.perf_counter() - start:.1f}s:")
+    for path in paths:
+        print(f"  {path}")
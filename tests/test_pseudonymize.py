@@ -0,0 +1,46 @@
+import pandas as pd
+
+from ingest import EVENT_COLUMNS
+from pseudonymize import pseudonymize
+
+
+def write_exports(tmp_path):
+    events = pd.DataFrame([
+        {"Semester": "Spring", "Year": "2024", "Your Team": "Team 3", "Author": "alice", "Action": "commit"},
+        {"Semester": "Fall", "Year": "2023", "Your Team": "Team 7", "Author": "bob", "Action": "issue"},
+    ]).reindex(columns=EVENT_COLUMNS, fill_value="N/A")
+    # Team 3's survey is filed under an earlier term than its events
+    survey = pd.DataFrame([
+        {"Semester": "Spring", "Year": "2023", "Your Team": "Team 3", "Q1": "4"},
+        {"Semester": "Fall", "Year": "2023", "Your Team": "Team 7", "Q1": "2"},
+    ])
+    event_path, survey_path = tmp_path / "events.csv", tmp_path / "survey.csv"
+    events.to_csv(event_path, index=False)
+    survey.to_csv(survey_path, index=False)
+    return [str(event_path)], [str(survey_path)]
+
+
+def coded_teams(output_dir):
+    events = pd.read_csv(output_dir / "coded_collated_data.csv", dtype=str)
+    survey = pd.read_csv(output_dir / "coded_survey_anonymous.csv", dtype=str)
+    return list(events["Your Team"]), list(survey["Your Team"])
+
+
+def test_survey_and_event_team_in_different_terms_share_a_code(tmp_path):
+    event_paths, survey_paths = write_exports(tmp_path)
+    pseudonymize(event_paths, survey_paths, tmp_path / "out", str(tmp_path / "map.json"), b"secret", workers=1)
+
+    event_teams, survey_teams = coded_teams(tmp_path / "out")
+    assert event_teams == survey_teams
+    assert len(set(event_teams)) == 2
+
+
+def test_per_term_codes_events_and_survey_alike(tmp_path):
+    event_paths, survey_paths = write_exports(tmp_path)
+    pseudonymize(event_paths, survey_paths, tmp_path / "out", str(tmp_path / "map.json"), b"secret", workers=1,
+                 per_term=True)
+
+    event_teams, survey_teams = coded_teams(tmp_path / "out")
+    # Team 3 is coded once per term it appears in; Team 7 shares its term
+    assert event_teams[0] != survey_teams[0]
+    assert event_teams[1] == survey_teams[1]
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import build_activity_cube
+from segments import IncrementalEvents, SegmentLog
+
+
+def make_events(rows):
+    events = pd.DataFrame(rows, columns=["Your Team", "Author", "Action", "week", "Timestamp"])
+    events["Semester"] = "Spring"
+    events["Year"] = 2024
+    events["week"] = events["week"].astype("Int64")
+    events["Timestamp"] = pd.to_datetime(events["Timestamp"])
+    return events
+
+
+def test_refresh_leaves_previous_snapshot_cube_unchanged(tmp_path):
+    base = make_events([
+        ("t0001", "p0002", "commit", 1, "2024-01-10"),
+        ("t0001", "p0003", "issue", 1, "2024-01-11"),
+        ("t0001", "p0003", "commit", None, "2024-01-12"),
+        ("t0002", "p0004", "comment", 2, "2024-01-17"),
+    ])
+    # The first batch adds a week, so the cube is reallocated with spare slots
+    first = make_events([("t0002", "p0004", "issue", 3, "2024-01-24")])
+    # The second adds another week and a member who sorts before the existing
+    # roster, which fits in those spare slots but reorders t0001's member rows
+    batch = make_events([
+        ("t0001", "p0001", "commit", 4, "2024-01-31"),
+        ("t0001", "p0003", "commit", 1, "2024-01-11"),
+        ("t0002", "p0004", "commit", 4, "2024-02-01"),
+    ])
+    log = SegmentLog(str(tmp_path / "segments"))
+    events = IncrementalEvents(base, "base", "v0", log)
+
+    log.append(first, "base", columns=base.columns)
+    previous = events.refresh()
+    assert previous.cube._storage is not None
+    old_cube = previous.cube
+    old_counts = old_cube.counts.copy()
+    old_members = [list(roster) for roster in old_cube.members]
+    old_weeks = list(old_cube.weeks)
+    old_totals = {team: old_cube.action_totals(team).copy() for team in old_cube.teams}
+
+    log.append(batch, "base", columns=base.columns)
+    current = events.refresh()
+
+    assert current is not previous
+    np.testing.assert_array_equal(old_cube.counts, old_counts)
+    assert old_cube.members == old_members
+    assert old_cube.weeks == old_weeks
+    for team, totals in old_totals.items():
+        pd.testing.assert_series_equal(old_cube.action_totals(team), totals)
+    assert old_cube.team_members("t0001") == ["p0002", "p0003"]
+    assert old_cube.member_week_action("t0001").loc["p0003", "commit"] == 1
+
+    expected = build_activity_cube(pd.concat([base, first, batch], ignore_index=True))
+    assert current.cube.members == expected.members
+    assert current.cube.weeks == expected.weeks
+    for team in expected.teams:
+        np.testing.assert_array_equal(current.cube.team_counts(team), expected.team_counts(team))